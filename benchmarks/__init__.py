@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+
+# __init__.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Timings of the faster code paths against their baselines, kept out of the unit tests (which only check
+    that both give the same results), e.g.
+
+        python -m benchmarks.cell_parser
+
+    The timings are meaningless under a tracer, e.g. a coverage measurement or a debugger.
+"""
+import pathlib
+import timeit
+
+import pandas as pd
+
+from lam4vb3 import LAM_CLASSES_WS_NAME, PREFIX_WS_NAME
+from lam4vb3.lam_utils import read_excel_worksheet, make_graph
+
+TESTBED_WORKBOOK = pathlib.Path(__file__).parent.parent / "tests" / "test_data" / "LAM_metadata_20210413_testbed.xlsx"
+
+
+def benchmark(function, arguments, repeat=5, number=200) -> float:
+    """
+        the best time of calling the function on all the arguments, number times
+    """
+    return min(timeit.repeat(lambda: [function(argument) for argument in arguments], repeat=repeat, number=number))
+
+
+def elapsed(function, repeat=3) -> float:
+    """
+        the best time of a single call of the function
+    """
+    return min(timeit.repeat(function, repeat=repeat, number=1))
+
+
+def testbed_lam_classes(copies=20) -> tuple:
+    """
+        the LAM classes worksheet of the testbed workbook, repeated copies times, and an empty graph with its prefixes
+    """
+    df = read_excel_worksheet(file_path=TESTBED_WORKBOOK, sheet_name=LAM_CLASSES_WS_NAME)
+    graph = make_graph(read_excel_worksheet(file_path=TESTBED_WORKBOOK, sheet_name=PREFIX_WS_NAME))
+    return pd.concat([df] * copies, ignore_index=True), graph
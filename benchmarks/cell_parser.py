@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+
+# cell_parser.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The cell tokenizer against the cell parsing functions it replaced.
+"""
+from benchmarks import benchmark
+from benchmarks.legacy_cell_parser import legacy_tokenize_cell, legacy_parse_qname, BENCHMARK_CELLS, BENCHMARK_QNAMES
+from lam4vb3.cell_tokenizer import tokenize_cell, tokenize_qname
+
+
+def main():
+    legacy_time = benchmark(legacy_tokenize_cell, BENCHMARK_CELLS)
+    tokenizer_time = benchmark(tokenize_cell, BENCHMARK_CELLS)
+    print(f"tokenize {len(BENCHMARK_CELLS)} cells: legacy {legacy_time:.4f}s, tokenizer {tokenizer_time:.4f}s")
+
+    legacy_time = benchmark(legacy_parse_qname, BENCHMARK_QNAMES)
+    tokenizer_time = benchmark(tokenize_qname, BENCHMARK_QNAMES)
+    print(f"tokenize {len(BENCHMARK_QNAMES)} qnames: legacy {legacy_time:.4f}s, tokenizer {tokenizer_time:.4f}s")
+
+
+if __name__ == '__main__':
+    main()
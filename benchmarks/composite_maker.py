@@ -0,0 +1,26 @@
+#!/usr/bin/python3
+
+# composite_maker.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The composite triple maker, iterating the rows once for all its makers, against the makers run one by one.
+"""
+from benchmarks import elapsed, testbed_lam_classes
+from benchmarks.samples import make_lam_classes_concept_makers
+from lam4vb3.builder.composite_builders import CompositeTripleMaker
+
+
+def main():
+    df, graph = testbed_lam_classes()
+    separate_time = elapsed(lambda: [maker.make_triples(inplace=False)
+                                     for maker in make_lam_classes_concept_makers(df, graph)])
+    composite_time = elapsed(lambda: CompositeTripleMaker(make_lam_classes_concept_makers(df, graph))
+                             .make_triples(inplace=False))
+    print(f"{len(df)} LAM classes rows: separate makers {separate_time:.3f}s, composite maker {composite_time:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
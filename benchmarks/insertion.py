@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+
+# insertion.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The bulk insertion of the triples into a graph against the triple by triple one.
+"""
+import rdflib
+
+from benchmarks import elapsed
+from benchmarks.samples import make_row_triples
+from lam4vb3.lam_utils import add_triples_to_graph, INSERTION_MODES
+
+
+def main():
+    for count in (1000, 10000, 50000):
+        triples = make_row_triples(count)
+        timings = {insertion: elapsed(lambda: add_triples_to_graph(result_triples=triples, graph=rdflib.Graph(),
+                                                                   insertion=insertion))
+                   for insertion in INSERTION_MODES}
+        print(f"{count} triples: " + ", ".join(f"{insertion} insertion {timings[insertion]:.3f}s"
+                                               for insertion in INSERTION_MODES))
+
+
+if __name__ == '__main__':
+    main()
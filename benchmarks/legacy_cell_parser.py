@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+
+# legacy_cell_parser.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The cell parsing functions as they were before the tokenizer (see lam4vb3.cell_tokenizer), kept as the
+    baseline of the benchmark and of the tests checking that the tokenizer gives the same results.
+"""
+import re
+
+
+def legacy_split_by_pipe(string: str) -> tuple:
+    result_list = string.split("|")
+    if len(result_list) > 2:
+        raise ValueError(f"Cannot have more than one pipe (|) separator in the cell value")
+    return result_list[0], result_list[1] if len(result_list) > 1 else None
+
+
+def legacy_normalize_spaces(string: str):
+    if string:
+        return re.sub(" +", " ", string).lstrip().rstrip()
+    return string
+
+
+def legacy_split_lines(string: str) -> list:
+    return list(filter(None, [legacy_normalize_spaces(x) for x in string.split("\n")]))
+
+
+def legacy_parse_qname(qname):
+    p = re.compile(r"""([\w\-_]+){0,1}:([\w\-_]+){1,1}(?:@){0,1}([\w]+){0,1}""")
+    try:
+        dummy1, prefix, name, language, dummy2 = p.split(qname)
+    except:
+        raise ValueError(f"Could not segment the qualified name: {qname}")
+    return "" if prefix is None else prefix, name, language
+
+
+def legacy_tokenize_cell(cell_value: str) -> tuple:
+    first_part, second_part = legacy_split_by_pipe(cell_value)
+    return legacy_split_lines(legacy_normalize_spaces(first_part)), second_part.lstrip(" ") if second_part else None
+
+
+BENCHMARK_CELLS = ["eurovoc:1452", "  eurovoc:1452\neurovoc:4347  | an optional comment", "yu | mandatory unique",
+                   "\neurovoc:1452\n\n   eurovoc:4347   \n\n  | a comment over\nmany lines", "", "o",
+                   "lamd:md_EXAMPLE_EN  \n\n", "celexd:c_1   |"]
+BENCHMARK_QNAMES = ["skos:prefLabel", "skos:prefLabel@en", ":res_123", "lamd:md_CODE", "cdm:resource_legal_id_celex"]
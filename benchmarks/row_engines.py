@@ -0,0 +1,25 @@
+#!/usr/bin/python3
+
+# row_engines.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The columnar engine of the triple makers against the row by row one.
+"""
+from benchmarks import elapsed, testbed_lam_classes
+from benchmarks.samples import make_lam_classes_concept_makers
+from lam4vb3.builder.base_builders import ENGINES
+
+
+def main():
+    df, graph = testbed_lam_classes()
+    timings = {engine: elapsed(lambda: [maker.make_triples(inplace=False, engine=engine)
+                                        for maker in make_lam_classes_concept_makers(df, graph)])
+               for engine in ENGINES}
+    print(f"{len(df)} LAM classes rows: " + ", ".join(f"{engine} engine {timings[engine]:.3f}s" for engine in ENGINES))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+
+# samples.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    The makers and the triples timed by the benchmarks, also used by the tests checking that the optimised
+    code paths give the same results as their baselines.
+"""
+import rdflib
+from rdflib import DCTERMS, RDF, SKOS
+
+from lam4vb3.builder import lam_classes_builder
+from lam4vb3.builder.inverse_builders import InverseTripleMaker
+from lam4vb3.builder.simple_builders import ConceptTripleMaker
+
+
+def make_lam_classes_concept_makers(df, graph):
+    """
+        the concept maker of the LAM classes worksheet and the maker of its collections, sharing the graph
+    """
+    return [ConceptTripleMaker(df=df, column_mapping_dict=lam_classes_builder.LITERAL_CONCEPTS_COLUMNS, graph=graph,
+                               subject_in_scheme=lam_classes_builder.LAM_CS, comment_predicate=SKOS.editorialNote,
+                               target_columns=[*lam_classes_builder.LITERAL_CONCEPTS_COLUMNS],
+                               literal_columns=[*lam_classes_builder.LITERAL_CONCEPTS_COLUMNS],
+                               subject_source_column=lam_classes_builder.URI_COLUMN),
+            InverseTripleMaker(df=df, column_mapping_dict=lam_classes_builder.COLLECTION_COLUMNS, graph=graph,
+                               target_columns=[*lam_classes_builder.COLLECTION_COLUMNS],
+                               subject_source_column=lam_classes_builder.URI_COLUMN)]
+
+
+def make_row_triples(count):
+    """
+        triples shaped like those of the makers: a few per subject, with the creation date and type repeated
+    """
+    triples = []
+    for index in range(count // 5):
+        subject = rdflib.URIRef(f"http://example.com/concept/{index}")
+        triples.extend([(subject, RDF.type, SKOS.Concept),
+                        (subject, DCTERMS.created, rdflib.Literal("2021-08-15")),
+                        (subject, SKOS.prefLabel, rdflib.Literal(f"label {index}", lang="en")),
+                        (subject, SKOS.notation, rdflib.Literal(f"C{index}")),
+                        (subject, DCTERMS.created, rdflib.Literal("2021-08-15"))])
+    return triples
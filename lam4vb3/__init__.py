@@ -15,3 +15,8 @@ CELEX_CLASSES_WS_NAME = "CELEX classes"
 CELEX_CLASS_CLASSIFICATION_WS_NAME = "CELEX classes classification"
 
 PREFIX_WS_NAME = "prefixes (aux)"
+
+WORKSHEET_NAMES = (LAM_PROPERTIES_WS_NAME, LAM_PROPERTY_CLASSIFICATION_WS_NAME,
+                   LAM_CLASSES_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME,
+                   CELEX_CLASSES_WS_NAME, CELEX_CLASS_CLASSIFICATION_WS_NAME,
+                   PREFIX_WS_NAME,)
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+
+# batch_transform.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Transformation of all the workbooks of a folder, e.g. to regenerate every historical workbook
+    when the mapping changes.
+
+    The workbooks are transformed in a pool of processes, each into its own subfolder of the output folder,
+    named after the workbook. A workbook that fails to transform does not stop the others; the status and
+    the elapsed time of each workbook are summarised at the end. The workbooks that would be transformed into
+    the same subfolder (e.g. foo.xlsx, foo.ods and the folder foo) fail without being transformed.
+"""
+import collections
+import concurrent.futures
+import logging
+import pathlib
+import sys
+import time
+
+import click
+import pandas as pd
+
+from lam4vb3.excel2rdf import transform_workbook
+from lam4vb3.input_adapters import is_supported_input
+from lam4vb3.workbook_cache import WorkbookCache
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+BatchResult = collections.namedtuple("BatchResult", ["input_file", "output_folder", "status", "elapsed", "error"])
+
+
+def workbook_output_folder(input_file, output_folder) -> pathlib.Path:
+    """
+        the subfolder of the output folder where the workbook is transformed into
+    """
+    return pathlib.Path(output_folder) / pathlib.Path(input_file).stem
+
+
+def output_folder_collisions(input_files, output_folder) -> dict:
+    """
+        the error of each input file sharing its subfolder of the output folder with other input files
+    """
+    input_files_by_folder = collections.defaultdict(list)
+    for input_file in input_files:
+        input_files_by_folder[workbook_output_folder(input_file, output_folder)].append(input_file)
+    return {input_file: f"ValueError: the output folder {folder} is shared by "
+                        + ", ".join(pathlib.Path(name).name for name in colliding_files)
+            for folder, colliding_files in input_files_by_folder.items() if len(colliding_files) > 1
+            for input_file in colliding_files}
+
+
+def transform_batch_file(input_file, output_folder, no_cache: bool = False) -> BatchResult:
+    """
+        Transform a workbook into its subfolder of the output folder. Any failure is logged and
+        reported in the result rather than raised.
+    """
+    start_time = time.time()
+    workbook_folder = workbook_output_folder(input_file, output_folder)
+    logging.info(f"> Transforming {pathlib.Path(input_file).name} into {workbook_folder}")
+    try:
+        workbook_folder.mkdir(parents=True, exist_ok=True)
+        transform_workbook(pathlib.Path(input_file), workbook_folder, cache=None if no_cache else WorkbookCache())
+    except Exception as e:
+        logging.exception(f"Could not transform the file {input_file}. Most likely it does not respect "
+                          f"the conventions. Please update and try again.")
+        return BatchResult(input_file=str(input_file), output_folder=str(workbook_folder), status=FAILED,
+                           elapsed=time.time() - start_time, error=f"{type(e).__name__}: {e}")
+    return BatchResult(input_file=str(input_file), output_folder=str(workbook_folder), status=SUCCEEDED,
+                       elapsed=time.time() - start_time, error=None)
+
+
+def transform_batch(input_files, output_folder, jobs: int = 1, no_cache: bool = False) -> list:
+    """
+        Transform the workbooks, one after the other or, when jobs is more than 1, in a pool of processes.
+        The workbooks sharing their output folder (see output_folder_collisions) are reported as failed.
+
+    :return: a list of BatchResult, in the order of the input files
+    """
+    input_files = list(input_files)
+    collisions = output_folder_collisions(input_files, output_folder)
+    transformed_files = [input_file for input_file in input_files if input_file not in collisions]
+    if jobs == 1 or len(transformed_files) < 2:
+        results = [transform_batch_file(input_file, output_folder, no_cache=no_cache) for input_file in transformed_files]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(transformed_files))) as executor:
+            futures = [executor.submit(transform_batch_file, input_file, output_folder, no_cache)
+                       for input_file in transformed_files]
+            results = [future.result() for future in futures]
+
+    results_by_file = dict(zip(transformed_files, results))
+    return [results_by_file[input_file] if input_file in results_by_file else
+            BatchResult(input_file=str(input_file), output_folder=str(workbook_output_folder(input_file, output_folder)),
+                        status=FAILED, elapsed=0.0, error=collisions[input_file])
+            for input_file in input_files]
+
+
+def batch_summary(results: list) -> pd.DataFrame:
+    return pd.DataFrame(results, columns=BatchResult._fields)
+
+
+@click.command()
+@click.argument("input", type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@click.argument("output", type=click.Path(file_okay=False, dir_okay=True))
+@click.option("--jobs", type=click.IntRange(min=1), default=1,
+              help="Transform this many workbooks in parallel, in separate processes.")
+@click.option("--summary", type=click.Path(dir_okay=False, writable=True), default=None,
+              help="Write the status and the elapsed time of each workbook into this CSV file.")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Parse the workbooks even if they were parsed before, bypassing the cache of parsed workbooks.")
+def transform_files_in_folder(input, output, jobs, summary, no_cache):
+    """
+        Takes all workbooks (Excel or ODS files, or folders of CSV or Parquet files) from an input folder,
+        transforms them into LAM-SKOS-AP RDF and writes each of them into its own subfolder of the output folder.
+        Exits with status 1 if any workbook failed to transform.
+    """
+    in_ = pathlib.Path(input).resolve()
+    out_ = pathlib.Path(output).resolve()
+    out_.mkdir(parents=True, exist_ok=True)
+
+    file_list = [path for path in sorted(in_.iterdir()) if is_supported_input(path)]
+
+    logging.info(f"Input: {in_}")
+    logging.info(f"Output: {out_}")
+    logging.info(f"Executing the transformation for each of the {len(file_list)} workbooks in the input folder")
+
+    start_time = time.time()
+    results = transform_batch(file_list, out_, jobs=jobs, no_cache=no_cache)
+
+    for result in results:
+        click.echo(f"{result.status}: {pathlib.Path(result.input_file).name} in {result.elapsed:.1f} seconds"
+                   + (f" ({result.error})" if result.error else ""))
+    if summary:
+        batch_summary(results).to_csv(summary, index=False)
+    failed = [result for result in results if result.status == FAILED]
+    click.echo(f"{len(results) - len(failed)} workbook(s) transformed, {len(failed)} failed, "
+               f"in {(time.time() - start_time):.1f} seconds")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    transform_files_in_folder()
@@ -6,10 +6,11 @@
 # Email: costezki.eugen@gmail.com 
 
 """ """
+import collections
 import collections.abc
+import functools
 import warnings
 from abc import ABC, abstractmethod
-from datetime import date
 from typing import List, Dict, Tuple
 
 import pandas as pd
@@ -18,6 +19,22 @@ from rdflib import DCTERMS, RDF
 
 from lam4vb3 import cell_parser
 from lam4vb3 import lam_utils
+from lam4vb3.rdf_terms import term_pool
+
+# the engines iterating over the rows in make_triples
+# rows: iterates with DataFrame.iterrows and reads each cell interpretation from the parsed column frame
+# columnar: iterates over the index and reads the cell interpretations from lists built once per column
+ROWS_ENGINE = "rows"
+COLUMNAR_ENGINE = "columnar"
+ENGINES = (ROWS_ENGINE, COLUMNAR_ENGINE)
+DEFAULT_ENGINE = COLUMNAR_ENGINE
+
+# what a maker needs to know about a target column, compiled once from its mapping (see column_plan):
+# the predicate and the language of the mapping qname, whether the cells are literal values and the
+# handler making the cell triples. If the mapping cannot be resolved, the predicate is None, the error is
+# the message of the exception raised and the cause is the exception itself.
+ColumnPlan = collections.namedtuple("ColumnPlan", ["column", "predicate", "language", "is_literal", "handler",
+                                                   "error", "cause"])
 
 
 class AbstractTripleMaker(ABC):
@@ -31,7 +48,8 @@ class AbstractTripleMaker(ABC):
                  target_columns: List[str] = [],
                  literal_columns: List[str] = [],
                  subject_source_column: str = "URI",
-                 subject_classes: List[rdflib.URIRef] = [], ):
+                 subject_classes: List[rdflib.URIRef] = [],
+                 subject_uris: Dict = None, ):
         """
 
         :type subject_classes: state the class subject is an instance of.
@@ -50,6 +68,9 @@ class AbstractTripleMaker(ABC):
                                 and the list of columns. The list of columns will only be interpreted as a seed string
                                 (this means that the list can be with random strings).
         :param literal_columns: names of the columns expected to contain plain literal values
+        :param subject_uris: the subject URI of each row index, as returned by row_uri_index of another maker
+                        built over the same data frame with the same subject source column, so that the subjects
+                        are minted once per data frame rather than by each maker.
         """
 
         self.subject_classes: List[rdflib.URIRef] = subject_classes
@@ -59,9 +80,39 @@ class AbstractTripleMaker(ABC):
         self.graph: rdflib.Graph = graph
         self.column_mapping_dict: Dict = column_mapping_dict
         self.df = df
-        self._subject_index = None
+        self._subject_index = subject_uris
+        self._head_seed = None
+        self._parsed_columns = {}
+        self._cell_interpretations = {}
+        self._column_plan = None
+
+    @property
+    def head_seed(self) -> str:
+        """
+            The seed of the generated URIs, i.e. the string representation of the data frame head,
+            computed once per maker.
+        """
+        if self._head_seed is None:
+            self._head_seed = str(self.df.head())
+        return self._head_seed
 
     def handle_row_uri(self, row_index, seed: str = "") -> rdflib.URIRef:
+        """
+            Return the row uri, from the subject URIs of the data frame rows (see row_uri_index)
+            unless an additional seed is provided.
+
+        :param seed: an additional seed for random generation
+        :param row_index: index of the target row
+        :return: rdflib.URIRef
+        """
+        if seed:
+            return self.make_row_uri(row_index=row_index, seed=seed)
+        row_uri = self.row_uri_index()[row_index]
+        if isinstance(row_uri, Exception):
+            raise ValueError(f"Could not make the URI of the row {row_index}.") from row_uri
+        return row_uri
+
+    def make_row_uri(self, row_index, seed: str = "") -> rdflib.URIRef:
         """
             generate the row uri based on provided subject_source, which can contain:
             (a) a column name to use as subject URIs,
@@ -82,34 +133,67 @@ class AbstractTripleMaker(ABC):
             if isinstance(self.subject_source_column, collections.abc.Iterable) and not isinstance(
                     self.subject_source_column, str):
                 return lam_utils.generate_uuid_uri(str(row_index) + str(self.subject_source_column),
-                                                   seed=str(self.df.head()) + str(seed),
+                                                   seed=self.head_seed + str(seed),
                                                    graph=self.graph, )
 
             # if subject source is a column in the DF then make URI of it.
             elif self.subject_source_column in self.df.columns:
                 try:
                     # try to parse it as a qualified uri
-                    return cell_parser.qname_uri(self.df.loc[row_index, self.subject_source_column],
-                                                 self.graph.namespaces())
+                    return term_pool.uri(cell_parser.qname_uri(self.df.loc[row_index, self.subject_source_column],
+                                                               cell_parser.namespace_resolver(self.graph)))
                 except Exception:
                     # if not then dont raise exception but use the values for random generation instead
                     return lam_utils.generate_uuid_uri(self.df.loc[row_index, self.subject_source_column],
-                                                       seed=str(self.df.head()) + str(seed),
+                                                       seed=self.head_seed + str(seed),
                                                        graph=self.graph, )
 
         else:
             return lam_utils.generate_uuid_uri(row_index,
-                                               seed=str(self.df.head()) + str(seed),
+                                               seed=self.head_seed + str(seed),
                                                graph=self.graph, )
 
-    def handle_column_predicate(self, target_column) -> rdflib.URIRef:
+    def column_plan(self) -> Dict[str, ColumnPlan]:
+        """
+            The plan of each target column, compiled on first use from the column mapping dict, the literal
+            columns and the target columns, so that the per cell work is only the value parsing.
+            It is compiled again on each make_triples, to follow the changes of the graph namespaces.
+        :return: a dictionary of target column and ColumnPlan
+        """
+        if self._column_plan is None:
+            self._column_plan = {column: self.compile_column_plan(column) for column in self.target_columns}
+        return self._column_plan
+
+    def compile_column_plan(self, target_column: str) -> ColumnPlan:
+        try:
+            predicate = term_pool.uri(cell_parser.qname_uri(self.column_mapping_dict[target_column],
+                                                            cell_parser.namespace_resolver(self.graph)))
+            language = cell_parser.qname_lang(self.column_mapping_dict[target_column])
+        except Exception as e:
+            # reported by each cell of the column, as when resolving the predicate cell by cell
+            return ColumnPlan(column=target_column, predicate=None, language=None,
+                              is_literal=target_column in self.literal_columns,
+                              handler=functools.partial(self.make_cell_triples, target_column=target_column),
+                              error=str(e), cause=e)
+        return ColumnPlan(column=target_column, predicate=predicate, language=language,
+                          is_literal=target_column in self.literal_columns,
+                          handler=functools.partial(self.make_cell_triples, target_column=target_column),
+                          error=None, cause=None)
+
+    def handle_column_predicate(self, target_column, row_index=None) -> rdflib.URIRef:
         """
             Returns the predicate corresponding to the column, based on the column name.
 
         :param target_column: string value of a dataframe column title. Resolve from mapping table
+        :param row_index: the row of the cell needing the predicate, named in the error if it cannot be resolved
         :return: rdflib.URIRef
         """
-        return cell_parser.qname_uri(self.column_mapping_dict[target_column], self.graph.namespaces())
+        plan = self.column_plan().get(target_column) or self.compile_column_plan(target_column)
+        if plan.error is not None:
+            cell = f" for the cell at row {row_index}" if row_index is not None else ""
+            raise ValueError(f"Could not resolve the predicate of the column {target_column}{cell}: "
+                             f"{plan.error}") from plan.cause
+        return plan.predicate
 
     def handle_literal_language_from_predicate_signature(self, target_column) -> str:
         """
@@ -119,33 +203,81 @@ class AbstractTripleMaker(ABC):
         :param target_column: string value of a dataframe column title. Resolve from the mapping table.
         :return: str
         """
-        return cell_parser.qname_lang(self.column_mapping_dict[target_column])
+        plan = self.column_plan().get(target_column)
+        return plan.language if plan else cell_parser.qname_lang(self.column_mapping_dict[target_column])
 
     def row_uri_index(self) -> dict:
         """
-            Builds a dictionary representing the mapping between row index and a URI.
-        :return: a dictionary of row index and URI created for the row
+            Builds a dictionary representing the mapping between row index and a URI, once per maker.
+            A row whose URI cannot be made is mapped to the exception raised, so that it does not fail
+            the other rows; handle_row_uri reports it for this row only.
+        :return: a dictionary of row index and URI created for the row (or the exception raised)
         """
-        if not self._subject_index:
-            self._subject_index = {index: self.handle_row_uri(index)
-                                   for (index, row) in self.df.iterrows()}
+        if self._subject_index is None:
+            self._subject_index = {index: self.try_make_row_uri(index) for index in self.df.index}
         return self._subject_index
 
-    def make_triples(self, error_ok=False, inplace=True):
+    def try_make_row_uri(self, row_index):
+        """
+            the row uri (see make_row_uri), or the exception raised when making it
+        """
+        try:
+            return self.make_row_uri(row_index)
+        except Exception as e:
+            return e
+
+    def make_triples(self, error_ok=False, inplace=True, row_indexes=None, engine=DEFAULT_ENGINE, sink=None,
+                     insertion=lam_utils.DEFAULT_INSERTION):
         """
             Build the triples for the entire Dataframe
 
             :param error_ok:
             :param inplace:
+            :param row_indexes: if provided, only the rows with these indexes are built. The generated URIs are
+                        the same as when building the entire Dataframe.
+            :param engine: the engine iterating over the rows, one of ENGINES. Both produce the same triples.
+            :param sink: if provided (see lam4vb3.triple_sinks), the triples are streamed into the sink one row
+                        at a time instead of being collected, so inplace is ignored and an empty list is returned.
+            :param insertion: the way the triples are added to the graph when inplace, one of lam_utils.INSERTION_MODES
             :return:
         """
+        return collect_triple_batches(self.iter_triple_batches(error_ok=error_ok, row_indexes=row_indexes, engine=engine),
+                                      graph=self.graph, inplace=inplace, sink=sink, insertion=insertion)
 
-        result_triples = []
+    def iter_triple_batches(self, error_ok=False, row_indexes=None, engine=DEFAULT_ENGINE):
+        """
+            Generate the triples for the entire Dataframe: first the triples of the target columns,
+            then the triples of each row (including the triples of its cells), one list per row.
+
+            :param error_ok:
+            :param row_indexes: if provided, only the rows with these indexes are built.
+            :param engine: the engine iterating over the rows, one of ENGINES.
+            :return: a generator of lists of triples
+        """
+        yield self.start_triples(error_ok=error_ok, engine=engine)
+        for index in iter_row_indexes(self.df, row_indexes=row_indexes, engine=engine):
+            yield self.make_row_batch(row_index=index, error_ok=error_ok)
+
+    def start_triples(self, error_ok=False, engine=DEFAULT_ENGINE) -> List[Tuple]:
+        """
+            Prepare a pass over the rows: compile the column plan and, with the columnar engine,
+            interpret the cells of the target columns.
+
+            :param error_ok:
+            :param engine: the engine iterating over the rows, one of ENGINES.
+            :return: the triples of the target columns
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine}. Expected one of {ENGINES}")
+
+        self._column_plan = None
+        self.column_plan()
+        column_triples = []
 
         # iterate over the target columns
         for column in self.target_columns:
             try:
-                result_triples.extend(self.make_column_triples(target_column=column, ))
+                column_triples.extend(self.make_column_triples(target_column=column, ))
             except Exception:
                 message = f"Could not create triples for the column {column}."
                 if not error_ok:
@@ -154,35 +286,60 @@ class AbstractTripleMaker(ABC):
                     warnings.warn(message)
                     continue
 
-        # iterate over all the rows
-        for index, row in self.df.iterrows():
+        if engine == COLUMNAR_ENGINE:
+            # the missing columns are left to fail, and be reported, cell by cell as in the rows engine
+            self._cell_interpretations = {
+                column: dict(zip(self.df.index, cell_parser.cell_interpretations(self.parsed_column(column))))
+                for column in self.target_columns if column in self.df.columns}
+        else:
+            self._cell_interpretations = {}
+        return column_triples
+
+    def make_row_batch(self, row_index, error_ok=False) -> List[Tuple]:
+        """
+            Build the triples of the row and of its cells, in a pass prepared by start_triples.
+
+            :param row_index:
+            :param error_ok:
+            :return: the triples, none if the triples unique to the row could not be built
+        """
+        try:
+            row_triples = list(self.make_row_triples(row_index=row_index, ))
+        except Exception:
+            message = f"Could not create triples for the row {row_index}."
+            if error_ok:
+                raise Exception(message)
+            else:
+                warnings.warn(message)
+                return []
+
+        # iterate over all the target columns for the row
+        column_plan = self.column_plan()
+        for column in self.target_columns:
             try:
-                result_triples.extend(self.make_row_triples(row_index=index, ))
+                row_triples.extend(column_plan[column].handler(row_index=row_index))
             except Exception:
-                message = f"Could not create triples for the row {index}."
+                message = f"Could not create triples for the cell at row {row_index} and column {column}."
                 if error_ok:
                     raise Exception(message)
                 else:
                     warnings.warn(message)
                     continue
+        return row_triples
 
-            # iterate over all the target columns for each row
-            for column in self.target_columns:
-                try:
-                    result_triples.extend(self.make_cell_triples(row_index=index, target_column=column))
-                except Exception:
-                    message = f"Could not create triples for the cell at row {index} and column {column}."
-                    if error_ok:
-                        raise Exception(message)
-                    else:
-                        warnings.warn(message)
-                        continue
-
-        #  add triples to the graph
-        if inplace:
-            lam_utils.add_triples_to_graph(result_triples=result_triples, graph=self.graph)
+    def parsed_column(self, target_column: str) -> pd.DataFrame:
+        """
+            The interpretation of all the cells in the column, parsed at once on first use.
 
-        return result_triples
+        :param target_column:
+        :return: the data frame produced by cell_parser.parse_column
+        """
+        if target_column not in self._parsed_columns:
+            plan = self.column_plan().get(target_column)
+            self._parsed_columns[target_column] = cell_parser.parse_column(
+                column=self.df[target_column], graph=self.graph,
+                is_literal=plan.is_literal if plan else target_column in self.literal_columns)
+        return self._parsed_columns[target_column]
 
     def handle_cell_value(self, row_index, target_column: str) -> Dict:
         """
@@ -192,14 +349,13 @@ class AbstractTripleMaker(ABC):
         :param row_index:
         :return: parsed cell value
         """
-        if target_column in self.literal_columns:
-            return cell_parser.parse_cell(cell_value=self.df.loc[row_index, target_column],
-                                          is_literal=True,
-                                          graph=self.graph)
+        if target_column not in self._cell_interpretations:
+            return cell_parser.cell_interpretation(parsed_column=self.parsed_column(target_column), index=row_index)
 
-        return cell_parser.parse_cell(cell_value=self.df.loc[row_index, target_column],
-                                      is_literal=False,
-                                      graph=self.graph)
+        cell_interpretation = self._cell_interpretations[target_column][row_index]
+        if isinstance(cell_interpretation, Exception):
+            raise ValueError(str(cell_interpretation))
+        return cell_interpretation
 
     def make_row_triples(self, row_index, ) -> List[Tuple]:
         """
@@ -208,7 +364,7 @@ class AbstractTripleMaker(ABC):
         :return:
         """
         row_subject = self.handle_row_uri(row_index=row_index)
-        result_triples = [(row_subject, DCTERMS.created, rdflib.Literal(date.today()))]
+        result_triples = [(row_subject, DCTERMS.created, term_pool.created())]
         result_triples.extend([(row_subject, RDF.type, subject_class) for subject_class in self.subject_classes])
 
         return result_triples
@@ -232,3 +388,37 @@ class AbstractTripleMaker(ABC):
         pass
 
 
+def iter_row_indexes(df: pd.DataFrame, row_indexes=None, engine=DEFAULT_ENGINE):
+    """
+        the indexes of the data frame rows to build, in the order of the data frame, as iterated by the engine
+
+    :param row_indexes: if provided, only these indexes are generated
+    """
+    if row_indexes is not None:
+        row_indexes = set(row_indexes)
+    index_iterator = iter(df.index) if engine == COLUMNAR_ENGINE else (index for index, row in df.iterrows())
+    for index in index_iterator:
+        if row_indexes is None or index in row_indexes:
+            yield index
+
+
+def collect_triple_batches(batches, graph: rdflib.Graph, inplace=True, sink=None,
+                           insertion=lam_utils.DEFAULT_INSERTION) -> List[Tuple]:
+    """
+        Stream the batches of triples into the sink, if any, or collect them and add them to the graph
+        if inplace (see AbstractTripleMaker.make_triples).
+
+    :return: the collected triples, or an empty list when streamed into the sink
+    """
+    if sink is not None:
+        for batch in batches:
+            sink.add_triples(batch)
+        return []
+
+    result_triples = [triple for batch in batches for triple in batch]
+
+    #  add triples to the graph
+    if inplace:
+        lam_utils.add_triples_to_graph(result_triples=result_triples, graph=graph, insertion=insertion)
+
+    return result_triples
@@ -11,8 +11,11 @@ from rdflib import SKOS, RDF
 
 import lam4vb3.lam_utils
 from lam4vb3.builder import LAM, CELEXD
+from lam4vb3.builder.composite_builders import CompositeTripleMaker
 from lam4vb3.builder.inverse_builders import InverseTripleMaker
 from lam4vb3.builder.simple_builders import ConceptTripleMaker, SimpleTripleMaker
+from lam4vb3.lam_utils import DEFAULT_INSERTION
+from lam4vb3.triple_sinks import worksheet_sink, DEFAULT_OUTPUT_FORMAT
 
 LITERAL_CONCEPTS_COLUMNS = {
     'CODE': 'skos:notation',
@@ -41,6 +44,11 @@ LAM_CS = CELEXD.CelexClasses
 
 URI_COLUMN = 'URI'
 
+# the columns read by the builders from the worksheets (the other columns are not loaded)
+CONCEPTS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_CONCEPTS_COLUMNS, *PARENT_CONCEPT_COLUMN, *COLLECTION_COLUMNS]
+
+COLLECTIONS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_COLLECTIONS_COLUMNS, *URI_COLLECTIONS_COLUMNS]
+
 
 def create_concept_scheme(graph):
     """
@@ -50,7 +58,8 @@ def create_concept_scheme(graph):
     graph.add((LAM_CS, SKOS.prefLabel, rdflib.Literal("Legal Document")))
 
 
-def create_concepts(df, graph):
+def create_concepts(df, graph, row_indexes=None, inplace=True, uri_minter=None, sink=None,
+                    insertion=DEFAULT_INSERTION):
     concept_maker = ConceptTripleMaker(df=df,
                                        column_mapping_dict={**LITERAL_CONCEPTS_COLUMNS, **PARENT_CONCEPT_COLUMN},
                                        graph=graph,
@@ -61,17 +70,16 @@ def create_concepts(df, graph):
                                        subject_source_column=URI_COLUMN,
                                        subject_classes=[SKOS.Concept, LAM.LegalDocumentClass])  #changed from LAMD to LAM
 
-    concept_maker.make_triples()
+    subject_uris = concept_maker.row_uri_index()
 
     in_collection_maker = InverseTripleMaker(df=df,
                                              column_mapping_dict=COLLECTION_COLUMNS,
                                              graph=graph,
                                              target_columns=[*COLLECTION_COLUMNS],
-                                             subject_source_column=URI_COLUMN
+                                             subject_source_column=URI_COLUMN,
+                                             subject_uris=subject_uris
                                              )
 
-    in_collection_maker.make_triples()
-
     # parent_concept_maker = ConceptTripleMaker(df=df,
     #                                           column_mapping_dict=PARENT_CONCEPT_COLUMN,
     #                                           graph=graph,
@@ -81,8 +89,11 @@ def create_concepts(df, graph):
 
     # parent_concept_maker.make_triples()
 
+    composite_maker = CompositeTripleMaker([concept_maker, in_collection_maker])
+    return composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink, insertion=insertion)
+
 
-def create_collections(df, graph):
+def create_collections(df, graph, row_indexes=None, inplace=True, sink=None, insertion=DEFAULT_INSERTION):
     selected_columns = {**LITERAL_COLLECTIONS_COLUMNS,
                         **URI_COLLECTIONS_COLUMNS}
     collection_maker = SimpleTripleMaker(df=df,
@@ -93,29 +104,37 @@ def create_collections(df, graph):
                                          subject_source_column=URI_COLUMN,
                                          subject_classes=[SKOS.Collection],
                                          comment_predicate=SKOS.editorialNote)
-    collection_maker.make_triples()
+    subject_uris = collection_maker.row_uri_index()
 
     collection_parent_maker = InverseTripleMaker(df=df,
                                                  column_mapping_dict=URI_COLLECTIONS_COLUMNS,
                                                  graph=graph,
                                                  target_columns=[*URI_COLLECTIONS_COLUMNS],
-                                                 subject_source_column=URI_COLUMN
+                                                 subject_source_column=URI_COLUMN,
+                                                 subject_uris=subject_uris
                                                  )
 
-    collection_parent_maker.make_triples()
+    composite_maker = CompositeTripleMaker([collection_maker, collection_parent_maker])
+    return composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink, insertion=insertion)
 
 
-def make_celex_classes_worksheet(lam_df_celex_classes, lam_df_celex_classes_classification, prefixes, output_file):
+def make_celex_classes_worksheet(lam_df_celex_classes, lam_df_celex_classes_classification, prefixes, output_file,
+                                 output_format=DEFAULT_OUTPUT_FORMAT):
     """
     :param lam_df_celex_classes_classification:
     :param lam_df_celex_classes:
     :param prefixes:
     :param output_file:
+    :param output_format: one of lam4vb3.triple_sinks.OUTPUT_FORMATS; in a streaming format the triples are
+                            written as they are made and the returned graph holds only the concept scheme.
+                            A list of formats are all serialised from the graph, concurrently, into files
+                            named after the output file (see lam4vb3.triple_sinks.worksheet_sink)
     :return:
     """
     graph = lam4vb3.lam_utils.make_graph(prefixes)
     create_concept_scheme(graph)
-    create_concepts(lam_df_celex_classes, graph)
-    create_collections(lam_df_celex_classes_classification, graph)
-    graph.serialize(str(output_file), format='turtle', )
+    # the triples are added into the graph, or written, row by row, without collecting those of the entire worksheet
+    with worksheet_sink(graph, output_file, output_format=output_format, graph_name=LAM_CS) as sink:
+        create_concepts(lam_df_celex_classes, graph, sink=sink)
+        create_collections(lam_df_celex_classes_classification, graph, sink=sink)
     return graph
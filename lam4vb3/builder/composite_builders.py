@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+
+# composite_builders.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Running several triple makers over the same data frame in a single pass over its rows.
+"""
+from typing import List, Tuple
+
+from lam4vb3 import lam_utils
+from lam4vb3.builder.base_builders import AbstractTripleMaker, DEFAULT_ENGINE, iter_row_indexes, \
+    collect_triple_batches
+
+
+class CompositeTripleMaker:
+    """
+        Builds the triples of several makers over the same data frame, walking its rows once and
+        handing each row to all the makers, in the order they are registered.
+        The triples are the same as those of the makers run one after the other, in a different order.
+    """
+
+    def __init__(self, makers: List[AbstractTripleMaker] = ()):
+        self.makers: List[AbstractTripleMaker] = []
+        for maker in makers:
+            self.register(maker)
+
+    def register(self, maker: AbstractTripleMaker) -> AbstractTripleMaker:
+        """
+            Add a maker, which must be built over the same data frame and graph as the registered ones.
+        :return: the maker
+        """
+        if self.makers and (maker.df is not self.makers[0].df or maker.graph is not self.makers[0].graph):
+            raise ValueError("The makers of a composite maker must share the data frame and the graph")
+        self.makers.append(maker)
+        return maker
+
+    def make_triples(self, error_ok=False, inplace=True, row_indexes=None, engine=DEFAULT_ENGINE, sink=None,
+                     insertion=lam_utils.DEFAULT_INSERTION) -> List[Tuple]:
+        """
+            Build the triples of all the makers, see AbstractTripleMaker.make_triples
+        """
+        if not self.makers:
+            return []
+        return collect_triple_batches(self.iter_triple_batches(error_ok=error_ok, row_indexes=row_indexes,
+                                                               engine=engine),
+                                      graph=self.makers[0].graph, inplace=inplace, sink=sink, insertion=insertion)
+
+    def iter_triple_batches(self, error_ok=False, row_indexes=None, engine=DEFAULT_ENGINE):
+        """
+            Generate the triples of the target columns of all the makers, then the triples of each row
+            built by all the makers, one list per row.
+        """
+        yield [triple for maker in self.makers for triple in maker.start_triples(error_ok=error_ok, engine=engine)]
+        for index in iter_row_indexes(self.makers[0].df, row_indexes=row_indexes, engine=engine):
+            yield [triple for maker in self.makers for triple in maker.make_row_batch(row_index=index, error_ok=error_ok)]
@@ -11,7 +11,6 @@ from typing import Dict, List, Tuple
 import pandas as pd
 import rdflib
 
-from lam4vb3 import cell_parser
 from lam4vb3.builder.base_builders import AbstractTripleMaker
 from lam4vb3.cell_parser import VALUES
 
@@ -27,20 +26,20 @@ class InverseTripleMaker(AbstractTripleMaker):
                  graph: rdflib.Graph,
                  target_columns: List[str],
                  subject_source_column: str = "URI",
+                 subject_uris: Dict = None,
                  ):
         super().__init__(df=df,
                          column_mapping_dict=column_mapping_dict,
                          graph=graph,
                          target_columns=target_columns,
-                         subject_source_column=subject_source_column, )
+                         subject_source_column=subject_source_column,
+                         subject_uris=subject_uris, )
 
     def make_cell_triples(self, row_index, target_column) -> List[Tuple]:
         row_subject = self.handle_row_uri(row_index=row_index)
-        column_predicate = self.handle_column_predicate(target_column=target_column)
+        column_predicate = self.handle_column_predicate(target_column=target_column, row_index=row_index)
 
-        cell_interpretation = cell_parser.parse_cell(cell_value=self.df.loc[row_index, target_column],
-                                                     is_literal=False,
-                                                     graph=self.graph)
+        cell_interpretation = self.handle_cell_value(row_index=row_index, target_column=target_column)
 
         if VALUES in cell_interpretation:
             cell_values = cell_interpretation[VALUES]
@@ -6,14 +6,21 @@
 # Email: costezki.eugen@gmail.com
 
 """ """
+import logging
+
+import pandas as pd
 import rdflib
 from rdflib import SKOS, RDF
 
 import lam4vb3.lam_utils
+from lam4vb3 import LAM_CLASSES_WS_NAME
 from lam4vb3.builder import LAM, LAMD
+from lam4vb3.builder.composite_builders import CompositeTripleMaker
 from lam4vb3.builder.inverse_builders import InverseTripleMaker
-from lam4vb3.builder.reified_builders import ConstraintTripleMaker, AnnotationConstraintTripleMaker
+from lam4vb3.builder.reified_builders import compaction_report, ConstraintTripleMaker, AnnotationConstraintTripleMaker
 from lam4vb3.builder.simple_builders import ConceptTripleMaker, SimpleTripleMaker
+from lam4vb3.lam_utils import DEFAULT_INSERTION
+from lam4vb3.triple_sinks import worksheet_sink, DEFAULT_OUTPUT_FORMAT
 
 LITERAL_CONCEPTS_COLUMNS = {
     'LABEL': 'skos:prefLabel@en',
@@ -140,6 +147,11 @@ COLUMN_ANNOTATION_ASSOCIATIONS = {'ANN_COD(DD)': 'DD',
                                   'ANN_TOD(IF)': 'IF',
                                   'ANN_COD(IF)': 'IF'}
 
+# the annotating columns of each annotated column
+ANNOTATING_COLUMNS = {annotated_column: [column for column, annotated in COLUMN_ANNOTATION_ASSOCIATIONS.items()
+                                         if annotated == annotated_column]
+                      for annotated_column in COLUMN_ANNOTATION_ASSOCIATIONS.values()}
+
 ANNOTATION_COLUMNS = {
     'ANN_COD(DD)': 'lamd:md_ANN_COD',
     'ANN_COD(DH)': 'lamd:md_ANN_COD',
@@ -150,6 +162,12 @@ ANNOTATION_COLUMNS = {
     'ANN_COD(IF)': 'lamd:md_ANN_COD',
 }
 
+# the columns read by the builders from the worksheets (the other columns are not loaded)
+CONCEPTS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_CONCEPTS_COLUMNS, *COLLECTION_COLUMNS, *CONSTRAINT_COLUMNS,
+                              *MAPPING_PROPERTY_CONFIGURATION_COLUMNS, *ANNOTATION_COLUMNS]
+
+COLLECTIONS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_COLLECTIONS_COLUMNS, *URI_COLLECTIONS_COLUMNS]
+
 
 def create_concept_scheme(graph):
     """
@@ -159,7 +177,8 @@ def create_concept_scheme(graph):
     graph.add((LAM_CS, SKOS.prefLabel, rdflib.Literal("Legal Document")))
 
 
-def create_concepts(df, graph):
+def create_concepts(df, graph, row_indexes=None, inplace=True, uri_minter=None, sink=None,
+                    insertion=DEFAULT_INSERTION, compact=False):
     concept_maker = ConceptTripleMaker(df=df,
                                        column_mapping_dict=LITERAL_CONCEPTS_COLUMNS,
                                        graph=graph,
@@ -170,17 +189,16 @@ def create_concepts(df, graph):
                                        subject_source_column=URI_COLUMN,
                                        subject_classes=[SKOS.Concept, LAM.LegalDocumentClass])
 
-    concept_maker.make_triples()
+    subject_uris = concept_maker.row_uri_index()
 
     in_collection_maker = InverseTripleMaker(df=df,
                                              column_mapping_dict=COLLECTION_COLUMNS,
                                              graph=graph,
                                              target_columns=[*COLLECTION_COLUMNS],
-                                             subject_source_column=URI_COLUMN
+                                             subject_source_column=URI_COLUMN,
+                                             subject_uris=subject_uris
                                              )
 
-    in_collection_maker.make_triples()
-
     constraint_maker = ConstraintTripleMaker(df=df,
                                              column_mapping_dict=CONSTRAINT_COLUMNS,
                                              graph=graph,
@@ -189,8 +207,12 @@ def create_concepts(df, graph):
                                              constraint_class=LAM.PropertyConfiguration,
                                              constraint_comment=SKOS.editorialNote,
                                              constraint_path_property=LAM.path,
-                                             subject_source_column=URI_COLUMN)
-    constraint_maker.make_triples()
+                                             subject_source_column=URI_COLUMN,
+                                             subject_uris=subject_uris,
+                                             sheet_name=LAM_CLASSES_WS_NAME,
+                                             uri_minter=uri_minter,
+                                             compact=compact,
+                                             annotating_columns=ANNOTATING_COLUMNS)
 
     constraint_mapping_maker = ConstraintTripleMaker(df=df,
                                                      column_mapping_dict=MAPPING_PROPERTY_CONFIGURATION_COLUMNS,
@@ -200,8 +222,12 @@ def create_concepts(df, graph):
                                                      constraint_class=LAM.MappingPropertyConfiguration,
                                                      constraint_comment=SKOS.editorialNote,
                                                      constraint_path_property=LAM.path,
-                                                     subject_source_column=URI_COLUMN)
-    constraint_mapping_maker.make_triples()
+                                                     subject_source_column=URI_COLUMN,
+                                                     subject_uris=subject_uris,
+                                                     sheet_name=LAM_CLASSES_WS_NAME,
+                                                     uri_minter=uri_minter,
+                                                     compact=compact,
+                                                     annotating_columns=ANNOTATING_COLUMNS)
 
     annotation_constraints_maker = AnnotationConstraintTripleMaker(df=df,
                                                                    graph=graph,
@@ -210,13 +236,26 @@ def create_concepts(df, graph):
                                                                    constraint_class=LAM.AnnotationConfiguration,
                                                                    target_columns=[*ANNOTATION_COLUMNS],
                                                                    annotation_column_mapping=COLUMN_ANNOTATION_ASSOCIATIONS,
-                                                                   constraint_path_property=LAM.path
+                                                                   constraint_path_property=LAM.path,
+                                                                   subject_uris=subject_uris,
+                                                                   sheet_name=LAM_CLASSES_WS_NAME,
+                                                                   uri_minter=uri_minter,
+                                                                   compact=compact,
+                                                                   annotating_columns=ANNOTATING_COLUMNS
                                                                    )
 
-    annotation_constraints_maker.make_triples()
+    composite_maker = CompositeTripleMaker([concept_maker, in_collection_maker, constraint_maker,
+                                            constraint_mapping_maker, annotation_constraints_maker])
+    result_triples = composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink,
+                                                  insertion=insertion)
+    if compact:
+        report = compaction_report([constraint_maker, constraint_mapping_maker, annotation_constraints_maker])
+        logging.info(f"Compacted {report.cells} constraint cells of the {LAM_CLASSES_WS_NAME} worksheet "
+                     f"into {report.nodes} nodes, sparing {report.saved_nodes} nodes and {report.saved_triples} triples")
+    return result_triples
 
 
-def create_collections(df, graph):
+def create_collections(df, graph, row_indexes=None, inplace=True, sink=None, insertion=DEFAULT_INSERTION):
     collection_maker = SimpleTripleMaker(df=df,
                                          column_mapping_dict=LITERAL_COLLECTIONS_COLUMNS,
                                          graph=graph,
@@ -225,29 +264,46 @@ def create_collections(df, graph):
                                          subject_source_column=URI_COLUMN,
                                          subject_classes=[SKOS.Collection],
                                          comment_predicate=SKOS.editorialNote)
-    collection_maker.make_triples()
+    subject_uris = collection_maker.row_uri_index()
 
     collection_parent_maker = InverseTripleMaker(df=df,
                                                  column_mapping_dict=URI_COLLECTIONS_COLUMNS,
                                                  graph=graph,
                                                  target_columns=[*URI_COLLECTIONS_COLUMNS],
-                                                 subject_source_column=URI_COLUMN
+                                                 subject_source_column=URI_COLUMN,
+                                                 subject_uris=subject_uris
                                                  )
 
-    collection_parent_maker.make_triples()
+    composite_maker = CompositeTripleMaker([collection_maker, collection_parent_maker])
+    return composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink, insertion=insertion)
 
 
-def make_lam_classes_worksheet(lam_df_classes, lam_df_classes_classification, prefixes, output_file):
+def make_lam_classes_worksheet(lam_df_classes, lam_df_classes_classification, prefixes, output_file, uri_minter=None,
+                               compact=False, output_format=DEFAULT_OUTPUT_FORMAT):
     """
     :param lam_df_classes_classification:
-    :param lam_df_classes:
+    :param lam_df_classes: the LAM classes data frame, or an iterable of data frame chunks
+                            (see lam4vb3.workbook.read_excel_worksheet_in_chunks)
     :param prefixes:
     :param output_file:
+    :param uri_minter: the minter of the reified constraint URIs (see lam4vb3.uri_minting)
+    :param compact: share the nodes of identical constraints (see BaseConstraintTripleMaker);
+                    only for a data frame, as the nodes would be shared within each chunk only
+    :param output_format: one of lam4vb3.triple_sinks.OUTPUT_FORMATS; in a streaming format the triples are
+                            written as they are made and the returned graph holds only the concept scheme.
+                            A list of formats are all serialised from the graph, concurrently, into files
+                            named after the output file (see lam4vb3.triple_sinks.worksheet_sink)
     :return:
     """
+    if compact and not isinstance(lam_df_classes, pd.DataFrame):
+        raise ValueError("The compact constraints cannot be made from a worksheet read in chunks")
     graph = lam4vb3.lam_utils.make_graph(prefixes)
     create_concept_scheme(graph)
-    create_concepts(lam_df_classes, graph)
-    create_collections(lam_df_classes_classification, graph)
-    graph.serialize(str(output_file), format='turtle', )
+    if isinstance(lam_df_classes, pd.DataFrame):
+        lam_df_classes = [lam_df_classes]
+    # the triples are added into the graph, or written, row by row, without collecting those of the entire worksheet
+    with worksheet_sink(graph, output_file, output_format=output_format, graph_name=LAM_CS) as sink:
+        for lam_df_classes_chunk in lam_df_classes:
+            create_concepts(lam_df_classes_chunk, graph, uri_minter=uri_minter, sink=sink, compact=compact)
+        create_collections(lam_df_classes_classification, graph, sink=sink)
     return graph
@@ -6,14 +6,20 @@
 # Email: costezki.eugen@gmail.com 
 
 """ """
+import logging
+
 import rdflib
 from rdflib import SKOS, RDF
 
 import lam4vb3.lam_utils
+from lam4vb3 import LAM_PROPERTIES_WS_NAME
 from lam4vb3.builder import LAM, LAMD, SHACL
+from lam4vb3.builder.composite_builders import CompositeTripleMaker
 from lam4vb3.builder.inverse_builders import InverseTripleMaker
-from lam4vb3.builder.reified_builders import ConstraintTripleMaker
+from lam4vb3.builder.reified_builders import compaction_report, ConstraintTripleMaker
 from lam4vb3.builder.simple_builders import ConceptTripleMaker, SimpleTripleMaker
+from lam4vb3.lam_utils import DEFAULT_INSERTION
+from lam4vb3.triple_sinks import worksheet_sink, DEFAULT_OUTPUT_FORMAT
 
 LITERAL_CONCEPTS_COLUMNS = {
     'CODE': 'skos:notation',
@@ -69,6 +75,12 @@ LAM_CS = LAMD.LAMProperties
 
 URI_COLUMN = 'URI'
 
+# the columns read by the builders from the worksheets (the other columns are not loaded)
+CONCEPTS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_CONCEPTS_COLUMNS, *URI_CONCEPTS_COLUMNS, *COLLECTION_COLUMNS,
+                              *CONSTRAINT_COLUMNS]
+
+COLLECTIONS_WORKSHEET_COLUMNS = [URI_COLUMN, *LITERAL_COLLECTIONS_COLUMNS, *URI_COLLECTIONS_COLUMNS]
+
 
 def create_concept_scheme(graph):
     """
@@ -78,7 +90,8 @@ def create_concept_scheme(graph):
     graph.add((LAM_CS, SKOS.prefLabel, rdflib.Literal("Document properties")))
 
 
-def create_concepts(df, graph):
+def create_concepts(df, graph, row_indexes=None, inplace=True, uri_minter=None, sink=None,
+                    insertion=DEFAULT_INSERTION, compact=False):
     selected_columns = {**LITERAL_CONCEPTS_COLUMNS,
                         **URI_CONCEPTS_COLUMNS}
     concept_maker = ConceptTripleMaker(df=df,
@@ -91,17 +104,16 @@ def create_concepts(df, graph):
                                        subject_source_column=URI_COLUMN,
                                        subject_classes=[SKOS.Concept, LAM.DocumentProperty])
 
-    concept_maker.make_triples()
+    subject_uris = concept_maker.row_uri_index()
 
     in_collection_maker = InverseTripleMaker(df=df,
                                              column_mapping_dict=COLLECTION_COLUMNS,
                                              graph=graph,
                                              target_columns=[*COLLECTION_COLUMNS],
-                                             subject_source_column=URI_COLUMN
+                                             subject_source_column=URI_COLUMN,
+                                             subject_uris=subject_uris
                                              )
 
-    in_collection_maker.make_triples()
-
     constraint_maker = ConstraintTripleMaker(df=df,
                                              column_mapping_dict=CONSTRAINT_COLUMNS,
                                              graph=graph,
@@ -111,11 +123,23 @@ def create_concepts(df, graph):
                                              constraint_path_property=LAM.path,
                                              constraint_class=LAM.AnnotationConfiguration,
                                              constraint_comment=SKOS.editorialNote,
-                                             subject_source_column=URI_COLUMN)
-    constraint_maker.make_triples()
-
-
-def create_collections(df, graph):
+                                             subject_source_column=URI_COLUMN,
+                                             subject_uris=subject_uris,
+                                             sheet_name=LAM_PROPERTIES_WS_NAME,
+                                             uri_minter=uri_minter,
+                                             compact=compact)
+
+    composite_maker = CompositeTripleMaker([concept_maker, in_collection_maker, constraint_maker])
+    result_triples = composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink,
+                                                  insertion=insertion)
+    if compact:
+        report = compaction_report([constraint_maker])
+        logging.info(f"Compacted {report.cells} constraint cells of the {LAM_PROPERTIES_WS_NAME} worksheet "
+                     f"into {report.nodes} nodes, sparing {report.saved_nodes} nodes and {report.saved_triples} triples")
+    return result_triples
+
+
+def create_collections(df, graph, row_indexes=None, inplace=True, sink=None, insertion=DEFAULT_INSERTION):
     selected_columns = {**LITERAL_COLLECTIONS_COLUMNS,
                         **URI_COLLECTIONS_COLUMNS}
     collection_maker = SimpleTripleMaker(df=df,
@@ -126,29 +150,39 @@ def create_collections(df, graph):
                                          subject_source_column=URI_COLUMN,
                                          subject_classes=[SKOS.Collection],
                                          comment_predicate=SKOS.editorialNote)
-    collection_maker.make_triples()
+    subject_uris = collection_maker.row_uri_index()
 
     collection_parent_maker = InverseTripleMaker(df=df,
                                                  column_mapping_dict=URI_COLLECTIONS_COLUMNS,
                                                  graph=graph,
                                                  target_columns=[*URI_COLLECTIONS_COLUMNS],
-                                                 subject_source_column=URI_COLUMN
+                                                 subject_source_column=URI_COLUMN,
+                                                 subject_uris=subject_uris
                                                  )
 
-    collection_parent_maker.make_triples()
+    composite_maker = CompositeTripleMaker([collection_maker, collection_parent_maker])
+    return composite_maker.make_triples(inplace=inplace, row_indexes=row_indexes, sink=sink, insertion=insertion)
 
 
-def make_property_worksheet(lam_df_properties, lam_df_property_classification, prefixes, output_file):
+def make_property_worksheet(lam_df_properties, lam_df_property_classification, prefixes, output_file, uri_minter=None,
+                            compact=False, output_format=DEFAULT_OUTPUT_FORMAT):
     """
     :param lam_df_property_classification:
     :param lam_df_properties:
     :param prefixes:
     :param output_file:
+    :param uri_minter: the minter of the reified constraint URIs (see lam4vb3.uri_minting)
+    :param compact: share the nodes of identical constraints (see BaseConstraintTripleMaker)
+    :param output_format: one of lam4vb3.triple_sinks.OUTPUT_FORMATS; in a streaming format the triples are
+                            written as they are made and the returned graph holds only the concept scheme.
+                            A list of formats are all serialised from the graph, concurrently, into files
+                            named after the output file (see lam4vb3.triple_sinks.worksheet_sink)
     :return:
     """
     graph = lam4vb3.lam_utils.make_graph(prefixes)
     create_concept_scheme(graph)
-    create_concepts(lam_df_properties, graph)
-    create_collections(lam_df_property_classification, graph)
-    graph.serialize(str(output_file), format='turtle', )
+    # the triples are added into the graph, or written, row by row, without collecting those of the entire worksheet
+    with worksheet_sink(graph, output_file, output_format=output_format, graph_name=LAM_CS) as sink:
+        create_concepts(lam_df_properties, graph, uri_minter=uri_minter, sink=sink, compact=compact)
+        create_collections(lam_df_property_classification, graph, sink=sink)
     return graph
@@ -6,18 +6,23 @@
 # Email: costezki.eugen@gmail.com 
 
 """ """
+import collections
 from abc import ABC
-from datetime import date
 from typing import Dict, List, Tuple
 
 import pandas as pd
 import rdflib
 from rdflib import RDF, XSD, DCTERMS
 
-from lam4vb3 import lam_utils
-from lam4vb3.builder.base_builders import AbstractTripleMaker
+from lam4vb3.builder.base_builders import AbstractTripleMaker, DEFAULT_ENGINE
 from lam4vb3.builder import SHACL
 from lam4vb3.cell_parser import VALUES, MIN_COUNT, MAX_COUNT, COMMENT, NAME
+from lam4vb3.rdf_terms import term_pool
+from lam4vb3.uri_minting import DEFAULT_URI_MINTER, UriMinter
+
+# the cells with a constraint, the distinct constraint nodes they reference, and the nodes and triples spared
+# by sharing the nodes of identical constraints in compact mode
+CompactionReport = collections.namedtuple("CompactionReport", ["cells", "nodes", "saved_nodes", "saved_triples"])
 
 
 class BaseConstraintTripleMaker(AbstractTripleMaker):
@@ -51,14 +56,28 @@ class BaseConstraintTripleMaker(AbstractTripleMaker):
                  constraint_min_property: rdflib.URIRef = SHACL.minCount,
                  constraint_max_property: rdflib.URIRef = SHACL.maxCount,
                  constraint_name_property: rdflib.URIRef = SHACL.name,
-                 subject_source_column: str = "URI"):
+                 subject_source_column: str = "URI",
+                 subject_uris: Dict = None,
+                 sheet_name: str = "",
+                 uri_minter: UriMinter = None,
+                 compact: bool = False,
+                 annotating_columns: Dict[str, List[str]] = None):
+        """
+        :param sheet_name: the name of the worksheet, part of the key of the reified constraint URIs
+        :param uri_minter: the minter of the reified constraint URIs; by default the URIs are not registered
+        :param compact: if True, the cells of a column with identical constraints share one constraint node,
+                        referenced by each row, instead of a node per cell
+        :param annotating_columns: the columns annotating each column (see AnnotationConstraintTripleMaker),
+                        whose cells are part of the constraint in compact mode
+        """
         super().__init__(df=df,
                          column_mapping_dict=column_mapping_dict,
                          graph=graph,
                          target_columns=target_columns,
                          subject_source_column=subject_source_column,
                          literal_columns=[],
-                         subject_classes=[])
+                         subject_classes=[],
+                         subject_uris=subject_uris)
         self.constraint_property = constraint_property
         self.constraint_class = constraint_class
         self.constraint_comment = constraint_comment
@@ -67,6 +86,13 @@ class BaseConstraintTripleMaker(AbstractTripleMaker):
         self.constraint_min_property = constraint_min_property
         self.constraint_max_property = constraint_max_property
         self.constraint_name_property = constraint_name_property
+        self.sheet_name = sheet_name
+        self.uri_minter = uri_minter or DEFAULT_URI_MINTER
+        self.compact = compact
+        self.annotating_columns = annotating_columns or {}
+        self._reified_subjects = {}
+        # the number of cells referencing each constraint node and the number of triples of the node
+        self.constraint_nodes = {}
 
     def handle_biding_subject(self, row_index, target_column):
         """
@@ -80,14 +106,20 @@ class BaseConstraintTripleMaker(AbstractTripleMaker):
         if not cell_interpretation:
             return []
         biding_subject = self.handle_biding_subject(row_index=row_index, target_column=target_column)
-        column_predicate = self.handle_column_predicate(target_column=target_column)
+        column_predicate = self.handle_column_predicate(target_column=target_column, row_index=row_index)
 
         cell_reification_subject = self.handle_cell_reified_subject(row_index=row_index, target_column=target_column)
-
-        result_triples = [(biding_subject, self.constraint_property, cell_reification_subject),
+        binding_triple = (biding_subject, self.constraint_property, cell_reification_subject)
+        if self.compact and cell_reification_subject in self.constraint_nodes:
+            # the shared node was made for a previous cell, only the binding is new
+            cells, node_triples = self.constraint_nodes[cell_reification_subject]
+            self.constraint_nodes[cell_reification_subject] = (cells + 1, node_triples)
+            return [binding_triple]
+
+        result_triples = [binding_triple,
                           (cell_reification_subject, RDF.type, self.constraint_class),
                           (cell_reification_subject, self.constraint_path_property, column_predicate),
-                          (cell_reification_subject, DCTERMS.created, rdflib.Literal(date.today()))
+                          (cell_reification_subject, DCTERMS.created, term_pool.created())
                           ]
         # handle values if any
         if VALUES in cell_interpretation:
@@ -99,50 +131,96 @@ class BaseConstraintTripleMaker(AbstractTripleMaker):
             result_triples.extend(
                 [
                     (cell_reification_subject, self.constraint_min_property,
-                     rdflib.Literal("1", datatype=XSD.int)),
+                     term_pool.literal("1", datatype=XSD.int)),
                     (cell_reification_subject, SHACL.name,
-                     rdflib.Literal(f"Constraint on {column_predicate} to {values_as_string_for_comment}")),
+                     term_pool.literal(f"Constraint on {column_predicate} to {values_as_string_for_comment}")),
                 ])
 
         # handle min count if any
         if MIN_COUNT in cell_interpretation:
             result_triples.append(
                 (cell_reification_subject, self.constraint_min_property,
-                 rdflib.Literal(f"{cell_interpretation[MIN_COUNT]}", datatype=XSD.int)))
+                 term_pool.literal(f"{cell_interpretation[MIN_COUNT]}", datatype=XSD.int)))
 
         # max count values if any
         if MAX_COUNT in cell_interpretation:
             result_triples.append(
                 (cell_reification_subject, self.constraint_max_property,
-                 rdflib.Literal(f"{cell_interpretation[MAX_COUNT]}", datatype=XSD.int)))
+                 term_pool.literal(f"{cell_interpretation[MAX_COUNT]}", datatype=XSD.int)))
 
         # comment values if any
         if COMMENT in cell_interpretation:
             result_triples.append(
                 (cell_reification_subject, self.constraint_comment,
-                 rdflib.Literal(f"{cell_interpretation[COMMENT]}", lang="en")))
+                 term_pool.literal(f"{cell_interpretation[COMMENT]}", lang="en")))
 
         # add name if any available
         if NAME in cell_interpretation:
             result_triples.append(
                 (cell_reification_subject, self.constraint_name_property,
-                 rdflib.Literal(f"{cell_interpretation[NAME]} {column_predicate}", lang="en")))
+                 term_pool.literal(f"{cell_interpretation[NAME]} {column_predicate}", lang="en")))
 
+        cells, _ = self.constraint_nodes.get(cell_reification_subject, (0, 0))
+        # all but the triple binding the node
+        self.constraint_nodes[cell_reification_subject] = (cells + 1, len(result_triples) - 1)
         return result_triples
 
+    def start_triples(self, error_ok=False, engine=DEFAULT_ENGINE) -> List[Tuple]:
+        """
+            Prepare a pass over the rows, in which each shared constraint node is made once, for its first cell.
+        """
+        self.constraint_nodes = {}
+        return super().start_triples(error_ok=error_ok, engine=engine)
+
     def handle_cell_reified_subject(self, row_index, target_column: str):
         """
             # also take the cell value into consideration, in case of multi-line cells
             # generating one constraint object for the entire cell rather than for each value in particular
             # this is possible to control by indicating that the constraint object ID is the
             # same for each value because UUID is based on "column + row" rather than "column + row + value"
+            The URIs are minted for the entire column at once, from the worksheet name, the column and the
+            row subject, so they do not depend on the position of the row or on the other rows.
+            In compact mode the row subject is replaced by the constraint body (see constraint_body_key).
         :param row_index:
         :param target_column:
         :return:
         """
-        return lam_utils.generate_uuid_uri(f"{target_column}-{row_index}",
-                                           seed=str(self.df.head()),
-                                           graph=self.graph, )
+        if target_column not in self._reified_subjects:
+            if self.compact:
+                row_keys = [self.constraint_body_key(row_index=index, target_column=target_column)
+                            for index in self.df.index]
+            else:
+                row_subjects = self.row_uri_index()
+                # a row without subject (or whose subject could not be made) is identified by its index
+                row_keys = [index if row_subjects[index] is None or isinstance(row_subjects[index], Exception)
+                            else row_subjects[index] for index in self.df.index]
+            self._reified_subjects[target_column] = dict(
+                zip(self.df.index, self.uri_minter.mint(self.graph, sheet_name=self.sheet_name, column=target_column,
+                                                        row_keys=row_keys)))
+        return self._reified_subjects[target_column][row_index]
+
+    def constraint_body_key(self, row_index, target_column: str) -> str:
+        """
+            The key of the constraint of the cell in compact mode: its interpretation (values, counts, comment and
+            name) and the cells annotating it, so that identical constraints of a column share their node.
+        """
+        try:
+            cell_interpretation = self.handle_cell_value(row_index=row_index, target_column=target_column)
+            body = [(field, cell_interpretation[field]) for field in (VALUES, MIN_COUNT, MAX_COUNT, COMMENT, NAME)
+                    if field in cell_interpretation]
+        except Exception:
+            # the cell is reported when making its triples, if it belongs to this maker
+            body = [str(self.df.loc[row_index, target_column])] if target_column in self.df.columns else []
+        body.extend(str(self.df.loc[row_index, column]) for column in self.annotating_columns.get(target_column, [])
+                    if column in self.df.columns)
+        return repr(body)
+
+    def compaction_report(self) -> CompactionReport:
+        cells = sum(node_cells for node_cells, _ in self.constraint_nodes.values())
+        return CompactionReport(cells=cells, nodes=len(self.constraint_nodes),
+                                saved_nodes=cells - len(self.constraint_nodes),
+                                saved_triples=sum((node_cells - 1) * node_triples
+                                                  for node_cells, node_triples in self.constraint_nodes.values()))
 
 
 class ConstraintTripleMaker(BaseConstraintTripleMaker):
@@ -179,6 +257,11 @@ class AnnotationConstraintTripleMaker(BaseConstraintTripleMaker):
                  constraint_max_property: rdflib.URIRef = SHACL.maxCount,
                  constraint_name_property: rdflib.URIRef = SHACL.name,
                  subject_source_column: str = "URI",
+                 subject_uris: Dict = None,
+                 sheet_name: str = "",
+                 uri_minter: UriMinter = None,
+                 compact: bool = False,
+                 annotating_columns: Dict[str, List[str]] = None,
                  ):
         super().__init__(df=df,
                          column_mapping_dict=column_mapping_dict,
@@ -192,7 +275,12 @@ class AnnotationConstraintTripleMaker(BaseConstraintTripleMaker):
                          constraint_min_property=constraint_min_property,
                          constraint_max_property=constraint_max_property,
                          constraint_name_property=constraint_name_property,
-                         subject_source_column=subject_source_column)
+                         subject_source_column=subject_source_column,
+                         subject_uris=subject_uris,
+                         sheet_name=sheet_name,
+                         uri_minter=uri_minter,
+                         compact=compact,
+                         annotating_columns=annotating_columns)
 
         self.annotation_column_mapping = annotation_column_mapping
 
@@ -202,3 +290,11 @@ class AnnotationConstraintTripleMaker(BaseConstraintTripleMaker):
 
     def make_row_triples(self, row_index, ) -> List[Tuple]:
         return []
+
+
+def compaction_report(makers: List[BaseConstraintTripleMaker]) -> CompactionReport:
+    """
+        the compaction reports of the constraint makers, added up
+    """
+    reports = [maker.compaction_report() for maker in makers]
+    return CompactionReport(*(sum(values) for values in zip(*reports))) if reports else CompactionReport(0, 0, 0, 0)
@@ -15,6 +15,7 @@ from rdflib import SKOS
 
 from lam4vb3.builder.base_builders import AbstractTripleMaker
 from lam4vb3.cell_parser import LITERAL_VALUE, VALUES, COMMENT
+from lam4vb3.rdf_terms import term_pool
 
 
 class SimpleTripleMaker(AbstractTripleMaker):
@@ -33,6 +34,7 @@ class SimpleTripleMaker(AbstractTripleMaker):
                  literal_columns: List[str] = [],
                  subject_source_column: str = "URI",
                  subject_classes: List[rdflib.URIRef] = [SKOS.Concept],
+                 subject_uris: Dict = None,
                  ):
         """
         :type subject_in_scheme: the concept scheme in which all the rows will be placed
@@ -43,23 +45,24 @@ class SimpleTripleMaker(AbstractTripleMaker):
                          target_columns=target_columns,
                          subject_source_column=subject_source_column,
                          literal_columns=literal_columns,
-                         subject_classes=subject_classes)
+                         subject_classes=subject_classes,
+                         subject_uris=subject_uris)
         self.comment_predicate = comment_predicate
 
     def make_cell_triples(self, row_index, target_column: str) -> List[Tuple]:
         cell_interpretation = self.handle_cell_value(row_index=row_index, target_column=target_column)
 
         row_subject = self.handle_row_uri(row_index=row_index)
-        column_predicate = self.handle_column_predicate(target_column=target_column)
+        column_predicate = self.handle_column_predicate(target_column=target_column, row_index=row_index)
 
         if LITERAL_VALUE in cell_interpretation:
             predicate_language = self.handle_literal_language_from_predicate_signature(target_column=target_column)
             return [(row_subject, column_predicate,
-                     rdflib.Literal(cell_interpretation[LITERAL_VALUE], lang=predicate_language))]
+                     term_pool.literal(cell_interpretation[LITERAL_VALUE], lang=predicate_language))]
         elif VALUES in cell_interpretation:
             result = [(row_subject, column_predicate, value) for value in cell_interpretation[VALUES]]
             if COMMENT in cell_interpretation:
-                result.append((row_subject, self.comment_predicate, rdflib.Literal(cell_interpretation[COMMENT])))
+                result.append((row_subject, self.comment_predicate, term_pool.literal(cell_interpretation[COMMENT])))
             return result
 
         return []
@@ -81,6 +84,7 @@ class ConceptTripleMaker(SimpleTripleMaker):
                  literal_columns: List[str] = [],
                  subject_source_column: str = "URI",
                  subject_classes: List[rdflib.URIRef] = [SKOS.Concept],
+                 subject_uris: Dict = None,
                  ):
         """
         :type subject_in_scheme: the concept scheme in which all the rows will be placed
@@ -92,7 +96,8 @@ class ConceptTripleMaker(SimpleTripleMaker):
                          subject_source_column=subject_source_column,
                          literal_columns=literal_columns,
                          subject_classes=subject_classes,
-                         comment_predicate=comment_predicate)
+                         comment_predicate=comment_predicate,
+                         subject_uris=subject_uris)
         self.subject_in_scheme = subject_in_scheme
 
     def make_row_triples(self, row_index) -> List[Tuple]:
@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+
+# canonical_turtle.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    A canonical Turtle writer: the same triples are always written as the same bytes, so that the generated
+    files can be committed and diffed.
+
+    The triples are written as N-Triples lines, sorted in chunks of bounded size spilled into temporary files
+    and merged (an external merge sort), so the memory does not grow with the output. The merged lines come
+    grouped by subject and then by predicate, in the code point order of their N-Triples form, and are written
+    as Turtle, with the IRIs abbreviated by the longest matching namespace.
+
+    The blank nodes keep their labels, so their output is as stable as the labels the makers give them.
+"""
+import heapq
+import itertools
+import pathlib
+import re
+import tempfile
+
+from lam4vb3.rdf_terms import n_triples_line
+
+SORT_CHUNK_SIZE = 100000
+INDENT = "    "
+RDF_TYPE_IRI = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+# the local names abbreviated into prefixed names; the others, e.g. with dots or slashes, are written as IRIs
+LOCAL_NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_\-]*")
+DATATYPE_SEPARATOR = '"^^<'
+
+
+def split_n_triples_line(line: str) -> tuple:
+    """
+        the subject, the predicate and the object of an N-Triples line; the IRIs and the blank node labels
+        have no spaces, so the first two spaces separate the terms
+    """
+    subject, predicate, rest = line.split(" ", 2)
+    return subject, predicate, rest.rstrip("\n")[:-2]
+
+
+class TermAbbreviator:
+    """
+        Writes the N-Triples terms in Turtle, as prefixed names where a namespace matches.
+    """
+
+    def __init__(self, namespaces):
+        """
+        :param namespaces: the (prefix, namespace) pairs, e.g. graph.namespaces()
+        """
+        self.namespaces = sorted({(str(prefix), str(namespace)) for prefix, namespace in namespaces})
+        # the longest namespaces are tried first, then in the order of the prefixes
+        self._candidates = sorted(self.namespaces, key=lambda pair: (-len(pair[1]), pair))
+        self._cache = {}
+
+    def iri(self, term: str) -> str:
+        """
+            the prefixed name of an N-Triples IRI (e.g. <http://www.w3.org/2004/02/skos/core#Concept>), if any
+        """
+        result = self._cache.get(term)
+        if result is None:
+            result = term
+            iri = term[1:-1]
+            for prefix, namespace in self._candidates:
+                if iri.startswith(namespace) and LOCAL_NAME_PATTERN.fullmatch(iri[len(namespace):]):
+                    result = f"{prefix}:{iri[len(namespace):]}"
+                    break
+            self._cache[term] = result
+        return result
+
+    def term(self, term: str) -> str:
+        if term.startswith("<"):
+            return self.iri(term)
+        if term.startswith('"') and term.endswith(">") and DATATYPE_SEPARATOR in term:
+            lexical_form, datatype = term.rsplit("^^", 1)
+            return f"{lexical_form}^^{self.iri(datatype)}"
+        # the N-Triples literals and blank nodes are valid Turtle
+        return term
+
+    def prefix_lines(self) -> list:
+        return [f"@prefix {prefix}: <{namespace}> .\n" for prefix, namespace in self.namespaces]
+
+
+def merge_sorted_chunks(chunk_files: list, lines: list):
+    """
+        the unique lines of the sorted chunk files and of the sorted list of lines, in order
+    """
+    streams = [open(chunk_file, encoding="utf-8") for chunk_file in chunk_files]
+    try:
+        merged = heapq.merge(*streams, lines)
+        yield from (line for line, _ in itertools.groupby(merged))
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def write_turtle_lines(sorted_lines, stream, abbreviator: TermAbbreviator):
+    """
+        write the sorted N-Triples lines as Turtle, one block per subject
+    """
+    for line in abbreviator.prefix_lines():
+        stream.write(line)
+    for subject, subject_lines in itertools.groupby(map(split_n_triples_line, sorted_lines), key=lambda terms: terms[0]):
+        stream.write(f"\n{abbreviator.term(subject)}")
+        predicate_separator = " "
+        for predicate, predicate_lines in itertools.groupby(subject_lines, key=lambda terms: terms[1]):
+            stream.write(predicate_separator + ("a" if predicate == RDF_TYPE_IRI else abbreviator.term(predicate)))
+            object_separator = " "
+            for _, _, object_term in predicate_lines:
+                stream.write(object_separator + abbreviator.term(object_term))
+                object_separator = ",\n" + INDENT * 2
+            predicate_separator = " ;\n" + INDENT
+        stream.write(" .\n")
+
+
+class CanonicalTurtleSink:
+    """
+        Writes the triples as canonical Turtle when closed, holding at most chunk_size of them in memory.
+        Like the other sinks (see lam4vb3.triple_sinks), it receives the triples with add_triples.
+    """
+
+    def __init__(self, destination, namespaces=(), chunk_size: int = SORT_CHUNK_SIZE):
+        """
+        :param destination: a file path, or an open text stream which is left open by close
+        :param namespaces: the (prefix, namespace) pairs abbreviating the IRIs, e.g. graph.namespaces()
+        :param chunk_size: the number of lines sorted in memory before being spilled into a temporary file
+        """
+        self.destination = destination
+        self.abbreviator = TermAbbreviator(namespaces)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._lines = []
+        self._chunk_files = []
+        self._temporary_folder = None
+        self._closed = False
+
+    def add_triples(self, triples):
+        for triple in triples:
+            self._lines.append(n_triples_line(triple))
+            self.count += 1
+            if len(self._lines) >= self.chunk_size:
+                self._spill()
+
+    def _spill(self):
+        if self._temporary_folder is None:
+            self._temporary_folder = tempfile.TemporaryDirectory(prefix="canonical_turtle_")
+        chunk_file = pathlib.Path(self._temporary_folder.name) / f"chunk_{len(self._chunk_files)}.nt"
+        chunk_file.write_text("".join(sorted(set(self._lines))), encoding="utf-8")
+        self._chunk_files.append(chunk_file)
+        self._lines = []
+
+    def close(self):
+        """
+            merge the sorted chunks and write the Turtle
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            sorted_lines = merge_sorted_chunks(self._chunk_files, sorted(set(self._lines)))
+            if isinstance(self.destination, (str, pathlib.Path)):
+                with open(self.destination, "w", encoding="utf-8", newline="\n") as stream:
+                    write_turtle_lines(sorted_lines, stream, self.abbreviator)
+            else:
+                write_turtle_lines(sorted_lines, self.destination, self.abbreviator)
+        finally:
+            self.discard()
+
+    def discard(self):
+        """
+            drop the triples received so far, without writing them
+        """
+        self._closed = True
+        self._lines = []
+        if self._temporary_folder is not None:
+            self._temporary_folder.cleanup()
+            self._temporary_folder = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # an incomplete output is not written
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_canonical_turtle(triples, destination, namespaces=(), chunk_size: int = SORT_CHUNK_SIZE) -> int:
+    """
+        Write the triples (e.g. a graph) as canonical Turtle.
+
+    :return: the number of triples written, including the repeated ones
+    """
+    with CanonicalTurtleSink(destination, namespaces=namespaces, chunk_size=chunk_size) as sink:
+        sink.add_triples(triples)
+    return sink.count
@@ -8,17 +8,23 @@ cases:
 3. Multi line reference values with comments
 
 """
-import re
+import collections
 
 import pandas as pd
 import rdflib
 
+from lam4vb3 import cell_tokenizer
+from lam4vb3.rdf_terms import term_pool
+
 LITERAL_VALUE = "literal_value"
 VALUES = "values"
 COMMENT = "comment"
 MIN_COUNT = "min_count"
 MAX_COUNT = "max_count"
 NAME = "name"
+ERROR = "error"
+
+PARSED_COLUMNS = [LITERAL_VALUE, VALUES, MIN_COUNT, MAX_COUNT, COMMENT, NAME, ERROR]
 
 CONTROLLED_LIST = {
     "y": {MIN_COUNT: 1, NAME: "Mandatory"},
@@ -30,6 +36,57 @@ CONTROLLED_LIST = {
 }
 
 
+PARSE_CACHE_SIZE = 8192
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ParseCache:
+    """
+        A bounded LRU memo of cell interpretations, keyed by the cell value, the literal flag and
+        the namespace version of the graph (see lam_utils.LamGraph), so that the entries computed
+        before a prefix is (re)bound are never reused.
+    """
+
+    def __init__(self, maxsize: int = PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, result: dict):
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._entries))
+
+
+parse_cache = ParseCache()
+
+
+def parse_cache_info() -> CacheInfo:
+    """
+        the hit and miss statistics of the parse_cell memo
+    """
+    return parse_cache.info()
+
+
 def parse_cell(cell_value: str, graph: rdflib.Graph, is_literal=False) -> dict:
     """
         Interpret the cell_value if it is not a literal.
@@ -43,6 +100,27 @@ def parse_cell(cell_value: str, graph: rdflib.Graph, is_literal=False) -> dict:
             comment: 'comment literal'
         }
 
+        The interpretations are memoized for the graphs that keep track of their namespace version.
+    """
+    namespace_version = getattr(graph, "namespace_version", None)
+    if namespace_version is None:
+        return interpret_cell(cell_value=cell_value, graph=graph, is_literal=is_literal)
+
+    key = (cell_value, is_literal, namespace_version)
+    result = parse_cache.get(key)
+    if result is None:
+        result = interpret_cell(cell_value=cell_value, graph=graph, is_literal=is_literal)
+        parse_cache.put(key, result)
+    # the callers get their own copy of the memoized interpretation
+    result = dict(result)
+    if VALUES in result:
+        result[VALUES] = list(result[VALUES])
+    return result
+
+
+def interpret_cell(cell_value: str, graph: rdflib.Graph, is_literal=False) -> dict:
+    """
+        Interpret the cell_value, without memoization. See parse_cell.
     """
     result = {}
     if is_literal:
@@ -54,65 +132,143 @@ def parse_cell(cell_value: str, graph: rdflib.Graph, is_literal=False) -> dict:
         #     raise ValueError(
         #         f"Literal values should be free text with no markers present (|). The value given was {cell_value}")
 
-    first_part, second_part = split_by_pipe(cell_value)
-    first_part = normalize_spaces(first_part)
+    values, comment = cell_tokenizer.tokenize_cell(cell_value)
 
-    if second_part:
-        result[COMMENT] = second_part.lstrip(" ")
+    if comment is not None:
+        result[COMMENT] = comment
 
-    if first_part.lower() in CONTROLLED_LIST:
-        result.update(CONTROLLED_LIST[first_part.lower()])
+    # a controlled list value is alone in the cell
+    controlled_value = values[0].lower() if len(values) == 1 else "" if not values else None
+    if controlled_value in CONTROLLED_LIST:
+        result.update(CONTROLLED_LIST[controlled_value])
     else:
-        values = split_lines(first_part)
-        list_of_uris = [qname_uri(qname, graph.namespaces()) for qname in values]
+        resolver = namespace_resolver(graph)
+        list_of_uris = [term_pool.uri(qname_uri(qname, resolver)) for qname in values]
         result[VALUES] = list_of_uris
         result[MIN_COUNT] = 1
 
     return result
 
 
+def parse_column(column: pd.Series, graph: rdflib.Graph, is_literal=False) -> pd.DataFrame:
+    """
+        Interpret all the cells of a column at once, with the same semantics as parse_cell.
+        Each distinct cell value is interpreted once, through the parse_cell memo.
+
+        returns a data frame with the index of the column and a row per cell, with the columns
+        literal_value, values, min_count, max_count, comment, name and error. The fields that parse_cell
+        would not set are None. The error is the message of the exception parse_cell would raise, if any.
+    """
+    cells = column.astype(str)
+    interpretations = {}
+    for cell_value in cells.unique():
+        try:
+            interpretations[cell_value] = parse_cell(cell_value=cell_value, graph=graph, is_literal=is_literal)
+        except ValueError as e:
+            interpretations[cell_value] = {ERROR: str(e)}
+    cell_fields = [interpretations[cell_value] for cell_value in cells]
+    return pd.DataFrame({field: pd.Series([fields.get(field) for fields in cell_fields], index=column.index, dtype=object)
+                         for field in PARSED_COLUMNS}, index=column.index)
+
+
+def interpretation_fields(fields: dict) -> dict:
+    """
+        the parse_cell dictionary of a row of the frame produced by parse_column, given as a dictionary
+    """
+    result = {field: value for field, value in fields.items() if field != ERROR and value is not None}
+    for field in (MIN_COUNT, MAX_COUNT):
+        if field in result:
+            result[field] = int(result[field])
+    if VALUES in result:
+        result[VALUES] = list(result[VALUES])
+    return result
+
+
+def cell_interpretation(parsed_column: pd.DataFrame, index) -> dict:
+    """
+        The parse_cell dictionary of a cell from the frame produced by parse_column.
+        Raises a ValueError if the cell could not be parsed.
+    """
+    row = parsed_column.loc[index]
+    if row[ERROR] is not None:
+        raise ValueError(row[ERROR])
+    return interpretation_fields(row.to_dict())
+
+
+def cell_interpretations(parsed_column: pd.DataFrame) -> list:
+    """
+        The parse_cell dictionaries of all the cells in the frame produced by parse_column, in the order
+        of its rows. The cells that could not be parsed are represented by a ValueError.
+    """
+    arrays = {field: parsed_column[field].to_numpy() for field in PARSED_COLUMNS}
+    return [ValueError(fields[ERROR]) if fields[ERROR] is not None else interpretation_fields(fields)
+            for fields in (dict(zip(arrays, values)) for values in zip(*arrays.values()))]
+
+
 def split_by_pipe(string: str) -> tuple:
     """
         For a given cell_value (string) split the string by pipe ("|") an return a
         list a values. It will raise an error if there are more than on pipe
     """
-    pipe = "|"
-    result_list = string.split(pipe)
-    if len(result_list) > 2:
-        raise ValueError(f"Cannot have more than one pipe (|) separator in the cell value")
-
-    return result_list[0], result_list[1] if len(result_list) > 1 else None
+    return cell_tokenizer.split_by_pipe(string)
 
 
 def split_lines(string: str) -> list:
-    return list(filter(None, [normalize_spaces(x) for x in string.split("\n")]))
+    return cell_tokenizer.tokenize_lines(string)
 
 
 def normalize_spaces(string: str):
-    if string:
-        return re.sub(" +", " ", string).lstrip().rstrip()
-    return string
+    return cell_tokenizer.normalize_spaces(string)
 
 
 def parse_qname(qname):
     """
         give a qualified name such as skos:prefLabel (or skos:prefLabel@en with linguistic annotation)
     """
-    p = re.compile(r"""([\w\-_]+){0,1}:([\w\-_]+){1,1}(?:@){0,1}([\w]+){0,1}""")
-    try:
-        dummy1, prefix, name, language, dummy2 = p.split(qname)
-    except:
-        raise ValueError(f"Could not segment the qualified name: {qname}")
-    return "" if prefix is None else prefix, name, language
+    return cell_tokenizer.tokenize_qname(qname)
+
+
+class NamespaceResolver:
+    """
+        The prefix to namespace base dictionary of a graph.
+        It is rebuilt on the first lookup after a prefix is bound in the graph (see lam_utils.LamGraph),
+        or on every lookup for the graphs that do not keep track of their namespace version.
+    """
+
+    def __init__(self, graph: rdflib.Graph):
+        self.graph = graph
+        self.namespace_version = None
+        self.bases = {}
+
+    def refresh(self):
+        self.bases = {prefix: base for prefix, base in self.graph.namespaces()}
+        self.namespace_version = getattr(self.graph, "namespace_version", None)
+
+    def base(self, prefix: str) -> rdflib.URIRef:
+        if self.namespace_version is None or self.namespace_version != self.graph.namespace_version:
+            self.refresh()
+        return self.bases[prefix]
+
+
+def namespace_resolver(graph: rdflib.Graph) -> NamespaceResolver:
+    """
+        the namespace resolver of the graph, or a new one if the graph does not have one
+    """
+    resolver = getattr(graph, "namespace_resolver", None)
+    return resolver if resolver is not None else NamespaceResolver(graph)
 
 
 def qname_uri(qname, namespaces):
     """
-        return the URI for this qname provided that the prefix is found in the list of namescapce tuples
+        return the URI for this qname provided that the prefix is found in the namespace resolver
+        or in the list of namescapce tuples
     """
     prefix, name, language = parse_qname(qname)
     try:
-        base = [ns for ns in namespaces if ns[0] == prefix][0][1]
+        if isinstance(namespaces, NamespaceResolver):
+            base = namespaces.base(prefix)
+        else:
+            base = [ns for ns in namespaces if ns[0] == prefix][0][1]
     except:
         raise ValueError(f"Invalid or unknown qualified name: {qname}. Parsed as {prefix}:{name}@{language}")
     return base + name
@@ -138,7 +294,7 @@ def parse_value(value, graph=None, language=None, data_type=None):
     if value and not pd.isna(value):
         if graph is not None:
             try:
-                return qname_uri(str.strip(value), graph.namespaces())
+                return qname_uri(str.strip(value), namespace_resolver(graph))
             except Exception:
                 return rdflib.URIRef(str.strip(value))
         elif language:
@@ -159,7 +315,7 @@ def parse_multi_line_value(multi_line_value, graph=None, language=None, data_typ
     :return:
     """
     return [parse_value(x, graph=graph, language=language, data_type=data_type)
-            for x in re.split(r"[\n,]", multi_line_value) if x]
+            for x in cell_tokenizer.MULTI_LINE_SEPARATOR_PATTERN.split(multi_line_value) if x]
 
 
 def parse_commented_value(commented_value, graph=None, language=None, data_type=None) -> (
@@ -180,7 +336,7 @@ def parse_commented_value(commented_value, graph=None, language=None, data_type=
     :param commented_value: the string value of the cell
     :return: tuple("cell value", "cell comment")
     """
-    parts = [x for x in re.split(r"[~\|]", commented_value) if x]
+    parts = [x for x in cell_tokenizer.COMMENT_SEPARATOR_PATTERN.split(commented_value) if x]
     value = parts[0] if parts else None
     comment = parts[1] if len(parts) > 1 else None
     parsed_value = parse_value(value, graph=graph, language=language, data_type=data_type)
@@ -201,6 +357,6 @@ def parse_multi_line_commented_value(multi_line_commented_value, graph=None, lan
     :return:
     """
 
-    lines = [str.strip(x) for x in re.split(r"\n", multi_line_commented_value) if x]
+    lines = [str.strip(x) for x in multi_line_commented_value.split(cell_tokenizer.NEW_LINE) if x]
     return [parse_commented_value(x, graph=graph, language=language, data_type=data_type) for x in lines
             if x]
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+
+# cell_tokenizer.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Tokenizer of the cell grammar. The regular expressions are compiled once at import and the cells
+    are split with the string methods, without intermediate passes over the cell.
+
+    A cell is a value part optionally followed by a comment, separated by a pipe (|):
+
+        prefix:name
+        prefix:name | a comment
+
+    The value part may hold several values, one per line; runs of spaces are collapsed and
+    the white space around each value is dropped.
+    A qualified name is prefix:name, optionally with a language tag: prefix:name@lang.
+"""
+import collections
+import re
+
+PIPE = "|"
+NEW_LINE = "\n"
+
+SPACES_PATTERN = re.compile(" {2,}")
+QNAME_PATTERN = re.compile(r"""([\w\-_]+){0,1}:([\w\-_]+){1,1}(?:@){0,1}([\w]+){0,1}""")
+# separators of the deprecated multi line and commented value helpers
+MULTI_LINE_SEPARATOR_PATTERN = re.compile(r"[\n,]")
+COMMENT_SEPARATOR_PATTERN = re.compile(r"[~|]")
+
+CellTokens = collections.namedtuple("CellTokens", ["values", "comment"])
+
+
+def split_by_pipe(cell_value: str) -> tuple:
+    """
+        the value part and the comment part (None if there is no pipe) of the cell.
+        Raises a ValueError if there is more than one pipe in the cell.
+    """
+    value_part, pipe, comment_part = cell_value.partition(PIPE)
+    if PIPE in comment_part:
+        raise ValueError(f"Cannot have more than one pipe (|) separator in the cell value")
+    return value_part, comment_part if pipe else None
+
+
+def normalize_spaces(string: str) -> str:
+    """
+        collapse the runs of spaces and strip the white space around the string
+    """
+    if string and "  " in string:
+        string = SPACES_PATTERN.sub(" ", string)
+    return string.strip() if string else string
+
+
+def tokenize_lines(string: str) -> list:
+    """
+        the non empty lines of the string, with normalized spaces
+    """
+    lines = [normalize_spaces(line) for line in string.split(NEW_LINE)] if NEW_LINE in string \
+        else [normalize_spaces(string)]
+    return [line for line in lines if line]
+
+
+def tokenize_cell(cell_value: str) -> CellTokens:
+    """
+        Split the cell into its values and its comment.
+        The comment is None when the cell has no comment.
+        Raises a ValueError if there is more than one pipe in the cell.
+    """
+    value_part, comment_part = split_by_pipe(cell_value)
+    return CellTokens(values=tokenize_lines(value_part),
+                      comment=comment_part.lstrip(" ") if comment_part else None)
+
+
+def tokenize_qname(qname: str) -> tuple:
+    """
+        segment a qualified name such as skos:prefLabel (or skos:prefLabel@en with linguistic annotation)
+        into its prefix, name and language
+    """
+    try:
+        _, prefix, name, language, _ = QNAME_PATTERN.split(qname)
+    except (TypeError, ValueError):
+        raise ValueError(f"Could not segment the qualified name: {qname}")
+    return "" if prefix is None else prefix, name, language
@@ -5,120 +5,300 @@ Author: Eugeniu Costetchi
 Email: costezki.eugen@gmail.com
 """
 
+import concurrent.futures
+import datetime
 import pathlib
-import warnings
 
-import pandas as pd
 import click
 import logging
 import time
 
-from lam4vb3 import LAM_PROPERTIES_WS_NAME, LAM_CLASSES_WS_NAME, CELEX_CLASSES_WS_NAME, \
-    LAM_PROPERTY_CLASSIFICATION_WS_NAME, PREFIX_WS_NAME, \
-    LAM_CLASS_CLASSIFICATION_WS_NAME, CELEX_CLASS_CLASSIFICATION_WS_NAME
 from lam4vb3.builder.celex_classes_builder import make_celex_classes_worksheet
 from lam4vb3.builder.lam_classes_builder import make_lam_classes_worksheet
 from lam4vb3.builder.property_builder import make_property_worksheet
-from lam4vb3.lam_utils import read_excel_worksheet
+from lam4vb3 import WORKSHEET_NAMES, LAM_CLASSES_WS_NAME, LAM_PROPERTIES_WS_NAME, \
+    LAM_PROPERTY_CLASSIFICATION_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME, CELEX_CLASSES_WS_NAME, \
+    CELEX_CLASS_CLASSIFICATION_WS_NAME, PREFIX_WS_NAME
+from lam4vb3.cell_parser import parse_cache_info
+from lam4vb3.builder import celex_classes_builder, lam_classes_builder, property_builder
+from lam4vb3.incremental import make_worksheet_incrementally
+from lam4vb3.input_adapters import detect_input_format, EXCEL_FORMAT
+from lam4vb3.lam_utils import PREFIX_WORKSHEET_COLUMNS
+from lam4vb3.rdf_terms import term_pool, term_pool_info
+from lam4vb3.triple_sinks import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, TURTLE_FORMAT, output_file_name, output_files
+from lam4vb3.uri_minting import UriMinter
+from lam4vb3.workbook import WorkbookSnapshot, read_excel_worksheet_in_chunks
+from lam4vb3.workbook_cache import WorkbookCache
 from tests import LAM_p, LAM_c, CELEX_c
 
+# builder, concepts worksheet, collections worksheet and output file of each transformation
+TRANSFORMATIONS = [
+    (celex_classes_builder, CELEX_CLASSES_WS_NAME, CELEX_CLASS_CLASSIFICATION_WS_NAME, CELEX_c),
+    (property_builder, LAM_PROPERTIES_WS_NAME, LAM_PROPERTY_CLASSIFICATION_WS_NAME, LAM_p),
+    (lam_classes_builder, LAM_CLASSES_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME, LAM_c),
+]
 
-def transform_properties(input_file, output_folder):
-    logging.info(f"Transforming LAM properties from  the file {input_file}")
+# the worksheets read by each transformation, besides the prefixes, by concepts worksheet name
+TRANSFORMATION_SHEETS = {concepts_sheet_name: [concepts_sheet_name, collections_sheet_name]
+                         for _, concepts_sheet_name, collections_sheet_name, _ in TRANSFORMATIONS}
+
+# only the columns used by the builders are read from the worksheets
+WORKSHEET_COLUMNS = {
+    PREFIX_WS_NAME: PREFIX_WORKSHEET_COLUMNS,
+    **{concepts_sheet_name: builder.CONCEPTS_WORKSHEET_COLUMNS
+       for builder, concepts_sheet_name, _, _ in TRANSFORMATIONS},
+    **{collections_sheet_name: builder.COLLECTIONS_WORKSHEET_COLUMNS
+       for builder, _, collections_sheet_name, _ in TRANSFORMATIONS},
+}
+
+
+def load_workbook(input_file, workbook: WorkbookSnapshot = None, sheet_names=WORKSHEET_NAMES,
+                  cache: WorkbookCache = None) -> WorkbookSnapshot:
+    """
+        reuse the already loaded workbook if one is provided, otherwise read the input file,
+        through the cache of parsed workbooks if one is provided
+    """
+    if workbook is None:
+        start_time = time.time()
+        # folders of CSV or Parquet files are fast to read and are not cached
+        if cache is not None and pathlib.Path(input_file).is_file():
+            workbook = cache.load_workbook(file_path=input_file, sheet_names=sheet_names, usecols=WORKSHEET_COLUMNS)
+        else:
+            workbook = WorkbookSnapshot(file_path=input_file, sheet_names=sheet_names, usecols=WORKSHEET_COLUMNS)
+        logging.info(f"Loaded the workbook {input_file} in {(time.time() - start_time)} seconds")
+    return workbook
 
-    lam_df_properties = read_excel_worksheet(file_path=input_file, sheet_name=LAM_PROPERTIES_WS_NAME)
-    lam_df_property_classification = read_excel_worksheet(file_path=input_file,
-                                                          sheet_name=LAM_PROPERTY_CLASSIFICATION_WS_NAME)
-    prefixes = read_excel_worksheet(file_path=input_file, sheet_name=PREFIX_WS_NAME)
+
+def transform_properties(input_file, output_folder, workbook: WorkbookSnapshot = None, uri_minter: UriMinter = None,
+                         compact: bool = False, output_format=DEFAULT_OUTPUT_FORMAT):
+    logging.info(f"Transforming LAM properties from  the file {input_file}")
+    workbook = load_workbook(input_file=input_file, workbook=workbook)
 
     start_time = time.time()
-    return_graph = make_property_worksheet(lam_df_properties=lam_df_properties,
-                                           lam_df_property_classification=lam_df_property_classification,
-                                           prefixes=prefixes, output_file=pathlib.Path(output_folder) / LAM_p)
+    output_file = pathlib.Path(output_folder) / output_file_name(LAM_p, output_format)
+    return_graph = make_property_worksheet(lam_df_properties=workbook.lam_properties,
+                                           lam_df_property_classification=workbook.lam_property_classification,
+                                           prefixes=workbook.prefixes, output_file=output_file,
+                                           uri_minter=uri_minter, compact=compact, output_format=output_format)
 
-    logging.info(
-        f"Successfully completed the transformation. The output is written into {pathlib.Path(output_folder) / LAM_p}")
+    logging.info(f"Successfully completed the transformation. The output is written into {output_file}")
     logging.info(f"Elapsed {(time.time() - start_time)} seconds")
     return return_graph
 
 
-def transform_classes(input_file, output_folder):
+def transform_classes(input_file, output_folder, workbook: WorkbookSnapshot = None, chunk_size: int = None,
+                      uri_minter: UriMinter = None, compact: bool = False, output_format=DEFAULT_OUTPUT_FORMAT):
+    """
+        When a chunk size is given, the LAM classes worksheet is streamed from the input file
+        in chunks of chunk_size rows instead of being taken from the loaded workbook.
+        The compact mode shares the constraint nodes across the whole worksheet, so it cannot be streamed in chunks.
+    """
+    if chunk_size and compact:
+        raise ValueError("The compact constraints cannot be made from a worksheet read in chunks")
     logging.info(f"Transforming LAM classes classes from the file {input_file}")
-    lam_df_classes = read_excel_worksheet(file_path=input_file, sheet_name=LAM_CLASSES_WS_NAME)
-    lam_df_classes_classification = read_excel_worksheet(file_path=input_file,
-                                                         sheet_name=LAM_CLASS_CLASSIFICATION_WS_NAME)
-    prefixes = read_excel_worksheet(file_path=input_file, sheet_name=PREFIX_WS_NAME)
+    if chunk_size:
+        workbook = load_workbook(input_file=input_file, workbook=workbook,
+                                 sheet_names=[name for name in WORKSHEET_NAMES if name != LAM_CLASSES_WS_NAME])
+        lam_df_classes = read_excel_worksheet_in_chunks(file_path=input_file, sheet_name=LAM_CLASSES_WS_NAME,
+                                                        chunk_size=chunk_size,
+                                                        usecols=WORKSHEET_COLUMNS[LAM_CLASSES_WS_NAME])
+    else:
+        workbook = load_workbook(input_file=input_file, workbook=workbook)
+        lam_df_classes = workbook.lam_classes
 
     start_time = time.time()
+    output_file = pathlib.Path(output_folder) / output_file_name(LAM_c, output_format)
     returned_graph = make_lam_classes_worksheet(lam_df_classes=lam_df_classes,
-                                                lam_df_classes_classification=lam_df_classes_classification,
-                                                prefixes=prefixes, output_file=pathlib.Path(output_folder) / LAM_c)
-    logging.info(
-        f"Successfully completed the transformation. The output is written into {pathlib.Path(output_folder) / LAM_c}")
+                                                lam_df_classes_classification=workbook.lam_class_classification,
+                                                prefixes=workbook.prefixes, output_file=output_file,
+                                                uri_minter=uri_minter, compact=compact, output_format=output_format)
+    logging.info(f"Successfully completed the transformation. The output is written into {output_file}")
     logging.info(f"Elapsed {(time.time() - start_time)} seconds")
     return returned_graph
 
 
-def transform_celex_classes(input_file, output_folder):
+def transform_celex_classes(input_file, output_folder, workbook: WorkbookSnapshot = None,
+                            output_format=DEFAULT_OUTPUT_FORMAT):
     logging.info(f"Transforming CELEX classes from the file {input_file}")
-    celex_df_classes = read_excel_worksheet(file_path=input_file, sheet_name=CELEX_CLASSES_WS_NAME)
-    celex_df_class_classification = read_excel_worksheet(file_path=input_file,
-                                                         sheet_name=CELEX_CLASS_CLASSIFICATION_WS_NAME)
-    prefixes = read_excel_worksheet(file_path=input_file, sheet_name=PREFIX_WS_NAME)
+    workbook = load_workbook(input_file=input_file, workbook=workbook)
 
     start_time = time.time()
-    returned_graph = make_celex_classes_worksheet(lam_df_celex_classes=celex_df_classes,
-                                                  lam_df_celex_classes_classification=celex_df_class_classification,
-                                                  prefixes=prefixes,
-                                                  output_file=pathlib.Path(output_folder) / CELEX_c)
-    logging.info(
-        f"Successfully completed the transformation. The output is written into {pathlib.Path(output_folder) / CELEX_c}")
+    output_file = pathlib.Path(output_folder) / output_file_name(CELEX_c, output_format)
+    returned_graph = make_celex_classes_worksheet(lam_df_celex_classes=workbook.celex_classes,
+                                                  lam_df_celex_classes_classification=workbook.celex_class_classification,
+                                                  prefixes=workbook.prefixes, output_file=output_file,
+                                                  output_format=output_format)
+    logging.info(f"Successfully completed the transformation. The output is written into {output_file}")
     logging.info(f"Elapsed {(time.time() - start_time)} seconds")
     return returned_graph
 
 
-@click.command()
-@click.argument("input", type=click.Path(exists=True, file_okay=False, dir_okay=True))
-@click.argument("output", type=click.Path(exists=True, file_okay=False, dir_okay=True))
-def transform_files_in_folder(input, output):
+def run_transformation(transformation, kwargs: dict, created: datetime.date = None) -> tuple:
     """
-        takes all Excel files from an input folder, transforms them into LAM-SKOS-AP RDF
-        and writes them into the output folder.
-    :param input: the folder with excel files
-    :param output: the folder with RDF files
-    :return:
+        Run a transformation function (e.g. transform_classes) with the keyword arguments and time it.
+        The generated resources are created on the given date, by default the current day.
+        As a task of a process pool, it sends back only the elapsed seconds and the URI minter,
+        with the URIs minted by the task, rather than the graph. The term pool hits and misses logged are
+        those of this transformation only.
     """
-    warnings.warn("deprecated", DeprecationWarning)
+    term_pool.creation_date = created
+    start_time = time.time()
+    terms_before = term_pool_info()
+    transformation(**kwargs)
+    elapsed = time.time() - start_time
+    terms = term_pool_info().since(terms_before)
+    logging.info(f"Cell parser memo: {parse_cache_info()}")
+    logging.info(f"Interned RDF terms: {terms}, hit rate {terms.hit_rate():.1%}")
+    return elapsed, kwargs.get("uri_minter")
 
-    in_ = pathlib.Path(input).resolve()
-    out_ = pathlib.Path(output).resolve()
 
-    file_list = list(in_.glob("*.xlsx*"))
+def transform_worksheets(input_file, output_folder, workbook: WorkbookSnapshot = None, chunk_size: int = None,
+                         uri_minter: UriMinter = None, jobs: int = 1, compact: bool = False,
+                         output_format=DEFAULT_OUTPUT_FORMAT, created: datetime.date = None) -> dict:
+    """
+        Run the CELEX classes, LAM properties and LAM classes transformations, one after the other or, when jobs
+        is more than 1, in a pool of processes, as they share no state. The URIs minted in the processes are
+        merged into the URI minter. Each process receives only the worksheets of its transformation, and
+        the prefixes, from the workbook. In compact mode, the identical constraints share their nodes.
+        The generated resources are created on the given date (see run_transformation).
 
-    logging.info(f"Input: {in_}")
-    logging.info(f"Output: {out_}")
-    logging.info(f"Executing the transformation for each Excel file (*.xlsx) in the input folder")
+    :return: the elapsed seconds of each transformation, by concepts worksheet name
+    """
+    common_kwargs = dict(input_file=input_file, output_folder=output_folder, workbook=workbook,
+                         output_format=output_format)
+    tasks = {
+        CELEX_CLASSES_WS_NAME: (transform_celex_classes, common_kwargs),
+        LAM_PROPERTIES_WS_NAME: (transform_properties, {**common_kwargs, "uri_minter": uri_minter, "compact": compact}),
+        LAM_CLASSES_WS_NAME: (transform_classes, {**common_kwargs, "chunk_size": chunk_size, "uri_minter": uri_minter,
+                                                  "compact": compact}),
+    }
 
-    # logging.info(f"Files: {file_list}")
+    if jobs == 1:
+        timings = {name: run_transformation(transformation, kwargs, created)[0]
+                   for name, (transformation, kwargs) in tasks.items()}
+    else:
+        if workbook is not None:
+            tasks = {name: (transformation, {**kwargs, "workbook": workbook.subset(TRANSFORMATION_SHEETS[name])})
+                     for name, (transformation, kwargs) in tasks.items()}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = {name: executor.submit(run_transformation, transformation, kwargs, created)
+                       for name, (transformation, kwargs) in tasks.items()}
+            timings = {}
+            for name, future in futures.items():
+                timings[name], task_uri_minter = future.result()
+                if uri_minter is not None and task_uri_minter is not None:
+                    uri_minter.merge(task_uri_minter)
 
-    for file_path in file_list:
-        logging.info(f"> Transforming {file_path.name}")
-        try:
-            transform(file_path, out_)
-        except Exception:
-            logging.exception("Could not transform the file. Most likely it does not respect "
-                              "the conventions. Please update and try again. ", exc_info=True)
+    for name, elapsed in timings.items():
+        logging.info(f"Transformed the worksheet {name} in {elapsed} seconds")
+    return timings
+
+
+def transform_workbook(input_file, output_folder, cache: WorkbookCache = None, chunk_size: int = None,
+                       uri_minter: UriMinter = None, jobs: int = 1, compact: bool = False,
+                       output_format=DEFAULT_OUTPUT_FORMAT, created: datetime.date = None) -> dict:
+    """
+        Load the workbook, through the cache if one is provided, and run all its transformations
+        (see transform_worksheets). The terms interned for the previous workbooks are dropped.
+
+    :return: the elapsed seconds of each transformation, by concepts worksheet name
+    """
+    term_pool.clear()
+    sheet_names = [name for name in WORKSHEET_NAMES if not (chunk_size and name == LAM_CLASSES_WS_NAME)]
+    workbook = load_workbook(input_file=input_file, sheet_names=sheet_names, cache=cache)
+    return transform_worksheets(input_file, output_folder, workbook=workbook, chunk_size=chunk_size,
+                                uri_minter=uri_minter, jobs=jobs, compact=compact, output_format=output_format,
+                                created=created)
+
+
+def transform_incrementally(input_file, output_folder, previous_input_file, previous_output_folder,
+                            workbook: WorkbookSnapshot = None, cache: WorkbookCache = None,
+                            uri_minter: UriMinter = None, created: datetime.date = None):
+    """
+        Transform the input file by patching the output generated from a previous version of it,
+        rebuilding only the rows that were added, changed or removed, created on the given date.
+    """
+    term_pool.creation_date = created
+    logging.info(f"Transforming incrementally from the previous file {previous_input_file}")
+    workbook = load_workbook(input_file=input_file, workbook=workbook, cache=cache)
+    previous_workbook = load_workbook(input_file=previous_input_file, cache=cache)
+
+    for builder, concepts_sheet_name, collections_sheet_name, file_name in TRANSFORMATIONS:
+        start_time = time.time()
+        make_worksheet_incrementally(builder=builder, concepts_sheet_name=concepts_sheet_name,
+                                     collections_sheet_name=collections_sheet_name,
+                                     previous_workbook=previous_workbook, workbook=workbook,
+                                     previous_output_file=pathlib.Path(previous_output_folder) / file_name,
+                                     output_file=pathlib.Path(output_folder) / file_name, uri_minter=uri_minter)
+        logging.info(
+            f"Successfully completed the transformation. The output is written into {pathlib.Path(output_folder) / file_name}")
+        logging.info(f"Elapsed {(time.time() - start_time)} seconds")
 
 
 @click.command()
 @click.argument("input_file", type=click.Path(exists=True, file_okay=True))
 @click.argument("output_folder", type=click.Path(exists=True, dir_okay=True))
-def transform(input_file, output_folder):
+@click.option("--chunk-size", type=click.IntRange(min=1), default=None,
+              help="Stream the LAM classes worksheet in chunks of this many rows instead of loading it at once.")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Parse the workbook even if it was parsed before, bypassing the cache of parsed workbooks.")
+@click.option("--previous-input-file", type=click.Path(exists=True, file_okay=True, dir_okay=True), default=None,
+              help="A previous version of the input file, in any of the input formats. Only the rows changed since "
+                   "then are transformed again.")
+@click.option("--previous-output-folder", type=click.Path(exists=True, file_okay=False, dir_okay=True), default=None,
+              help="The folder with the output of the previous input file. Defaults to the output folder.")
+@click.option("--uri-registry", type=click.Path(dir_okay=False, writable=True), default=None,
+              help="A JSON file keeping the URIs minted for the reified constraints, so that they are reused "
+                   "across workbook versions.")
+@click.option("--jobs", type=click.IntRange(min=1), default=1,
+              help="Transform the CELEX classes, LAM properties and LAM classes in parallel, in this many processes.")
+@click.option("--compact-constraints", is_flag=True, default=False,
+              help="Share a single node between the identical constraints of a column instead of one node per row. "
+                   "Not supported with --chunk-size.")
+@click.option("--output-format", type=click.Choice(OUTPUT_FORMATS), multiple=True, default=(DEFAULT_OUTPUT_FORMAT,),
+              show_default=True,
+              help="The RDF format of the output files. N-Triples (nt) and N-Quads (nquads) are written as the triples "
+                   "are made, without building the graphs in memory. Repeat the option to write several formats, "
+                   "serialised concurrently from the graphs, except turtle with canonical-turtle (both .ttl).")
+@click.option("--created", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="The creation date (dct:created) of the generated resources, e.g. 2021-09-09, instead of the current "
+                   "day, so that an unchanged workbook always gives the same output.")
+def transform(input_file, output_folder, chunk_size, no_cache, previous_input_file, previous_output_folder,
+              uri_registry, jobs, compact_constraints, output_format, created):
     """
         Transform a given file and write the output into a folder.
+
+        The input file can be an Excel (.xlsx) or ODS workbook, or a folder with
+        one CSV or Parquet file per worksheet, named after the worksheet.
     """
+    if previous_input_file and chunk_size:
+        raise click.UsageError("The incremental transformation (--previous-input-file) does not support --chunk-size")
+    if previous_input_file and jobs > 1:
+        raise click.UsageError("The incremental transformation (--previous-input-file) does not support --jobs")
+    if previous_input_file and compact_constraints:
+        raise click.UsageError("The incremental transformation (--previous-input-file) does not support "
+                               "--compact-constraints")
+    if previous_input_file and list(output_format) != [TURTLE_FORMAT]:
+        raise click.UsageError("The incremental transformation (--previous-input-file) supports only the Turtle "
+                               "--output-format")
+    if previous_input_file:
+        try:
+            detect_input_format(previous_input_file)
+        except ValueError as e:
+            raise click.UsageError(f"{e} (--previous-input-file)")
+    if chunk_size and compact_constraints:
+        raise click.UsageError("The compact constraints (--compact-constraints) cannot be made from a worksheet read "
+                               "in chunks (--chunk-size)")
+    if chunk_size and detect_input_format(input_file) != EXCEL_FORMAT:
+        raise click.UsageError("Only Excel workbooks can be read in chunks (--chunk-size)")
+    try:
+        output_files(LAM_c, output_format)
+    except ValueError as e:
+        raise click.UsageError(f"{e} (--output-format)")
+
     in_ = pathlib.Path(input_file).resolve()
     out_ = pathlib.Path(output_folder).resolve()
+    created = created.date() if created else None
 
     logging.info(f"Input: {in_}")
     logging.info(f"Output: {out_}")
@@ -127,9 +307,18 @@ def transform(input_file, output_folder):
 
     logging.info(f"> Transforming {in_.name}")
 
-    transform_celex_classes(in_, out_)
-    transform_properties(in_, out_)
-    transform_classes(in_, out_)
+    cache = None if no_cache else WorkbookCache()
+    uri_minter = UriMinter(registry_file=uri_registry)
+    if previous_input_file:
+        transform_incrementally(in_, out_, previous_input_file=pathlib.Path(previous_input_file).resolve(),
+                                previous_output_folder=pathlib.Path(previous_output_folder or out_).resolve(),
+                                cache=cache, uri_minter=uri_minter, created=created)
+    else:
+        start_time = time.time()
+        transform_workbook(in_, out_, cache=cache, chunk_size=chunk_size, uri_minter=uri_minter, jobs=jobs,
+                           compact=compact_constraints, output_format=list(output_format), created=created)
+        logging.info(f"Transformed {in_.name} in {(time.time() - start_time)} seconds")
+    uri_minter.save()
 
 
 if __name__ == '__main__':
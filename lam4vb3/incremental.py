@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+# incremental.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Incremental re-transformation of a workbook, given a previous version of the workbook and the RDF
+    generated from it.
+
+    The rows of each worksheet are matched by URI. Only the triples of the removed and changed rows are
+    rebuilt from the previous workbook and removed from the previous graph, and only the added and changed
+    rows are built from the new workbook and added to it.
+
+    The URIs of the reified constraints are minted from the row URIs (see lam4vb3.uri_minting), so a row
+    can move within the worksheet without being rebuilt. The URIs generated for the rows without a valid URI
+    depend on the head of the worksheet, so a worksheet is entirely replaced (all its previous rows removed
+    and all its new rows added) when its head rows or its columns changed, or when its URIs are not unique.
+    When the prefixes changed, nothing is reused and the graph is built from scratch.
+"""
+import collections
+import functools
+import logging
+import pathlib
+
+import pandas as pd
+import rdflib
+
+from lam4vb3 import lam_utils
+from lam4vb3.uri_minting import UriMinter
+from lam4vb3.workbook import WorkbookSnapshot
+
+URI_COLUMN = "URI"
+
+WorksheetDiff = collections.namedtuple("WorksheetDiff", ["added", "changed", "removed", "previous_indexes",
+                                                         "indexes"])
+
+
+def has_unique_uris(df: pd.DataFrame, uri_column: str = URI_COLUMN) -> bool:
+    return uri_column in df.columns and df[uri_column].all() and df[uri_column].is_unique
+
+
+def diff_worksheets(previous_df: pd.DataFrame, df: pd.DataFrame, uri_column: str = URI_COLUMN) -> WorksheetDiff:
+    """
+        Compare two versions of a worksheet by row URI.
+
+    :return: the added, changed and removed URIs, the indexes of the previous rows whose triples must be
+            removed, and the indexes of the new rows whose triples must be built
+    """
+    if not (has_unique_uris(previous_df, uri_column) and has_unique_uris(df, uri_column)) \
+            or list(previous_df.columns) != list(df.columns) or str(previous_df.head()) != str(df.head()):
+        return WorksheetDiff(added=list(df.get(uri_column, [])), changed=[],
+                             removed=list(previous_df.get(uri_column, [])),
+                             previous_indexes=list(previous_df.index), indexes=list(df.index))
+
+    previous_uri_index = dict(zip(previous_df[uri_column], previous_df.index))
+    uri_index = dict(zip(df[uri_column], df.index))
+
+    added = [uri for uri in uri_index if uri not in previous_uri_index]
+    removed = [uri for uri in previous_uri_index if uri not in uri_index]
+    changed = [uri for uri, index in uri_index.items()
+               if uri in previous_uri_index and not previous_df.loc[previous_uri_index[uri]].equals(df.loc[index])]
+
+    return WorksheetDiff(added=added, changed=changed, removed=removed,
+                         previous_indexes=[previous_uri_index[uri] for uri in removed + changed],
+                         indexes=[uri_index[uri] for uri in added + changed])
+
+
+def patch_graph(graph: rdflib.Graph, previous_graph: rdflib.Graph, create_function,
+                previous_df: pd.DataFrame, df: pd.DataFrame) -> WorksheetDiff:
+    """
+        Replace in the graph the triples of the worksheet rows that differ between the two versions.
+
+    :param graph: the graph built from the previous worksheet, to be patched
+    :param previous_graph: a graph with the namespaces of the previous workbook
+    :param create_function: the builder function for the worksheet (e.g. create_concepts)
+    :param previous_df: the previous version of the worksheet
+    :param df: the new version of the worksheet
+    :return: the difference between the two versions
+    """
+    diff = diff_worksheets(previous_df=previous_df, df=df)
+    previous_triples = create_function(previous_df, previous_graph, row_indexes=diff.previous_indexes, inplace=False)
+    lam_utils.remove_triples_from_graph(result_triples=previous_triples, graph=graph)
+    create_function(df, graph, row_indexes=diff.indexes, inplace=True)
+    return diff
+
+
+def make_worksheet_incrementally(builder, concepts_sheet_name: str, collections_sheet_name: str,
+                                 previous_workbook: WorkbookSnapshot, workbook: WorkbookSnapshot,
+                                 previous_output_file, output_file, uri_minter: UriMinter = None) -> rdflib.Graph:
+    """
+        Build the graph of a builder module (e.g. lam_classes_builder) by patching the graph generated
+        from the previous workbook, and write it into the output file.
+        Falls back to a complete build when the previous output is missing or the prefixes changed.
+    """
+    previous_output_file = pathlib.Path(previous_output_file)
+    graph = lam_utils.make_graph(workbook.prefixes)
+    create_concepts = functools.partial(builder.create_concepts, uri_minter=uri_minter)
+
+    if not previous_output_file.exists() or not previous_workbook.prefixes.equals(workbook.prefixes):
+        logging.info(f"Cannot reuse {previous_output_file}, building {output_file} from scratch")
+        builder.create_concept_scheme(graph)
+        create_concepts(workbook[concepts_sheet_name], graph)
+        builder.create_collections(workbook[collections_sheet_name], graph)
+    else:
+        graph.parse(str(previous_output_file), format="turtle")
+        previous_graph = lam_utils.make_graph(previous_workbook.prefixes)
+        for sheet_name, create_function in ((concepts_sheet_name, create_concepts),
+                                            (collections_sheet_name, builder.create_collections)):
+            diff = patch_graph(graph=graph, previous_graph=previous_graph, create_function=create_function,
+                               previous_df=previous_workbook[sheet_name], df=workbook[sheet_name])
+            logging.info(f"Patched {sheet_name}: {len(diff.added)} added, {len(diff.changed)} changed, "
+                         f"{len(diff.removed)} removed rows")
+
+    graph.serialize(str(output_file), format='turtle', )
+    return graph
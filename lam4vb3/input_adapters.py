@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+
+# input_adapters.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Input adapters reading the worksheets of a workbook from different formats.
+
+    Every adapter returns the same contract as lam_utils.read_excel_worksheet: a dictionary of worksheet
+    names and data frames where all the values are strings and the empty cells are empty strings.
+
+    Supported inputs:
+        - Excel workbooks (.xlsx, .xlsm, .xls) and OpenDocument spreadsheets (.ods)
+        - folders with one CSV file per worksheet, named after the worksheet (e.g. "LAM classes.csv")
+        - folders with one Parquet file per worksheet, named after the worksheet (e.g. "LAM classes.parquet")
+"""
+import datetime
+import pathlib
+
+import pandas as pd
+
+from lam4vb3.lam_utils import read_excel_worksheets, column_selector, select_columns
+
+EXCEL_FORMAT = "excel"
+ODS_FORMAT = "ods"
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+ODS_EXTENSIONS = (".ods",)
+CSV_EXTENSION = ".csv"
+PARQUET_EXTENSION = ".parquet"
+
+
+def worksheet_file(folder_path, sheet_name: str, extension: str) -> pathlib.Path:
+    file_path = pathlib.Path(folder_path) / f"{sheet_name}{extension}"
+    if not file_path.exists():
+        raise ValueError(f"Worksheet named '{sheet_name}' not found, expected the file {file_path}")
+    return file_path
+
+
+def drop_blank_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+        skip the rows without any value, as the Excel reader does
+    """
+    return df[(df != "").any(axis=1)].reset_index(drop=True)
+
+
+def read_csv_worksheets(folder_path, sheet_names: list, usecols: dict = None) -> dict:
+    """
+        read the worksheets from a folder of CSV files, one per worksheet
+    """
+    usecols = usecols or {}
+    dfs = {}
+    for sheet_name in sheet_names:
+        df = pd.read_csv(worksheet_file(folder_path, sheet_name, CSV_EXTENSION),
+                         usecols=column_selector(usecols.get(sheet_name)),
+                         header=0, na_values=[""], keep_default_na=False, dtype=str, skip_blank_lines=True)
+        df.fillna(value="", inplace=True)
+        dfs[sheet_name] = drop_blank_rows(df)
+    return dfs
+
+
+def cell_to_str(value) -> str:
+    """
+        Convert a typed cell value, read by openpyxl or from a Parquet file, to the string pandas would produce
+        when reading with dtype=str. Empty cells become empty strings.
+    """
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    if isinstance(value, float) and value != value:
+        # NaN
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime):
+        return str(pd.Timestamp(value))
+    return str(value)
+
+
+def read_parquet_worksheets(folder_path, sheet_names: list, usecols: dict = None) -> dict:
+    """
+        read the worksheets from a folder of Parquet files, one per worksheet
+    """
+    usecols = usecols or {}
+    dfs = {}
+    for sheet_name in sheet_names:
+        df = select_columns(pd.read_parquet(worksheet_file(folder_path, sheet_name, PARQUET_EXTENSION)),
+                            usecols.get(sheet_name))
+        # Parquet files are typed, so convert to the string only contract of the Excel reader
+        dfs[sheet_name] = drop_blank_rows(pd.DataFrame({column: df[column].map(cell_to_str).astype(str)
+                                                        for column in df.columns}))
+    return dfs
+
+
+INPUT_ADAPTERS = {
+    EXCEL_FORMAT: read_excel_worksheets,
+    ODS_FORMAT: read_excel_worksheets,
+    CSV_FORMAT: read_csv_worksheets,
+    PARQUET_FORMAT: read_parquet_worksheets,
+}
+
+
+def detect_input_format(input_path) -> str:
+    """
+        the format of the input, based on the file extension or, for folders, on the files they contain
+    """
+    input_path = pathlib.Path(input_path)
+    if input_path.is_dir():
+        if any(input_path.glob(f"*{CSV_EXTENSION}")):
+            return CSV_FORMAT
+        if any(input_path.glob(f"*{PARQUET_EXTENSION}")):
+            return PARQUET_FORMAT
+    elif input_path.suffix.lower() in EXCEL_EXTENSIONS:
+        return EXCEL_FORMAT
+    elif input_path.suffix.lower() in ODS_EXTENSIONS:
+        return ODS_FORMAT
+    raise ValueError(f"Unsupported input {input_path}. Expected an Excel or ODS workbook, "
+                     f"or a folder of CSV or Parquet files")
+
+
+def is_supported_input(input_path) -> bool:
+    try:
+        detect_input_format(input_path)
+    except ValueError:
+        return False
+    return True
+
+
+def read_worksheets(input_path, sheet_names: list, usecols: dict = None) -> dict:
+    """
+        read the worksheets with the input adapter matching the format of the input
+    :param input_path: a workbook file or a folder with a file per worksheet
+    :param sheet_names: the names of the worksheets to be read
+    :param usecols: a dictionary of worksheet names and the columns to be read from them
+    :return: a dictionary of worksheet names and data frames
+    """
+    return INPUT_ADAPTERS[detect_input_format(input_path)](input_path, sheet_names, usecols=usecols)
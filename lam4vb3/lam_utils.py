@@ -4,39 +4,157 @@ Date: 29.06.19
 Author: Eugeniu Costetchi
 Email: costezki.eugen@gmail.com
 """
+import itertools
+
 import pandas as pd
 import rdflib
 import shortuuid
+from rdflib.namespace import NamespaceManager
 
 from lam4vb3.builder import SHACL
-from lam4vb3.cell_parser import qname_uri
+from lam4vb3.cell_parser import qname_uri, namespace_resolver, NamespaceResolver
 
 URI_UUID_PREFIX = "res_"
 URI_UUID_SUFFIX = ""
 
+# the ways of inserting the triples into a graph
+# triple: one graph.add call per triple
+# bulk: duplicates dropped, then one graph.addN call per batch of BULK_BATCH_SIZE triples
+TRIPLE_INSERTION = "triple"
+BULK_INSERTION = "bulk"
+INSERTION_MODES = (TRIPLE_INSERTION, BULK_INSERTION)
+# the graph store dominates the insertion time: the bulk insertion saves less than 15% of it (see benchmarks/insertion.py)
+DEFAULT_INSERTION = TRIPLE_INSERTION
+BULK_BATCH_SIZE = 10000
+
+
+_namespace_versions = itertools.count(1)
+
+
+class VersionedNamespaceManager(NamespaceManager):
+    """
+        The namespace manager of a LamGraph, giving the graph a new namespace version on each binding,
+        whether made through the graph (e.g. graph.bind) or directly through the manager (e.g. by graph.parse).
+    """
+
+    def bind(self, prefix, namespace, *args, **kwargs):
+        super().bind(prefix, namespace, *args, **kwargs)
+        self.graph.namespace_version = next(_namespace_versions)
+
+
+class LamGraph(rdflib.Graph):
+    """
+        A graph keeping track of the changes to its namespace bindings.
+        Each time a prefix is bound, the graph gets a new namespace version, unique across all graphs,
+        so that the values computed from its namespaces (e.g. parsed cells) can be cached by version.
+        The namespace resolver of the graph is refreshed accordingly.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namespace_manager = VersionedNamespaceManager(self)
+        self.namespace_version = next(_namespace_versions)
+        self.namespace_resolver = NamespaceResolver(self)
+
 
 def generate_uuid_uri(value, graph, seed="", prefix=URI_UUID_PREFIX, suffix=URI_UUID_SUFFIX):
     local_uid = shortuuid.uuid(name=str(seed) + str(value))
     qname = ":" + str(prefix).strip() + str(local_uid) + str(suffix).strip()
-    return qname_uri(qname, graph.namespaces())
+    return qname_uri(qname, namespace_resolver(graph))
 
 
-def add_triples_to_graph(result_triples, graph):
+def add_triples_to_graph(result_triples, graph, insertion=DEFAULT_INSERTION):
     """
         just add the triples to a graph
+    :param insertion: the way the triples are inserted, one of INSERTION_MODES. Both produce the same graph.
     :return:
     """
+    if insertion not in INSERTION_MODES:
+        raise ValueError(f"Unknown insertion {insertion}. Expected one of {INSERTION_MODES}")
+    if insertion == BULK_INSERTION:
+        bulk_add_triples_to_graph(result_triples=result_triples, graph=graph)
+        return
     for triple in result_triples:
         graph.add(triple)
 
 
-def read_excel_worksheet(file_path, sheet_name: str) -> pd.DataFrame:
-    df = pd.read_excel(file_path, sheet_name=sheet_name,
+def bulk_add_triples_to_graph(result_triples, graph, batch_size=BULK_BATCH_SIZE):
+    """
+        add the triples to a graph in batches, one addN call per batch. The repeated triples (e.g. the creation
+        date and the types that each maker states for the row subject) are dropped before reaching the store.
+    :return:
+    """
+    unique_triples = list(dict.fromkeys(result_triples))
+    for start in range(0, len(unique_triples), batch_size):
+        graph.addN((subject, predicate, obj, graph) for subject, predicate, obj in unique_triples[start:start + batch_size])
+
+
+def remove_triples_from_graph(result_triples, graph):
+    """
+        remove the triples from the graph. The creation date is removed regardless of its value,
+        as the triples may have been rebuilt on a later date than the graph.
+    :return:
+    """
+    for subject, predicate, obj in result_triples:
+        if predicate == rdflib.DCTERMS.created:
+            graph.remove((subject, predicate, None))
+        else:
+            graph.remove((subject, predicate, obj))
+
+
+PREFIX_WORKSHEET_COLUMNS = ["prefix", "uri"]
+
+
+def column_selector(columns=None):
+    """
+        the pandas usecols selecting the given columns; the columns missing from the worksheet are ignored
+    """
+    if columns is None:
+        return None
+    columns = set(columns)
+    return lambda column: column in columns
+
+
+def select_columns(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """
+        the data frame restricted to the given columns (in their data frame order); the whole data frame if None
+    """
+    if columns is None:
+        return df
+    columns = set(columns)
+    return df[[column for column in df.columns if column in columns]]
+
+
+def read_excel_worksheet(file_path, sheet_name: str, usecols=None) -> pd.DataFrame:
+    """
+    :param usecols: the columns to be read; if None all the columns are read
+    """
+    df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=column_selector(usecols),
                        header=[0], na_values=[""], keep_default_na=False, dtype=str)
     df.fillna(value="", inplace=True)
     return df
 
 
+def read_excel_worksheets(file_path, sheet_names: list, usecols: dict = None) -> dict:
+    """
+        read several worksheets from the same workbook, parsing the file only once
+    :param file_path: the Excel workbook
+    :param sheet_names: the names of the worksheets to be read
+    :param usecols: a dictionary of worksheet names and the columns to be read from them;
+                    all the columns are read from the worksheets missing from the dictionary
+    :return: a dictionary of worksheet names and data frames
+    """
+    usecols = usecols or {}
+    dfs = {}
+    with pd.ExcelFile(file_path) as excel_file:
+        for sheet_name in sheet_names:
+            df = excel_file.parse(sheet_name=sheet_name, usecols=column_selector(usecols.get(sheet_name)),
+                                  header=[0], na_values=[""], keep_default_na=False, dtype=str)
+            df.fillna(value="", inplace=True)
+            dfs[sheet_name] = df
+    return dfs
+
+
 def make_graph(df, prefix_column="prefix", uri_column="uri"):
     """
         init the LAM data graph
@@ -45,7 +163,7 @@ def make_graph(df, prefix_column="prefix", uri_column="uri"):
     :param prefix_column: the column in df that provides prefixes to be used in qnames
     :param df: the data frame containing namespace defitions
     """
-    graph = rdflib.Graph()
+    graph = LamGraph()
 
     graph.bind("skos", rdflib.namespace.SKOS)
     graph.bind("dct", rdflib.namespace.DCTERMS)
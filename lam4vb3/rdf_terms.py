@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+
+# rdf_terms.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Interning of the RDF terms made by the triple makers.
+
+    The makers repeat the same terms over and over: the creation date of every concept and constraint,
+    the cardinalities, the constraint names, the predicates and the row URIs shared by the makers of
+    a worksheet. The term pool makes each of them once and hands out the same object afterwards,
+    sparing both the construction (e.g. the lexical form of a Literal) and the memory of the copies.
+
+    The terms are written in N-Triples by the line based sinks (see lam4vb3.triple_sinks).
+"""
+import collections
+from datetime import date
+
+import rdflib
+
+TERM_POOL_SIZE = 100000
+# the characters escaped in the lexical form of the N-Triples literals
+LITERAL_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", '"': '\\"'})
+
+
+class TermPoolInfo(collections.namedtuple("TermPoolInfo", ["hits", "misses", "maxsize", "currsize"])):
+    """
+        The hit and miss statistics of a term pool.
+    """
+    __slots__ = ()
+
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def since(self, earlier: "TermPoolInfo") -> "TermPoolInfo":
+        """
+            the hits and misses since the earlier statistics of the same pool, e.g. over one transformation
+        """
+        return self._replace(hits=self.hits - earlier.hits, misses=self.misses - earlier.misses)
+
+
+class TermPool:
+    """
+        A bounded pool of RDF terms, keyed by the arguments they are made of. Once the pool is full,
+        the new terms are still made but no longer kept; the terms are immutable, so sharing them is safe.
+    """
+
+    def __init__(self, maxsize: int = TERM_POOL_SIZE):
+        self.maxsize = maxsize
+        # the creation date of the generated resources, if pinned rather than the current day
+        self.creation_date = None
+        self.hits = 0
+        self.misses = 0
+        self._terms = {}
+
+    def literal(self, value, lang: str = None, datatype: rdflib.URIRef = None) -> rdflib.Literal:
+        """
+            the Literal of the value, with the language or the data type
+        """
+        # the type of the value tells apart the equal values of different types, e.g. True and 1
+        key = (type(value), value, lang, datatype)
+        term = self._terms.get(key)
+        if term is None:
+            term = rdflib.Literal(value, lang=lang, datatype=datatype)
+            self._keep(key, term)
+        else:
+            self.hits += 1
+        return term
+
+    def uri(self, value) -> rdflib.URIRef:
+        """
+            the URIRef of the value, which may already be a URIRef (e.g. resolved from a qname)
+        """
+        key = (rdflib.URIRef, str(value))
+        term = self._terms.get(key)
+        if term is None:
+            term = value if type(value) is rdflib.URIRef else rdflib.URIRef(value)
+            self._keep(key, term)
+        else:
+            self.hits += 1
+        return term
+
+    def today(self) -> rdflib.Literal:
+        """
+            the date Literal of the current day, e.g. the creation date of the generated resources
+        """
+        return self.literal(date.today())
+
+    def created(self) -> rdflib.Literal:
+        """
+            the creation date Literal of the generated resources: the pinned creation date, if any, or the current day
+        """
+        return self.literal(self.creation_date) if self.creation_date else self.today()
+
+    def _keep(self, key, term):
+        self.misses += 1
+        if len(self._terms) < self.maxsize:
+            self._terms[key] = term
+
+    def hit_rate(self) -> float:
+        return self.info().hit_rate()
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._terms.clear()
+
+    def info(self) -> TermPoolInfo:
+        return TermPoolInfo(hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._terms))
+
+
+# shared by all the triple makers
+term_pool = TermPool()
+
+
+def term_pool_info() -> TermPoolInfo:
+    """
+        the hit and miss statistics of the shared term pool
+    """
+    return term_pool.info()
+
+
+def n_triples_term(term) -> str:
+    """
+        the N-Triples form of a term, e.g. <http://example.com/a>, _:b1 or "a \\"quoted\\" label"@en
+    """
+    if isinstance(term, rdflib.Literal):
+        lexical_form = f'"{str(term).translate(LITERAL_ESCAPES)}"'
+        if term.language:
+            return f"{lexical_form}@{term.language}"
+        if term.datatype:
+            return f"{lexical_form}^^<{term.datatype}>"
+        return lexical_form
+    return term.n3()
+
+
+def n_triples_line(triple, graph_name: rdflib.URIRef = None) -> str:
+    """
+        the N-Triples line of the triple, or its N-Quads line in the named graph if a graph name is given
+    """
+    terms = triple if graph_name is None else (*triple, graph_name)
+    return " ".join(map(n_triples_term, terms)) + " .\n"
@@ -0,0 +1,266 @@
+#!/usr/bin/python3
+
+# triple_sinks.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Destinations where the triple makers stream their triples as they are produced, one row at a time,
+    instead of collecting the triples of the entire worksheet (see AbstractTripleMaker.make_triples).
+
+    A sink provides add_triples(triples), called with the triples of each row, and counts the triples
+    it received. The makers repeat some triples (e.g. the creation date of a concept made by several makers),
+    which the line based sinks write once.
+
+    The output formats of a worksheet are Turtle, RDF/XML and JSON-LD, serialised from the graph once all
+    the triples are in, the line based N-Triples and N-Quads, streamed as the triples are produced, or the
+    canonical Turtle (see lam4vb3.canonical_turtle), sorted as the triples are produced and written at the end.
+    Several output formats are all serialised from the graph, concurrently.
+"""
+import collections
+import concurrent.futures
+import contextlib
+import logging
+import pathlib
+import time
+
+import rdflib
+from rdflib import RDF
+
+from lam4vb3.canonical_turtle import CanonicalTurtleSink
+from lam4vb3.lam_utils import bulk_add_triples_to_graph
+from lam4vb3.rdf_terms import n_triples_line
+
+TURTLE_FORMAT = "turtle"
+RDFXML_FORMAT = "xml"
+JSONLD_FORMAT = "json-ld"
+NTRIPLES_FORMAT = "nt"
+NQUADS_FORMAT = "nquads"
+CANONICAL_TURTLE_FORMAT = "canonical-turtle"
+OUTPUT_FORMATS = (TURTLE_FORMAT, RDFXML_FORMAT, JSONLD_FORMAT, NTRIPLES_FORMAT, NQUADS_FORMAT, CANONICAL_TURTLE_FORMAT)
+# the formats serialised by rdflib from the complete graph
+GRAPH_FORMATS = (TURTLE_FORMAT, RDFXML_FORMAT, JSONLD_FORMAT)
+STREAMING_FORMATS = (NTRIPLES_FORMAT, NQUADS_FORMAT, CANONICAL_TURTLE_FORMAT)
+DEFAULT_OUTPUT_FORMAT = TURTLE_FORMAT
+# the number of subjects whose triples the line based sinks remember, to write the repeated triples once
+SEEN_SUBJECTS_SIZE = 10000
+OUTPUT_EXTENSIONS = {TURTLE_FORMAT: ".ttl", RDFXML_FORMAT: ".rdf", JSONLD_FORMAT: ".jsonld", NTRIPLES_FORMAT: ".nt",
+                     NQUADS_FORMAT: ".nq", CANONICAL_TURTLE_FORMAT: ".ttl"}
+
+
+class GraphSink:
+    """
+        Adds the triples into a graph, in bulk (see lam_utils.bulk_add_triples_to_graph).
+    """
+
+    def __init__(self, graph: rdflib.Graph):
+        self.graph = graph
+        self.count = 0
+
+    def add_triples(self, triples):
+        triples = list(triples)
+        bulk_add_triples_to_graph(result_triples=triples, graph=self.graph)
+        self.count += len(triples)
+
+
+class NTriplesSink:
+    """
+        Writes the triples as N-Triples, keeping in memory only the triples of the last subjects seen.
+        A triple repeated for one of these subjects is written once; the triples of a subject seen again
+        after seen_subjects others may be repeated, which does not change the graph the N-Triples describe.
+    """
+
+    def __init__(self, destination, seen_subjects: int = SEEN_SUBJECTS_SIZE):
+        """
+        :param destination: a file path, or an open text stream which is left open by close
+        :param seen_subjects: the number of subjects whose triples are remembered
+        """
+        if isinstance(destination, (str, pathlib.Path)):
+            self.stream = open(destination, "w", encoding="utf-8")
+            self._owns_stream = True
+        else:
+            self.stream = destination
+            self._owns_stream = False
+        self.count = 0
+        self.seen_subjects = seen_subjects
+        # the predicates and objects written for each subject, the most recently seen subject last
+        self._seen = collections.OrderedDict()
+
+    def add_triples(self, triples):
+        for triple in triples:
+            if self.is_new(triple):
+                self.stream.write(self.line(triple))
+            self.count += 1
+
+    def is_new(self, triple) -> bool:
+        """
+            whether the triple was not written yet for one of the last subjects seen
+        """
+        subject, predicate, object_ = triple
+        seen = self._seen.get(subject)
+        if seen is None:
+            seen = self._seen[subject] = set()
+            if len(self._seen) > self.seen_subjects:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(subject)
+        if (predicate, object_) in seen:
+            return False
+        seen.add((predicate, object_))
+        return True
+
+    def line(self, triple) -> str:
+        return n_triples_line(triple)
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class NQuadsSink(NTriplesSink):
+    """
+        Writes the triples as N-Quads in a named graph, like NTriplesSink.
+    """
+
+    def __init__(self, destination, graph_name: rdflib.URIRef, seen_subjects: int = SEEN_SUBJECTS_SIZE):
+        """
+        :param destination: a file path, or an open text stream which is left open by close
+        :param graph_name: the name of the graph the triples are written in
+        :param seen_subjects: the number of subjects whose triples are remembered
+        """
+        super().__init__(destination, seen_subjects=seen_subjects)
+        self.graph_name = graph_name
+
+    def line(self, triple) -> str:
+        return n_triples_line(triple, graph_name=self.graph_name)
+
+
+def as_output_formats(output_format) -> list:
+    """
+        the output formats, given either as one format or as a list of formats
+    """
+    return [output_format] if isinstance(output_format, str) else list(output_format)
+
+
+def output_file_name(file_name, output_format=DEFAULT_OUTPUT_FORMAT) -> pathlib.Path:
+    """
+        the file name with the extension of the output format, or of the first of a list of output formats,
+        e.g. lam_project_classes_v2.nt
+    """
+    return pathlib.Path(file_name).with_suffix(OUTPUT_EXTENSIONS[as_output_formats(output_format)[0]])
+
+
+def output_files(output_file, output_formats: list) -> dict:
+    """
+        the output file of each format, named after the output file, with the extension of the format.
+        The formats sharing an extension (Turtle and canonical Turtle) cannot be written together.
+    """
+    files = {output_format: output_file_name(output_file, output_format) for output_format in output_formats}
+    colliding_formats = [output_format for output_format, file in files.items() if list(files.values()).count(file) > 1]
+    if colliding_formats:
+        raise ValueError(f"The output formats {colliding_formats} would be written into the same file. "
+                         f"Choose only one of them.")
+    return files
+
+
+def streaming_sink(destination, output_format: str, graph_name: rdflib.URIRef = None, namespaces=()):
+    """
+        the sink writing the triples in one of the STREAMING_FORMATS
+    """
+    if output_format == NTRIPLES_FORMAT:
+        return NTriplesSink(destination)
+    if output_format == NQUADS_FORMAT:
+        return NQuadsSink(destination, graph_name=graph_name)
+    if output_format == CANONICAL_TURTLE_FORMAT:
+        return CanonicalTurtleSink(destination, namespaces=namespaces)
+    raise ValueError(f"Unknown streaming format: {output_format}. Expected one of {STREAMING_FORMATS}")
+
+
+def serialize_graph(graph: rdflib.Graph, output_file, output_format: str, graph_name: rdflib.URIRef = None) -> float:
+    """
+        Write the graph in one of the OUTPUT_FORMATS.
+
+    :return: the elapsed seconds
+    """
+    start_time = time.perf_counter()
+    if output_format in GRAPH_FORMATS:
+        graph.serialize(str(output_file), format=output_format, )
+    else:
+        with streaming_sink(output_file, output_format=output_format, graph_name=graph_name,
+                            namespaces=list(graph.namespaces())) as sink:
+            sink.add_triples(graph)
+    return time.perf_counter() - start_time
+
+
+def bind_generated_prefixes(graph: rdflib.Graph):
+    """
+        Bind the prefixes the serialisers would generate (e.g. ns1) for the predicates and the classes whose
+        namespace has no prefix, so that the serialisers only read the namespaces of the graph.
+    """
+    for term in sorted(set(graph.predicates()) | set(graph.objects(None, RDF.type))):
+        try:
+            graph.namespace_manager.compute_qname(term)
+        except Exception:
+            # the serialisers write it as a full IRI
+            pass
+
+
+def serialize_graph_concurrently(graph: rdflib.Graph, output_files: dict, graph_name: rdflib.URIRef = None) -> dict:
+    """
+        Write the graph in several formats, in a pool of threads, one per format.
+        The prefixes are bound beforehand (see bind_generated_prefixes), as the graph is shared by the threads.
+
+    :param output_files: the output file of each format, e.g. from output_files
+    :return: the elapsed seconds of each format
+    """
+    bind_generated_prefixes(graph)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(output_files)) as executor:
+        futures = {output_format: executor.submit(serialize_graph, graph, output_file, output_format, graph_name)
+                   for output_format, output_file in output_files.items()}
+        timings = {output_format: future.result() for output_format, future in futures.items()}
+    for output_format, elapsed in timings.items():
+        logging.info(f"Serialised the graph as {output_format} into {output_files[output_format]} in {elapsed} seconds")
+    return timings
+
+
+@contextlib.contextmanager
+def worksheet_sink(graph: rdflib.Graph, output_file, output_format=DEFAULT_OUTPUT_FORMAT,
+                   graph_name: rdflib.URIRef = None):
+    """
+        The sink of the triples of a worksheet, written into the output file when the context exits.
+
+        In Turtle, RDF/XML or JSON-LD, the triples are added into the graph, which is serialised at the end.
+        In a streaming format, the triples already in the graph (e.g. the concept scheme) are handed to the sink
+        first and the following ones as they come, so the graph keeps only the namespaces and those first triples.
+        In several formats, the triples are added into the graph, which is serialised in all the formats
+        concurrently (see serialize_graph_concurrently), into files named after the output file.
+
+    :param graph: the graph of the worksheet, with its namespaces bound
+    :param output_file: the output file path
+    :param output_format: one of OUTPUT_FORMATS, or a list of them
+    :param graph_name: the name of the graph, for N-Quads
+    """
+    output_formats = as_output_formats(output_format)
+    unknown_formats = [name for name in output_formats if name not in OUTPUT_FORMATS]
+    if unknown_formats or not output_formats:
+        raise ValueError(f"Unknown output formats: {output_format}. Expected some of {OUTPUT_FORMATS}")
+
+    if len(output_formats) > 1:
+        files = output_files(output_file, output_formats)
+        yield GraphSink(graph)
+        serialize_graph_concurrently(graph, files, graph_name=graph_name)
+    elif output_formats[0] in GRAPH_FORMATS:
+        yield GraphSink(graph)
+        serialize_graph(graph, output_file, output_formats[0], graph_name=graph_name)
+    else:
+        with streaming_sink(output_file, output_format=output_formats[0], graph_name=graph_name,
+                            namespaces=list(graph.namespaces())) as sink:
+            sink.add_triples(graph)
+            yield sink
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+
+# uri_minting.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Minting of the URIs of the generated resources (e.g. the reified constraints).
+
+    A URI is minted from a stable hash of its key, made of the worksheet name, the column and the row key
+    (e.g. the subject URI of the row), so it does not change when other rows or cells of the workbook
+    change. The minted URIs can be kept in an on-disk registry, so that they are looked up rather than
+    recomputed and remain the same across workbook versions, even if the minting scheme evolves.
+"""
+import base64
+import hashlib
+import json
+import logging
+import pathlib
+
+import rdflib
+
+from lam4vb3.cell_parser import namespace_resolver
+
+URI_PREFIX = "res_"
+# the generated URIs are in the default namespace of the graph
+URI_NAMESPACE_PREFIX = ""
+REGISTRY_FORMAT_VERSION = 1
+KEY_SEPARATOR = "\t"
+# 15 bytes are encoded into 24 base32 characters, without padding
+DIGEST_SIZE = 15
+
+
+def stable_local_name(key: str, prefix: str = URI_PREFIX) -> str:
+    """
+        the local name minted from the key, which is the same in every run and on every platform
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+    return prefix + base64.b32encode(digest).decode("ascii").lower()
+
+
+def minting_key(sheet_name: str, column: str, row_key) -> str:
+    return KEY_SEPARATOR.join((str(sheet_name), str(column), str(row_key)))
+
+
+class UriMinter:
+    """
+        Mints the URIs in batches and keeps the local names minted so far in a registry,
+        optionally persisted into a JSON file.
+    """
+
+    def __init__(self, registry_file=None):
+        """
+        :param registry_file: the JSON file where the registry is loaded from and saved into;
+                            if None the registry is kept in memory only
+        """
+        self.registry_file = pathlib.Path(registry_file) if registry_file else None
+        self.registry = {}
+        self.hits = 0
+        self.minted = 0
+        if self.registry_file and self.registry_file.exists():
+            self.registry = json.loads(self.registry_file.read_text())["uris"]
+            logging.info(f"Loaded {len(self.registry)} URIs from the registry {self.registry_file}")
+
+    def mint(self, graph: rdflib.Graph, sheet_name: str, column: str, row_keys) -> list:
+        """
+            Mint the URIs of a column of a worksheet, one for each row key.
+
+        :param graph: the graph whose default namespace is the base of the URIs
+        :param sheet_name: the worksheet name
+        :param column: the column name
+        :param row_keys: the keys identifying the rows, e.g. their subject URIs
+        :return: the list of URIs, in the order of the row keys
+        """
+        base = namespace_resolver(graph).base(URI_NAMESPACE_PREFIX)
+        local_names = []
+        for row_key in row_keys:
+            key = minting_key(sheet_name, column, row_key)
+            local_name = self.registry.get(key)
+            if local_name is None:
+                local_name = stable_local_name(key)
+                # without a registry file there is nothing to gain from keeping the minted names
+                if self.registry_file:
+                    self.registry[key] = local_name
+                self.minted += 1
+            else:
+                self.hits += 1
+            local_names.append(local_name)
+        return [rdflib.URIRef(base + local_name) for local_name in local_names]
+
+    def merge(self, other: "UriMinter"):
+        """
+            add the URIs minted by another minter, e.g. a copy of this one used in another process
+        """
+        self.registry.update(other.registry)
+        self.hits += other.hits
+        self.minted += other.minted
+
+    def save(self):
+        """
+            write the registry into the registry file, if any
+        """
+        if self.registry_file:
+            self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+            self.registry_file.write_text(json.dumps({"version": REGISTRY_FORMAT_VERSION, "uris": self.registry}))
+            logging.info(f"Saved {len(self.registry)} URIs into the registry {self.registry_file} "
+                         f"({self.hits} looked up, {self.minted} minted)")
+
+
+# used by the triple makers when no minter is provided
+DEFAULT_URI_MINTER = UriMinter()
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+
+# workbook.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Loading of the LAM workbook worksheets.
+
+    Reading one worksheet with pandas parses the entire xlsx file, so reading the worksheets one by one
+    re-parses the same file once per worksheet. The snapshot opens the workbook once and keeps all the
+    worksheets needed by the builders in memory.
+
+    For very large worksheets the rows can instead be streamed from the file (openpyxl read-only mode)
+    and handed to the builders in bounded chunks of data frames.
+"""
+import itertools
+import pathlib
+
+import openpyxl
+import pandas as pd
+
+from lam4vb3 import WORKSHEET_NAMES, LAM_PROPERTIES_WS_NAME, LAM_PROPERTY_CLASSIFICATION_WS_NAME, \
+    LAM_CLASSES_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME, CELEX_CLASSES_WS_NAME, \
+    CELEX_CLASS_CLASSIFICATION_WS_NAME, PREFIX_WS_NAME
+from lam4vb3.input_adapters import read_worksheets, cell_to_str
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class WorkbookSnapshot:
+    """
+        The worksheets of a LAM workbook, read in a single pass over the file.
+    """
+
+    def __init__(self, file_path, sheet_names=WORKSHEET_NAMES, worksheets: dict = None, usecols: dict = None):
+        """
+        :param file_path: the workbook, in any of the formats supported by the input adapters
+        :param sheet_names: the worksheets to be loaded; by default all the worksheets used by the builders
+        :param worksheets: already parsed worksheets (e.g. from a cache); when provided the file is not read
+        :param usecols: a dictionary of worksheet names and the only columns to be read from them
+        """
+        self.file_path = pathlib.Path(file_path)
+        self.sheet_names = list(sheet_names)
+        if worksheets is None:
+            worksheets = read_worksheets(self.file_path, sheet_names=self.sheet_names, usecols=usecols)
+        self.worksheets = worksheets
+
+    def __getitem__(self, sheet_name: str) -> pd.DataFrame:
+        return self.worksheets[sheet_name]
+
+    def __contains__(self, sheet_name: str) -> bool:
+        return sheet_name in self.worksheets
+
+    def subset(self, sheet_names) -> "WorkbookSnapshot":
+        """
+            the snapshot of only the given worksheets and of the prefixes, sharing their data frames,
+            e.g. to send a process no more than the worksheets it transforms
+        """
+        worksheets = {name: df for name, df in self.worksheets.items() if name in sheet_names or name == PREFIX_WS_NAME}
+        return WorkbookSnapshot(file_path=self.file_path, sheet_names=list(worksheets), worksheets=worksheets)
+
+    @property
+    def prefixes(self) -> pd.DataFrame:
+        return self[PREFIX_WS_NAME]
+
+    @property
+    def lam_properties(self) -> pd.DataFrame:
+        return self[LAM_PROPERTIES_WS_NAME]
+
+    @property
+    def lam_property_classification(self) -> pd.DataFrame:
+        return self[LAM_PROPERTY_CLASSIFICATION_WS_NAME]
+
+    @property
+    def lam_classes(self) -> pd.DataFrame:
+        return self[LAM_CLASSES_WS_NAME]
+
+    @property
+    def lam_class_classification(self) -> pd.DataFrame:
+        return self[LAM_CLASS_CLASSIFICATION_WS_NAME]
+
+    @property
+    def celex_classes(self) -> pd.DataFrame:
+        return self[CELEX_CLASSES_WS_NAME]
+
+    @property
+    def celex_class_classification(self) -> pd.DataFrame:
+        return self[CELEX_CLASS_CLASSIFICATION_WS_NAME]
+
+
+def iter_excel_worksheet_rows(file_path, sheet_name: str, usecols=None):
+    """
+        Lazily yield the rows of a worksheet as dictionaries of column name and cell string value.
+        The workbook is opened in read-only mode so that only the current row is held in memory.
+        Like pd.read_excel, the first row is the header and the blank rows are skipped.
+
+    :param file_path: the Excel workbook
+    :param sheet_name: the worksheet to be read
+    :param usecols: the columns to be read; if None all the columns are read
+    :return: a generator of dictionaries
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        # the dimensions declared in the file are unreliable (e.g. A1:AMJ1048576), so use the actual rows
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = [cell_to_str(value) for value in next(rows, ())]
+        while header and not header[-1]:
+            header.pop()
+        columns = [name if name else f"Unnamed: {index}" for index, name in enumerate(header)]
+        selected_positions = [position for position, name in enumerate(columns) if usecols is None or name in usecols]
+
+        for values in rows:
+            cells = [cell_to_str(values[position]) if position < len(values) else "" for position in selected_positions]
+            if not any(cells):
+                continue
+            yield {columns[position]: cell for position, cell in zip(selected_positions, cells)}
+    finally:
+        workbook.close()
+
+
+def read_excel_worksheet_in_chunks(file_path, sheet_name: str, chunk_size: int = DEFAULT_CHUNK_SIZE, usecols=None):
+    """
+        Stream a worksheet as a sequence of data frames of at most chunk_size rows.
+        The frames follow the read_excel_worksheet contract (string values, no NA) and the row index
+        continues from one chunk to the next, as if the whole worksheet was read at once.
+
+    :param file_path: the Excel workbook
+    :param sheet_name: the worksheet to be read
+    :param chunk_size: the maximum number of rows in a data frame
+    :param usecols: the columns to be read; if None all the columns are read
+    :return: a generator of data frames
+    """
+    rows = iter_excel_worksheet_rows(file_path=file_path, sheet_name=sheet_name, usecols=usecols)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        yield pd.DataFrame(chunk, index=pd.RangeIndex(start, start + len(chunk)), dtype=str)
+        start += len(chunk)
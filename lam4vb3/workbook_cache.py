@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+
+# workbook_cache.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    An on-disk cache of parsed workbooks.
+
+    Each workbook is identified by the SHA-256 of its content. Its parsed worksheets are stored as Parquet
+    files in a folder named after the hash, along with a manifest mapping worksheet names to files.
+    When the cache grows beyond its maximum size, the least recently used workbooks are evicted.
+"""
+import hashlib
+import json
+import logging
+import pathlib
+import shutil
+
+import pandas as pd
+import pyarrow.parquet
+
+from lam4vb3 import WORKSHEET_NAMES
+from lam4vb3.input_adapters import read_worksheets
+from lam4vb3.lam_utils import select_columns
+from lam4vb3.workbook import WorkbookSnapshot
+
+# bump when the worksheet reading contract changes, so that stale entries are not reused
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_CACHE_FOLDER = pathlib.Path.home() / ".cache" / "lam4vb3"
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+MANIFEST_FILE_NAME = "manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path) -> str:
+    """
+        the hex digest of the SHA-256 of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """
+        Parsed worksheets keyed by the content hash of the workbook they were read from.
+    """
+
+    def __init__(self, cache_folder=DEFAULT_CACHE_FOLDER, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        """
+        :param cache_folder: the folder where the parsed worksheets are stored
+        :param max_size: the size in bytes above which the least recently used entries are evicted
+        """
+        self.cache_folder = pathlib.Path(cache_folder)
+        self.max_size = max_size
+
+    def entry_folder(self, file_path) -> pathlib.Path:
+        return self.cache_folder / f"v{CACHE_FORMAT_VERSION}" / file_sha256(file_path)
+
+    def load_workbook(self, file_path, sheet_names=WORKSHEET_NAMES, usecols: dict = None) -> WorkbookSnapshot:
+        """
+            Return the workbook snapshot, reading from the cache the worksheets parsed in previous runs
+            and parsing (and caching) only the missing ones.
+            The cache holds entire worksheets, so that any selection of columns (usecols) can be served from it.
+        """
+        sheet_names = list(sheet_names)
+        usecols = usecols or {}
+        entry_folder = self.entry_folder(file_path)
+        manifest = self._read_manifest(entry_folder)
+
+        worksheets = {name: self._read_worksheet(entry_folder / manifest[name], usecols.get(name))
+                      for name in sheet_names if name in manifest}
+        missing_sheet_names = [name for name in sheet_names if name not in worksheets]
+        if worksheets:
+            logging.info(f"Read {len(worksheets)} worksheet(s) of {file_path} from the cache {entry_folder}")
+            (entry_folder / MANIFEST_FILE_NAME).touch()
+
+        if missing_sheet_names:
+            parsed_worksheets = read_worksheets(file_path, sheet_names=missing_sheet_names)
+            self._write_worksheets(entry_folder, manifest, parsed_worksheets)
+            worksheets.update({name: select_columns(df, usecols.get(name)) for name, df in parsed_worksheets.items()})
+            self.evict(keep=entry_folder)
+
+        return WorkbookSnapshot(file_path=file_path, sheet_names=sheet_names,
+                                worksheets={name: worksheets[name] for name in sheet_names})
+
+    def size(self) -> int:
+        return sum(f.stat().st_size for f in self.cache_folder.rglob("*") if f.is_file())
+
+    def evict(self, keep: pathlib.Path = None):
+        """
+            Remove the least recently used entries until the cache fits its maximum size.
+        :param keep: an entry folder that must not be evicted
+        """
+        entries = [(manifest.stat().st_mtime, manifest.parent) for manifest in
+                   self.cache_folder.glob(f"*/*/{MANIFEST_FILE_NAME}") if manifest.parent != keep]
+        total_size = self.size()
+        for _, entry_folder in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size:
+                break
+            entry_size = sum(f.stat().st_size for f in entry_folder.rglob("*") if f.is_file())
+            shutil.rmtree(entry_folder, ignore_errors=True)
+            total_size -= entry_size
+            logging.info(f"Evicted {entry_folder} from the workbook cache")
+
+    def clear(self):
+        shutil.rmtree(self.cache_folder, ignore_errors=True)
+
+    @staticmethod
+    def _read_worksheet(worksheet_file: pathlib.Path, columns=None) -> pd.DataFrame:
+        if columns is not None:
+            columns = [column for column in pyarrow.parquet.read_schema(worksheet_file).names if column in columns]
+        return pd.read_parquet(worksheet_file, columns=columns)
+
+    @staticmethod
+    def _read_manifest(entry_folder: pathlib.Path) -> dict:
+        manifest_file = entry_folder / MANIFEST_FILE_NAME
+        if not manifest_file.exists():
+            return {}
+        try:
+            manifest = json.loads(manifest_file.read_text())
+        except ValueError:
+            return {}
+        return {name: file_name for name, file_name in manifest.items() if (entry_folder / file_name).exists()}
+
+    @staticmethod
+    def _write_worksheets(entry_folder: pathlib.Path, manifest: dict, worksheets: dict):
+        entry_folder.mkdir(parents=True, exist_ok=True)
+        for name, df in worksheets.items():
+            # worksheet names may contain characters that are not safe in file names
+            file_name = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16] + ".parquet"
+            df.to_parquet(entry_folder / file_name)
+            manifest[name] = file_name
+        (entry_folder / MANIFEST_FILE_NAME).write_text(json.dumps(manifest, indent=2))
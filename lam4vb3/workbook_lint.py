@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+
+# workbook_lint.py
+# Date:  18/10/2026
+# Author: Eugeniu Costetchi
+# Email: costezki.eugen@gmail.com
+
+"""
+    Pre-flight check of a workbook, before transforming it.
+
+    Every column mapped by the builders is interpreted by the cell parser, without building any triple,
+    and all the cells that could not be interpreted (e.g. an unknown prefix or more than one pipe) are
+    reported at once, instead of surfacing one by one as warnings during the transformation.
+"""
+import collections
+import logging
+import pathlib
+import sys
+import time
+
+import click
+import pandas as pd
+
+from lam4vb3 import cell_parser, lam_utils
+from lam4vb3.excel2rdf import TRANSFORMATIONS, load_workbook
+from lam4vb3.workbook import WorkbookSnapshot
+from lam4vb3.workbook_cache import WorkbookCache
+
+# the row is the index of the row in the worksheet data frame, as in the transformation warnings
+LintError = collections.namedtuple("LintError", ["sheet", "row", "column", "error"])
+
+
+def lint_worksheet(df: pd.DataFrame, graph, sheet_name: str, columns: list, literal_columns: list) -> list:
+    """
+        Interpret the cells of the columns and return the errors found.
+        A missing column is reported once, without a row.
+    """
+    errors = []
+    for column in columns:
+        if column not in df.columns:
+            errors.append(LintError(sheet=sheet_name, row=None, column=column, error=f"Missing column {column}"))
+            continue
+        parsed_column = cell_parser.parse_column(df[column], graph=graph, is_literal=column in literal_columns)
+        failed = parsed_column[cell_parser.ERROR].notna()
+        errors.extend(LintError(sheet=sheet_name, row=index, column=column, error=error)
+                      for index, error in parsed_column.loc[failed, cell_parser.ERROR].items())
+    return errors
+
+
+def lint_workbook(workbook: WorkbookSnapshot) -> list:
+    """
+        Interpret all the columns mapped by the builders, in all the worksheets of the workbook.
+
+    :return: a list of LintError, ordered by worksheet, column and row
+    """
+    graph = lam_utils.make_graph(workbook.prefixes)
+    errors = []
+    for builder, concepts_sheet_name, collections_sheet_name, _ in TRANSFORMATIONS:
+        for sheet_name, columns, literal_columns in (
+                (concepts_sheet_name, builder.CONCEPTS_WORKSHEET_COLUMNS, builder.LITERAL_CONCEPTS_COLUMNS),
+                (collections_sheet_name, builder.COLLECTIONS_WORKSHEET_COLUMNS, builder.LITERAL_COLLECTIONS_COLUMNS)):
+            # the subject URIs fall back to generated URIs, so they are never an error
+            errors.extend(lint_worksheet(workbook[sheet_name], graph=graph, sheet_name=sheet_name,
+                                         columns=[column for column in columns if column != builder.URI_COLUMN],
+                                         literal_columns=literal_columns))
+    return errors
+
+
+def lint_report(errors: list) -> pd.DataFrame:
+    return pd.DataFrame(errors, columns=LintError._fields)
+
+
+@click.command()
+@click.argument("input_file", type=click.Path(exists=True, file_okay=True))
+@click.option("--report", type=click.Path(dir_okay=False, writable=True), default=None,
+              help="Write the errors into this CSV file.")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Parse the workbook even if it was parsed before, bypassing the cache of parsed workbooks.")
+def lint(input_file, report, no_cache):
+    """
+        Check that all the cells of a workbook can be interpreted, without transforming it.
+        Exits with status 1 if any error is found.
+    """
+    start_time = time.time()
+    workbook = load_workbook(input_file=pathlib.Path(input_file).resolve(), cache=None if no_cache else WorkbookCache())
+    errors = lint_workbook(workbook)
+    logging.info(f"Linted {input_file} in {(time.time() - start_time)} seconds")
+
+    for error in errors:
+        click.echo(f"{error.sheet}, row {error.row}, column {error.column}: {error.error}")
+    if report:
+        lint_report(errors).to_csv(report, index=False)
+    click.echo(f"{len(errors)} error(s) found in {input_file}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    lint()
@@ -0,0 +1,56 @@
+import pathlib
+import shutil
+
+import pandas as pd
+from click.testing import CliRunner
+
+from lam4vb3.batch_transform import transform_batch, transform_files_in_folder, SUCCEEDED, FAILED
+from tests import LAM_p, LAM_c, CELEX_c
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+def make_input_folder(tmp_path):
+    input_folder = tmp_path / "input"
+    input_folder.mkdir()
+    shutil.copy(TESTBED_EXCEL_2021_08, input_folder / "testbed.xlsx")
+    (input_folder / "broken.xlsx").write_bytes(b"not a workbook")
+    (input_folder / "notes.md").write_text("not a workbook either")
+    return input_folder
+
+
+def test_transform_batch_isolates_failures(tmp_path):
+    input_folder = make_input_folder(tmp_path)
+
+    results = transform_batch(sorted(input_folder.glob("*.xlsx")), tmp_path / "output", no_cache=True)
+
+    assert [(result.status, result.error is None) for result in results] == [(FAILED, False), (SUCCEEDED, True)]
+    for file_name in (CELEX_c, LAM_p, LAM_c):
+        assert (tmp_path / "output" / "testbed" / file_name).exists()
+
+
+def test_transform_files_in_folder_command(tmp_path):
+    input_folder = make_input_folder(tmp_path)
+    summary_file = tmp_path / "summary.csv"
+
+    result = CliRunner().invoke(transform_files_in_folder, [str(input_folder), str(tmp_path / "output"), "--jobs", "2",
+                                                            "--summary", str(summary_file), "--no-cache"])
+
+    assert result.exit_code == 1
+    assert "1 workbook(s) transformed, 1 failed" in result.output
+    summary = pd.read_csv(summary_file)
+    assert list(summary["status"]) == [FAILED, SUCCEEDED]
+    assert (tmp_path / "output" / "testbed" / LAM_c).exists()
+
+
+def test_transform_batch_reports_colliding_output_folders(tmp_path):
+    input_folder = make_input_folder(tmp_path)
+    shutil.copy(TESTBED_EXCEL_2021_08, input_folder / "broken.ods")
+    (input_folder / "broken").mkdir()
+
+    results = transform_batch(sorted(path for path in input_folder.iterdir() if path.suffix != ".md"),
+                              tmp_path / "output", jobs=2, no_cache=True)
+
+    assert [(pathlib.Path(result.input_file).name, result.status) for result in results] == \
+           [("broken", FAILED), ("broken.ods", FAILED), ("broken.xlsx", FAILED), ("testbed.xlsx", SUCCEEDED)]
+    assert all("broken, broken.ods, broken.xlsx" in result.error for result in results[:3])
+    assert not (tmp_path / "output" / "broken").exists()
@@ -0,0 +1,63 @@
+import io
+import random
+
+import pytest
+import rdflib
+from rdflib import RDF, SKOS, XSD
+
+from lam4vb3.builder import lam_classes_builder
+from lam4vb3.canonical_turtle import CanonicalTurtleSink, write_canonical_turtle
+from lam4vb3.lam_utils import make_graph
+
+EX = rdflib.Namespace("http://example.com/")
+
+
+def canonical_turtle(triples, namespaces=(), chunk_size=100000) -> str:
+    stream = io.StringIO()
+    write_canonical_turtle(triples, stream, namespaces=namespaces, chunk_size=chunk_size)
+    return stream.getvalue()
+
+
+def test_canonical_turtle_is_independent_of_the_order(test_lam_classes_df, test_prefixes_df):
+    graph = make_graph(test_prefixes_df)
+    lam_classes_builder.create_concepts(test_lam_classes_df, graph)
+    triples = list(graph)
+    turtle = canonical_turtle(triples, namespaces=graph.namespaces())
+
+    random.Random(1).shuffle(triples)
+    # spilled into many sorted chunks, and with repeated triples
+    assert canonical_turtle(triples + triples[:50], namespaces=graph.namespaces(), chunk_size=97) == turtle
+    assert set(rdflib.Graph().parse(data=turtle, format="turtle")) == set(graph)
+
+
+def test_canonical_turtle_terms():
+    triples = [(EX.b, RDF.type, SKOS.Concept),
+               (EX.b, SKOS.prefLabel, rdflib.Literal("B", lang="en")),
+               (EX.b, SKOS.notation, rdflib.Literal("1", datatype=XSD.int)),
+               (EX.a, SKOS.editorialNote, rdflib.Literal('two\nlines "quoted"')),
+               (EX.a, SKOS.related, EX["c.d"]),
+               (EX.a, SKOS.related, EX.b)]
+    turtle = canonical_turtle(triples, namespaces=[("ex", EX), ("skos", SKOS), ("xsd", XSD)])
+
+    assert turtle.splitlines() == ['@prefix ex: <http://example.com/> .',
+                                   '@prefix skos: <http://www.w3.org/2004/02/skos/core#> .',
+                                   '@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .',
+                                   '',
+                                   'ex:a skos:editorialNote "two\\nlines \\"quoted\\"" ;',
+                                   '    skos:related ex:b,',
+                                   '        <http://example.com/c.d> .',
+                                   '',
+                                   'ex:b a skos:Concept ;',
+                                   '    skos:notation "1"^^xsd:int ;',
+                                   '    skos:prefLabel "B"@en .']
+    assert set(rdflib.Graph().parse(data=turtle, format="turtle")) == set(triples)
+
+
+def test_incomplete_output_is_not_written(tmp_path):
+    output_file = tmp_path / "output.ttl"
+    with pytest.raises(ValueError):
+        with CanonicalTurtleSink(output_file, chunk_size=1) as sink:
+            sink.add_triples([(EX.a, SKOS.related, EX.b), (EX.b, SKOS.related, EX.a)])
+            raise ValueError("the worksheet could not be transformed")
+
+    assert not output_file.exists()
@@ -1,6 +1,12 @@
+import pandas as pd
 import pytest
+import rdflib
 
-from lam4vb3.cell_parser import LITERAL_VALUE, VALUES, COMMENT, MIN_COUNT, MAX_COUNT, CONTROLLED_LIST, parse_cell
+from benchmarks.legacy_cell_parser import legacy_tokenize_cell, legacy_parse_qname, BENCHMARK_CELLS, BENCHMARK_QNAMES
+from lam4vb3.cell_parser import LITERAL_VALUE, VALUES, COMMENT, MIN_COUNT, MAX_COUNT, CONTROLLED_LIST, parse_cell, \
+    parse_cache, parse_cache_info, ParseCache, NamespaceResolver, namespace_resolver, qname_uri, parse_column, \
+    cell_interpretation, ERROR, NAME
+from lam4vb3.cell_tokenizer import tokenize_cell, tokenize_qname
 
 
 def test_multiline_value_parser(lam_classes_graph):
@@ -109,3 +115,142 @@ def test_literal_value_parser(lam_classes_graph):
 
     assert result == {}
 
+
+def test_parse_cell_memoization(empty_lam_graph):
+    parse_cache.clear()
+    first = parse_cell("eurovoc:1452 | a comment", empty_lam_graph)
+    first[VALUES].append("mutated")
+    second = parse_cell("eurovoc:1452 | a comment", empty_lam_graph)
+
+    assert second == {VALUES: [first[VALUES][0]], COMMENT: "a comment", MIN_COUNT: 1}
+    assert parse_cache_info().hits == 1
+    assert parse_cache_info().misses == 1
+    assert parse_cache_info().currsize == 1
+
+    parse_cell("eurovoc:1452 | a comment", empty_lam_graph, is_literal=True)
+    assert parse_cache_info().misses == 2
+
+
+def test_parse_cell_memoization_invalidated_by_bind(empty_lam_graph):
+    parse_cache.clear()
+    before = parse_cell("eurovoc:1452", empty_lam_graph)
+    empty_lam_graph.bind("eurovoc", "http://example.com/eurovoc/", override=True, replace=True)
+    after = parse_cell("eurovoc:1452", empty_lam_graph)
+
+    assert str(after[VALUES][0]) == "http://example.com/eurovoc/1452"
+    assert before[VALUES] != after[VALUES]
+    assert parse_cache_info().hits == 0
+
+
+def test_parse_cell_memoization_invalidated_by_namespace_manager(empty_lam_graph):
+    parse_cache.clear()
+    before = parse_cell("eurovoc:1452", empty_lam_graph)
+    empty_lam_graph.namespace_manager.bind("eurovoc", "http://example.com/eurovoc/", override=True, replace=True)
+    after = parse_cell("eurovoc:1452", empty_lam_graph)
+
+    assert str(after[VALUES][0]) == "http://example.com/eurovoc/1452"
+    assert before[VALUES] != after[VALUES]
+
+    assert parse_cache_info().hits == 0
+
+    # the prefixes declared in a parsed document are bound through the namespace manager too
+    resolver = namespace_resolver(empty_lam_graph)
+    with pytest.raises(ValueError):
+        qname_uri("parsed:1452", resolver)
+    empty_lam_graph.parse(data="@prefix parsed: <http://example.com/parsed/> .", format="turtle")
+    assert str(qname_uri("parsed:1452", resolver)) == "http://example.com/parsed/1452"
+
+
+def test_parse_cache_is_bounded():
+    cache = ParseCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        if cache.get(key) is None:
+            cache.put(key, {LITERAL_VALUE: key})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {LITERAL_VALUE: "a"}
+    assert cache.info().currsize == 2
+
+
+def test_namespace_resolver(empty_lam_graph):
+    resolver = namespace_resolver(empty_lam_graph)
+
+    assert resolver is empty_lam_graph.namespace_resolver
+    assert qname_uri("skos:prefLabel", resolver) == rdflib.namespace.SKOS.prefLabel
+    with pytest.raises(ValueError):
+        qname_uri("unknown:prefLabel", resolver)
+
+    empty_lam_graph.bind("unknown", "http://example.com/unknown/")
+    assert str(qname_uri("unknown:prefLabel", resolver)) == "http://example.com/unknown/prefLabel"
+
+
+def test_namespace_resolver_of_plain_graph():
+    graph = rdflib.Graph()
+    resolver = namespace_resolver(graph)
+    graph.bind("ex", "http://example.com/")
+
+    assert isinstance(resolver, NamespaceResolver)
+    assert str(qname_uri("ex:thing", resolver)) == "http://example.com/thing"
+
+
+def test_parse_column(empty_lam_graph):
+    cells = pd.Series(["eurovoc:1452\neurovoc:4347 | a comment", "yu", " O | optional ", "", "a|b|c", "unknown:1"],
+                      index=[3, 4, 5, 6, 7, 8])
+    parsed = parse_column(cells, empty_lam_graph)
+
+    assert list(parsed.index) == [3, 4, 5, 6, 7, 8]
+    assert parsed.loc[3, VALUES] == [qname_uri("eurovoc:1452", empty_lam_graph.namespaces()),
+                                     qname_uri("eurovoc:4347", empty_lam_graph.namespaces())]
+    assert parsed.loc[3, COMMENT] == "a comment"
+    assert parsed.loc[4, MAX_COUNT] == 1
+    assert parsed.loc[5, NAME] == "Optional"
+    assert parsed.loc[5, COMMENT] == "optional "
+    assert parsed.loc[7, ERROR] is not None
+    assert "unknown:1" in parsed.loc[8, ERROR]
+
+    for index, cell in cells.items():
+        if parsed.loc[index, ERROR] is None:
+            assert cell_interpretation(parsed, index) == parse_cell(cell, empty_lam_graph)
+        else:
+            with pytest.raises(ValueError):
+                parse_cell(cell, empty_lam_graph)
+            with pytest.raises(ValueError):
+                cell_interpretation(parsed, index)
+
+
+def test_parse_column_through_the_memo(empty_lam_graph):
+    parse_cache.clear()
+    cells = pd.Series(["y", "o", "y", "eurovoc:1452", "y", "eurovoc:1452"])
+    parse_column(cells, empty_lam_graph)
+
+    # each distinct value is interpreted once
+    assert parse_cache_info().misses == 3
+    assert parse_cache_info().currsize == 3
+
+    parse_column(cells, empty_lam_graph)
+    assert parse_cache_info().hits == 3
+
+
+def test_parse_literal_column(empty_lam_graph):
+    cells = pd.Series(["Council Common Position", "", "a | b | c"])
+    parsed = parse_column(cells, empty_lam_graph, is_literal=True)
+
+    for index, cell in cells.items():
+        assert cell_interpretation(parsed, index) == parse_cell(cell, empty_lam_graph, is_literal=True)
+
+
+def test_tokenize_cell_matches_legacy_parsing():
+    for cell in BENCHMARK_CELLS + ["a|b|c"]:
+        try:
+            expected = legacy_tokenize_cell(cell)
+        except ValueError:
+            with pytest.raises(ValueError):
+                tokenize_cell(cell)
+            continue
+        assert tuple(tokenize_cell(cell)) == expected
+
+    for qname in BENCHMARK_QNAMES + [" skos:prefLabel "]:
+        assert tokenize_qname(qname) == legacy_parse_qname(qname)
+    with pytest.raises(ValueError):
+        tokenize_qname("no qualified name")
+
@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.samples import make_lam_classes_concept_makers
+from lam4vb3.builder.composite_builders import CompositeTripleMaker
+
+
+def test_composite_triple_maker(test_lam_classes_df, empty_lam_graph):
+    separate_triples = {triple for maker in make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)
+                        for triple in maker.make_triples(inplace=False)}
+
+    composite_maker = CompositeTripleMaker(make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph))
+    composite_triples = composite_maker.make_triples(inplace=False)
+
+    assert set(composite_triples) == separate_triples
+    assert len(list(composite_maker.iter_triple_batches())) == len(test_lam_classes_df) + 1
+    assert set(composite_maker.make_triples(inplace=False, row_indexes=[3])) < separate_triples
+    assert CompositeTripleMaker().make_triples() == []
+
+    with pytest.raises(ValueError):
+        composite_maker.register(make_lam_classes_concept_makers(test_lam_classes_df.copy(), empty_lam_graph)[0])
+
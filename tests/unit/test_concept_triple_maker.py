@@ -6,12 +6,20 @@
 # Email: costezki.eugen@gmail.com 
 
 """ """
+import io
+import traceback
+
+import pytest
 import rdflib
-from rdflib import SKOS, RDFS, RDF
+from rdflib import SKOS, RDFS, RDF, DCTERMS
 
-from lam4vb3.builder import LAMD, SHACL, CDM
+from benchmarks.samples import make_lam_classes_concept_makers
+from lam4vb3.builder import LAMD, SHACL, CDM, lam_classes_builder
+from lam4vb3.builder.base_builders import ENGINES, ROWS_ENGINE, COLUMNAR_ENGINE
+from lam4vb3.builder.inverse_builders import InverseTripleMaker
 from lam4vb3.builder.simple_builders import ConceptTripleMaker, SimpleTripleMaker
-from lam4vb3.lam_utils import generate_uuid_uri
+from lam4vb3.lam_utils import generate_uuid_uri, make_graph
+from lam4vb3.triple_sinks import GraphSink, NTriplesSink
 
 TEST_LITERAL_COLUMNS_PROPERTY_DF = {
     'CODE': 'skos:notation',
@@ -91,3 +99,119 @@ def test_collection(test_lam_properties_classification_df, empty_lam_graph):
             rdflib.Literal(lexical_or_value="Celex number", lang="en")) in empty_lam_graph
     assert (LAMD.class_CLX, SKOS.member, LAMD.class_REF)
 
+
+def test_row_engines_make_the_same_triples(test_lam_classes_df, empty_lam_graph):
+    triples = {engine: [triple for maker in make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)
+                        for triple in maker.make_triples(inplace=False, engine=engine)]
+               for engine in ENGINES}
+
+    assert triples[ROWS_ENGINE] == triples[COLUMNAR_ENGINE]
+
+    with pytest.raises(ValueError):
+        make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)[0].make_triples(inplace=False,
+                                                                                               engine="unknown")
+
+
+def test_shared_subject_uris(test_lam_classes_df, empty_lam_graph):
+    concept_maker, in_collection_maker = make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)
+    subject_uris = concept_maker.row_uri_index()
+
+    assert list(subject_uris) == list(test_lam_classes_df.index)
+    assert subject_uris == in_collection_maker.row_uri_index()
+
+    renamed_uris = {index: rdflib.URIRef(f"http://example.com/row/{index}") for index in subject_uris}
+    shared_maker = InverseTripleMaker(df=test_lam_classes_df, column_mapping_dict=lam_classes_builder.COLLECTION_COLUMNS,
+                                      graph=empty_lam_graph, target_columns=[*lam_classes_builder.COLLECTION_COLUMNS],
+                                      subject_uris=renamed_uris)
+    triples = shared_maker.make_triples(inplace=False)
+
+    terms = {term for triple in triples for term in triple}
+    assert set(renamed_uris.values()) <= terms
+    assert not terms & set(subject_uris.values())
+
+
+def test_row_uri_failure_reported_for_its_row_only(test_lam_classes_df, empty_lam_graph):
+    failing_row = test_lam_classes_df.index[3]
+    made_rows = []
+
+    class FailingRowTripleMaker(ConceptTripleMaker):
+        def make_row_uri(self, row_index, seed: str = "") -> rdflib.URIRef:
+            made_rows.append(row_index)
+            if row_index == failing_row:
+                raise ValueError("no URI for this row")
+            return super().make_row_uri(row_index=row_index, seed=seed)
+
+    concept_maker = make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)[0]
+    failing_maker = FailingRowTripleMaker(df=test_lam_classes_df, graph=empty_lam_graph,
+                                          column_mapping_dict=lam_classes_builder.LITERAL_CONCEPTS_COLUMNS,
+                                          subject_in_scheme=lam_classes_builder.LAM_CS,
+                                          comment_predicate=SKOS.editorialNote,
+                                          target_columns=[*lam_classes_builder.LITERAL_CONCEPTS_COLUMNS],
+                                          literal_columns=[*lam_classes_builder.LITERAL_CONCEPTS_COLUMNS],
+                                          subject_source_column=lam_classes_builder.URI_COLUMN)
+    with pytest.warns(UserWarning) as warnings:
+        triples = failing_maker.make_triples(inplace=False)
+
+    assert [str(warning.message) for warning in warnings] == [f"Could not create triples for the row {failing_row}."]
+    assert made_rows == list(test_lam_classes_df.index)
+    assert isinstance(failing_maker.row_uri_index()[failing_row], ValueError)
+    expected_subjects = {uri for index, uri in concept_maker.row_uri_index().items() if index != failing_row}
+    assert {triple[0] for triple in triples if triple[0] in concept_maker.row_uri_index().values()} == expected_subjects
+
+
+def test_stream_triples_into_sinks(test_lam_classes_df, test_prefixes_df, empty_lam_graph):
+    expected_triples = {triple for maker in make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)
+                        for triple in maker.make_triples(inplace=False)}
+
+    graph = make_graph(test_prefixes_df)
+    graph_sink = GraphSink(graph)
+    with NTriplesSink(io.StringIO()) as n_triples_sink:
+        for maker in make_lam_classes_concept_makers(test_lam_classes_df, graph):
+            assert maker.make_triples(sink=graph_sink) == []
+            maker.make_triples(sink=n_triples_sink)
+        n_triples_graph = rdflib.Graph().parse(data=n_triples_sink.stream.getvalue(), format="nt")
+
+    assert set(graph) == expected_triples
+    assert set(n_triples_graph) == expected_triples
+    assert graph_sink.count == n_triples_sink.count >= len(expected_triples)
+
+    # the column triples, then one batch per row
+    concept_maker = make_lam_classes_concept_makers(test_lam_classes_df, graph)[0]
+    assert len(list(concept_maker.iter_triple_batches())) == len(test_lam_classes_df) + 1
+
+
+def test_column_plan(test_lam_classes_df, empty_lam_graph):
+    concept_maker, in_collection_maker = make_lam_classes_concept_makers(test_lam_classes_df, empty_lam_graph)
+    column_plan = concept_maker.column_plan()
+
+    assert list(column_plan) == concept_maker.target_columns
+    label_plan = column_plan["LABEL"]
+    assert (label_plan.predicate, label_plan.language, label_plan.is_literal) == (SKOS.prefLabel, "en", True)
+    assert label_plan.handler(row_index=0) == concept_maker.make_cell_triples(row_index=0, target_column="LABEL")
+    assert not any(plan.is_literal for plan in in_collection_maker.column_plan().values())
+
+    # an unresolvable mapping fails the cells of its column only
+    unknown_maker = SimpleTripleMaker(df=test_lam_classes_df, column_mapping_dict={"LABEL": "unknown:label",
+                                                                                   "KEYWORD": "skos:altLabel"},
+                                      graph=empty_lam_graph, comment_predicate=SKOS.editorialNote,
+                                      target_columns=["LABEL", "KEYWORD"], literal_columns=["LABEL", "KEYWORD"])
+    with pytest.warns(UserWarning, match="column LABEL"):
+        triples = unknown_maker.make_triples(inplace=False)
+    assert {predicate for _, predicate, _ in triples} == {SKOS.altLabel, RDF.type, DCTERMS.created}
+
+
+def test_unresolved_column_predicate_reported_per_cell(test_lam_classes_df, empty_lam_graph):
+    unknown_maker = SimpleTripleMaker(df=test_lam_classes_df, column_mapping_dict={"LABEL": "unknown:label"},
+                                      graph=empty_lam_graph, comment_predicate=SKOS.editorialNote,
+                                      target_columns=["LABEL"], literal_columns=["LABEL"])
+    errors, traceback_depths = [], []
+    for row_index in (0, 1):
+        with pytest.raises(ValueError, match=f"column LABEL for the cell at row {row_index}") as error:
+            unknown_maker.handle_column_predicate(target_column="LABEL", row_index=row_index)
+        errors.append(error.value)
+        traceback_depths.append(len(list(traceback.walk_tb(error.value.__cause__.__traceback__))))
+
+    # a new error for each cell, chained to the error of the column, which is never raised itself
+    assert errors[0] is not errors[1]
+    assert errors[0].__cause__ is errors[1].__cause__ is unknown_maker.column_plan()["LABEL"].cause
+    assert traceback_depths[0] == traceback_depths[1]
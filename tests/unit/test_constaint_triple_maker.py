@@ -1,8 +1,9 @@
 import rdflib
-from rdflib import SH, DCTERMS, SKOS
+from rdflib import SH, DCTERMS, SKOS, RDF
 
-from lam4vb3.builder import LAM, AT, LAMD, FD_365
+from lam4vb3.builder import LAM, AT, LAMD, FD_365, lam_classes_builder
 from lam4vb3.builder.reified_builders import ConstraintTripleMaker, AnnotationConstraintTripleMaker
+from lam4vb3.lam_utils import make_graph
 from tests.unit.conftest import TEMP_OUTPUT_FOLDER
 
 URI_COLUMN = 'URI'
@@ -118,3 +119,57 @@ def test_constraint_lam_classes(test_lam_classes_df, empty_lam_graph):
     assert (None, SH.maxCount, None) in empty_lam_graph
     assert (None, DCTERMS.created, None) in empty_lam_graph
     assert (None, SKOS.editorialNote, None) in empty_lam_graph
+
+
+def test_compact_constraint_lam_classes(test_lam_classes_df, test_prefixes_df):
+    def make_constraints(compact):
+        graph = make_graph(test_prefixes_df)
+        constraints = ConstraintTripleMaker(df=test_lam_classes_df,
+                                            graph=graph,
+                                            subject_source_column=URI_COLUMN,
+                                            target_columns=[*CONSTRAINT_LAM_CLASSES_COLUMNS],
+                                            column_mapping_dict=CONSTRAINT_LAM_CLASSES_COLUMNS,
+                                            constraint_class=LAM.PropertyConfiguration,
+                                            constraint_property=LAM.hasPropertyConfiguration,
+                                            constraint_comment=SKOS.editorialNote,
+                                            constraint_path_property=LAM.path,
+                                            compact=compact)
+        triples = constraints.make_triples(inplace=False)
+        constraints.make_triples()
+        return graph, constraints.compaction_report(), triples
+
+    graph, report, triples = make_constraints(compact=False)
+    compact_graph, compact_report, compact_triples = make_constraints(compact=True)
+
+    assert report.saved_nodes == 0 and report.nodes == report.cells
+    assert compact_report.cells == report.cells
+    assert compact_report.saved_nodes > 0
+    assert compact_report.nodes + compact_report.saved_nodes == compact_report.cells
+    assert len(compact_graph) < len(graph)
+    assert len(set(compact_graph.subjects(RDF.type, LAM.PropertyConfiguration))) == compact_report.nodes
+    # every row remains bound to a constraint of each of its filled columns
+    assert set(compact_graph.subjects(LAM.hasPropertyConfiguration, None)) == \
+           set(graph.subjects(LAM.hasPropertyConfiguration, None))
+    assert len(list(compact_graph.triples((None, LAM.hasPropertyConfiguration, None)))) == report.cells
+    # the shared nodes are made once
+    assert len(compact_triples) == len(triples) - compact_report.saved_triples
+
+
+def test_compact_mode_keeps_the_annotations_apart(test_lam_classes_df, test_prefixes_df):
+    graph = make_graph(test_prefixes_df)
+    lam_classes_builder.create_concepts(test_lam_classes_df, graph)
+    compact_graph = make_graph(test_prefixes_df)
+    lam_classes_builder.create_concepts(test_lam_classes_df, compact_graph, compact=True)
+
+    assert len(compact_graph) < len(graph)
+    # a shared node is annotated the same way for all the rows referencing it
+    assert len(list(compact_graph.triples((None, LAM.hasAnnotationConfiguration, None)))) <= \
+           len(list(graph.triples((None, LAM.hasAnnotationConfiguration, None))))
+    for node in set(compact_graph.objects(None, LAM.hasPropertyConfiguration)):
+        annotation_count = len(list(compact_graph.objects(node, LAM.hasAnnotationConfiguration)))
+        for concept in compact_graph.subjects(LAM.hasPropertyConfiguration, node):
+            path = compact_graph.value(node, LAM.path)
+            original_nodes = [original_node for original_node in graph.objects(concept, LAM.hasPropertyConfiguration)
+                              if graph.value(original_node, LAM.path) == path]
+            assert len(original_nodes) == 1
+            assert len(list(graph.objects(original_nodes[0], LAM.hasAnnotationConfiguration))) == annotation_count
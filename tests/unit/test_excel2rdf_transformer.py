@@ -6,12 +6,27 @@
 # Email: costezki.eugen@gmail.com 
 
 """ """
+import datetime
+import logging
 import shutil
+import uuid
 
+import pytest
+import rdflib
+from click.testing import CliRunner
+from rdflib import DCTERMS
+
+from lam4vb3 import CELEX_CLASSES_WS_NAME, LAM_PROPERTIES_WS_NAME, LAM_CLASSES_WS_NAME
 from lam4vb3.builder.property_builder import make_property_worksheet
 from lam4vb3.builder.lam_classes_builder import make_lam_classes_worksheet
 from lam4vb3.builder.celex_classes_builder import make_celex_classes_worksheet
-from tests import THIS_PROJECT, OUTPUT_FOLDER
+from lam4vb3.excel2rdf import transform_worksheets, load_workbook, run_transformation, transform, transform_classes
+from lam4vb3.rdf_terms import term_pool
+from lam4vb3.triple_sinks import STREAMING_FORMATS, NQUADS_FORMAT, CANONICAL_TURTLE_FORMAT, TURTLE_FORMAT, \
+    RDFXML_FORMAT, JSONLD_FORMAT, NTRIPLES_FORMAT, output_file_name, output_files, serialize_graph_concurrently
+from lam4vb3.uri_minting import UriMinter
+from tests import THIS_PROJECT, OUTPUT_FOLDER, LAM_p, LAM_c, CELEX_c
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
 
 shutil.rmtree(OUTPUT_FOLDER, ignore_errors=True)
 OUTPUT_FOLDER.mkdir()
@@ -73,3 +88,155 @@ def test_transform_sample_data_celex_classes(test_lam_celex_classes_df, test_lam
     assert output_folder.exists()
     assert output_folder.is_dir()
     assert any(output_folder.iterdir())
+
+
+def test_run_transformation_logs_its_own_term_pool_statistics(caplog):
+    term_pool.literal("interned before the transformation")
+    term_pool.literal("interned before the transformation")
+
+    def transformation(value):
+        term_pool.literal(value)
+
+    with caplog.at_level(logging.INFO):
+        run_transformation(transformation, {"value": str(uuid.uuid4())})
+
+    assert "Interned RDF terms: TermPoolInfo(hits=0, misses=1" in caplog.text
+    assert "hit rate 0.0%" in caplog.text
+
+
+def test_transform_with_a_pinned_creation_date(tmp_path, monkeypatch):
+    # the pinned date is left in the shared term pool
+    monkeypatch.setattr(term_pool, "creation_date", None)
+    output_files = {}
+    for run in ("first", "second"):
+        (tmp_path / run).mkdir()
+        result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path / run), "--no-cache",
+                                                "--output-format", CANONICAL_TURTLE_FORMAT, "--created", "2021-09-09"])
+        assert result.exit_code == 0, result.output
+        output_files[run] = tmp_path / run / output_file_name(LAM_c, CANONICAL_TURTLE_FORMAT)
+
+    assert output_files["first"].read_bytes() == output_files["second"].read_bytes()
+    graph = rdflib.Graph().parse(str(output_files["first"]), format="turtle")
+    assert set(graph.objects(None, DCTERMS.created)) == {rdflib.Literal(datetime.date(2021, 9, 9))}
+
+
+def test_transform_worksheets_in_parallel(tmp_path):
+    workbook = load_workbook(input_file=TESTBED_EXCEL_2021_08)
+    uri_minters = {}
+    for jobs in (1, 3):
+        (tmp_path / str(jobs)).mkdir()
+        uri_minters[jobs] = UriMinter(registry_file=tmp_path / f"registry_{jobs}.json")
+        timings = transform_worksheets(TESTBED_EXCEL_2021_08, tmp_path / str(jobs), workbook=workbook,
+                                       uri_minter=uri_minters[jobs], jobs=jobs)
+        assert list(timings) == [CELEX_CLASSES_WS_NAME, LAM_PROPERTIES_WS_NAME, LAM_CLASSES_WS_NAME]
+
+    # the URIs minted in the processes are merged back
+    assert uri_minters[3].registry == uri_minters[1].registry != {}
+    for file_name in (CELEX_c, LAM_p, LAM_c):
+        assert set(rdflib.Graph().parse(str(tmp_path / "3" / file_name))) == \
+               set(rdflib.Graph().parse(str(tmp_path / "1" / file_name)))
+
+
+def test_transform_worksheets_streaming_output_formats(tmp_path):
+    workbook = load_workbook(input_file=TESTBED_EXCEL_2021_08)
+    turtle_folder = tmp_path / "turtle"
+    turtle_folder.mkdir()
+    transform_worksheets(input_file=TESTBED_EXCEL_2021_08, output_folder=turtle_folder, workbook=workbook)
+
+    for output_format in STREAMING_FORMATS:
+        output_folder = tmp_path / output_format
+        output_folder.mkdir()
+        transform_worksheets(input_file=TESTBED_EXCEL_2021_08, output_folder=output_folder, workbook=workbook,
+                             output_format=output_format)
+
+        for file_name in (LAM_p, LAM_c, CELEX_c):
+            output_file = output_folder / output_file_name(file_name, output_format)
+            streamed_graph = rdflib.ConjunctiveGraph()
+            streamed_graph.parse(str(output_file),
+                                 format="turtle" if output_format == CANONICAL_TURTLE_FORMAT else output_format)
+            assert set(streamed_graph) == set(rdflib.Graph().parse(str(turtle_folder / file_name), format="turtle"))
+            if output_format != CANONICAL_TURTLE_FORMAT:
+                # the repeated triples are written once
+                assert len(output_file.read_text(encoding="utf-8").splitlines()) == len(streamed_graph)
+            if output_format == NQUADS_FORMAT:
+                assert len(list(streamed_graph.contexts())) == 1
+
+
+def test_make_worksheet_in_several_output_formats(test_lam_classes_df, test_lam_classes_classification_df,
+                                                  test_prefixes_df, tmp_path):
+    output_formats = [TURTLE_FORMAT, RDFXML_FORMAT, JSONLD_FORMAT, NTRIPLES_FORMAT]
+    graph = make_lam_classes_worksheet(lam_df_classes=test_lam_classes_df,
+                                       lam_df_classes_classification=test_lam_classes_classification_df,
+                                       prefixes=test_prefixes_df, output_file=tmp_path / LAM_c,
+                                       output_format=output_formats)
+
+    for output_format, output_file in output_files(tmp_path / LAM_c, output_formats).items():
+        assert set(rdflib.Graph().parse(str(output_file), format=output_format)) == set(graph)
+
+    timings = serialize_graph_concurrently(graph, output_files(tmp_path / LAM_c, output_formats))
+    assert list(timings) == output_formats
+    with pytest.raises(ValueError):
+        make_lam_classes_worksheet(lam_df_classes=test_lam_classes_df,
+                                   lam_df_classes_classification=test_lam_classes_classification_df,
+                                   prefixes=test_prefixes_df, output_file=tmp_path / LAM_c,
+                                   output_format=[TURTLE_FORMAT, "trix"])
+
+
+def test_output_formats_written_into_the_same_file_are_rejected(test_lam_classes_df,
+                                                                test_lam_classes_classification_df, test_prefixes_df,
+                                                                tmp_path):
+    output_formats = [TURTLE_FORMAT, CANONICAL_TURTLE_FORMAT]
+    with pytest.raises(ValueError):
+        output_files(tmp_path / LAM_c, output_formats)
+    with pytest.raises(ValueError):
+        make_lam_classes_worksheet(lam_df_classes=test_lam_classes_df,
+                                   lam_df_classes_classification=test_lam_classes_classification_df,
+                                   prefixes=test_prefixes_df, output_file=tmp_path / LAM_c,
+                                   output_format=output_formats)
+    assert not (tmp_path / LAM_c).exists()
+
+    result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path), "--no-cache",
+                                            "--output-format", TURTLE_FORMAT, "--output-format", CANONICAL_TURTLE_FORMAT])
+    assert result.exit_code == 2
+    assert "would be written into the same file" in result.output
+    assert not any(tmp_path.iterdir())
+
+
+def test_compact_constraints_are_not_made_in_chunks(test_lam_classes_df, test_lam_classes_classification_df,
+                                                   test_prefixes_df, tmp_path):
+    with pytest.raises(ValueError):
+        make_lam_classes_worksheet(lam_df_classes=[test_lam_classes_df[:10], test_lam_classes_df[10:]],
+                                   lam_df_classes_classification=test_lam_classes_classification_df,
+                                   prefixes=test_prefixes_df, output_file=tmp_path / LAM_c, compact=True)
+    with pytest.raises(ValueError):
+        transform_classes(TESTBED_EXCEL_2021_08, tmp_path, chunk_size=10, compact=True)
+
+    result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path), "--no-cache",
+                                            "--chunk-size", "10", "--compact-constraints"])
+    assert result.exit_code == 2
+    assert "--compact-constraints" in result.output
+    assert not any(tmp_path.iterdir())
+
+
+def test_transform_incrementally_from_a_previous_folder(tmp_path):
+    previous_folder = tmp_path / "previous"
+    previous_folder.mkdir()
+    result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path), "--no-cache",
+                                            "--previous-input-file", str(previous_folder)])
+    assert result.exit_code == 2
+    assert "Unsupported input" in result.output
+
+    for sheet_name, df in load_workbook(input_file=TESTBED_EXCEL_2021_08).worksheets.items():
+        df.to_csv(previous_folder / f"{sheet_name}.csv", index=False)
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path / "first"), "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    result = CliRunner().invoke(transform, [str(TESTBED_EXCEL_2021_08), str(tmp_path / "second"), "--no-cache",
+                                            "--previous-input-file", str(previous_folder),
+                                            "--previous-output-folder", str(tmp_path / "first")])
+    assert result.exit_code == 0, result.output
+    for file_name in (CELEX_c, LAM_p, LAM_c):
+        assert set(rdflib.Graph().parse(str(tmp_path / "second" / file_name))) == \
+               set(rdflib.Graph().parse(str(tmp_path / "first" / file_name)))
@@ -0,0 +1,60 @@
+from lam4vb3 import CELEX_CLASSES_WS_NAME, CELEX_CLASS_CLASSIFICATION_WS_NAME, WORKSHEET_NAMES
+from lam4vb3.builder import celex_classes_builder
+from lam4vb3.builder.celex_classes_builder import make_celex_classes_worksheet
+from lam4vb3.incremental import diff_worksheets, make_worksheet_incrementally
+from lam4vb3.workbook import WorkbookSnapshot
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+def edit_worksheet(df):
+    edited_df = df.copy()
+    changed_uri = edited_df.loc[10, "URI"]
+    edited_df.loc[10, "LABEL"] = "An edited label"
+    removed_uri = edited_df.loc[20, "URI"]
+    edited_df = edited_df.drop(index=20)
+    added_row = edited_df.loc[[30]].assign(URI=edited_df.loc[30, "URI"] + "_NEW")
+    edited_df = edited_df.reset_index(drop=True)
+    edited_df.loc[len(edited_df)] = added_row.iloc[0]
+    return edited_df, changed_uri, removed_uri
+
+
+def test_diff_worksheets(test_lam_celex_classes_df):
+    edited_df, changed_uri, removed_uri = edit_worksheet(test_lam_celex_classes_df)
+
+    diff = diff_worksheets(previous_df=test_lam_celex_classes_df, df=edited_df)
+
+    assert diff.removed == [removed_uri]
+    # the rows moved up by the removed row are not changed
+    assert diff.changed == [changed_uri]
+    assert diff.added == [edited_df.iloc[-1]["URI"]]
+    assert len(diff.indexes) < len(edited_df)
+
+    # the head of the worksheet seeds the generated URIs, so all the rows are rebuilt
+    head_edited_df = test_lam_celex_classes_df.copy()
+    head_edited_df.loc[0, "URI"] = head_edited_df.loc[0, "URI"] + "_EDITED"
+    diff = diff_worksheets(previous_df=test_lam_celex_classes_df, df=head_edited_df)
+    assert diff.indexes == list(head_edited_df.index)
+
+
+def test_make_worksheet_incrementally(tmp_path, test_lam_celex_classes_df, test_lam_celex_classes_classification_df,
+                                      test_prefixes_df):
+    previous_workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08, sheet_names=WORKSHEET_NAMES)
+    edited_df, _, _ = edit_worksheet(test_lam_celex_classes_df)
+    workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08, worksheets={**previous_workbook.worksheets,
+                                                                             CELEX_CLASSES_WS_NAME: edited_df})
+    make_celex_classes_worksheet(lam_df_celex_classes=test_lam_celex_classes_df,
+                                 lam_df_celex_classes_classification=test_lam_celex_classes_classification_df,
+                                 prefixes=test_prefixes_df, output_file=tmp_path / "previous.ttl")
+
+    patched_graph = make_worksheet_incrementally(builder=celex_classes_builder,
+                                                 concepts_sheet_name=CELEX_CLASSES_WS_NAME,
+                                                 collections_sheet_name=CELEX_CLASS_CLASSIFICATION_WS_NAME,
+                                                 previous_workbook=previous_workbook, workbook=workbook,
+                                                 previous_output_file=tmp_path / "previous.ttl",
+                                                 output_file=tmp_path / "patched.ttl")
+    rebuilt_graph = make_celex_classes_worksheet(lam_df_celex_classes=edited_df,
+                                                 lam_df_celex_classes_classification=test_lam_celex_classes_classification_df,
+                                                 prefixes=test_prefixes_df, output_file=tmp_path / "rebuilt.ttl")
+
+    assert (tmp_path / "patched.ttl").exists()
+    assert set(patched_graph) == set(rebuilt_graph)
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from lam4vb3 import WORKSHEET_NAMES, LAM_CLASSES_WS_NAME, PREFIX_WS_NAME
+from lam4vb3.input_adapters import detect_input_format, read_worksheets, CSV_FORMAT, PARQUET_FORMAT, \
+    EXCEL_FORMAT, ODS_FORMAT
+from lam4vb3.workbook import WorkbookSnapshot
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+@pytest.fixture(scope="module")
+def testbed_workbook():
+    return WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08)
+
+
+def test_detect_input_format(tmp_path):
+    assert detect_input_format(TESTBED_EXCEL_2021_08) == EXCEL_FORMAT
+    assert detect_input_format(tmp_path / "workbook.ods") == ODS_FORMAT
+    with pytest.raises(ValueError):
+        detect_input_format(tmp_path)
+    (tmp_path / f"{PREFIX_WS_NAME}.csv").write_text("prefix,uri\n")
+    assert detect_input_format(tmp_path) == CSV_FORMAT
+
+
+def test_csv_and_parquet_adapters(tmp_path, testbed_workbook):
+    for input_format in (CSV_FORMAT, PARQUET_FORMAT):
+        folder = tmp_path / input_format
+        folder.mkdir()
+        for sheet_name, df in testbed_workbook.worksheets.items():
+            if input_format == CSV_FORMAT:
+                df.to_csv(folder / f"{sheet_name}.csv", index=False)
+            else:
+                df.to_parquet(folder / f"{sheet_name}.parquet")
+
+        assert detect_input_format(folder) == input_format
+        worksheets = read_worksheets(folder, sheet_names=WORKSHEET_NAMES,
+                                     usecols={PREFIX_WS_NAME: ["prefix", "uri"]})
+        for sheet_name in WORKSHEET_NAMES:
+            assert worksheets[sheet_name].equals(testbed_workbook[sheet_name])
+
+
+def test_parquet_adapter_typed_columns(tmp_path):
+    df = pd.DataFrame({"URI": ["lam:a", "lam:b", None, "lam:c"],
+                       "ORDER": [1.0, 2.5, None, float("nan")],
+                       "COUNT": pd.array([3, None, None, 4], dtype="Int64")})
+    df.to_parquet(tmp_path / f"{LAM_CLASSES_WS_NAME}.parquet")
+
+    worksheets = read_worksheets(tmp_path, sheet_names=[LAM_CLASSES_WS_NAME])
+    # as the Excel reader with dtype=str: the integer floats lose their decimals and the missing values are empty
+    assert worksheets[LAM_CLASSES_WS_NAME].to_dict(orient="list") == {"URI": ["lam:a", "lam:b", "lam:c"],
+                                                                     "ORDER": ["1", "2.5", ""],
+                                                                     "COUNT": ["3", "", "4"]}
+
+
+def test_ods_adapter(tmp_path, testbed_workbook):
+    ods_file = tmp_path / "workbook.ods"
+    testbed_workbook.lam_classes.to_excel(ods_file, sheet_name=LAM_CLASSES_WS_NAME, index=False)
+
+    worksheets = read_worksheets(ods_file, sheet_names=[LAM_CLASSES_WS_NAME])
+    assert worksheets[LAM_CLASSES_WS_NAME].equals(testbed_workbook.lam_classes)
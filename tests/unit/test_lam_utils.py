@@ -0,0 +1,24 @@
+import pytest
+import rdflib
+
+from benchmarks.samples import make_row_triples
+from lam4vb3.lam_utils import add_triples_to_graph, INSERTION_MODES, BULK_INSERTION, TRIPLE_INSERTION, \
+    bulk_add_triples_to_graph
+
+
+def test_insertion_modes_build_the_same_graph():
+    triples = make_row_triples(1000)
+    graphs = {}
+    for insertion in INSERTION_MODES:
+        graphs[insertion] = rdflib.Graph()
+        add_triples_to_graph(result_triples=triples, graph=graphs[insertion], insertion=insertion)
+
+    assert set(graphs[TRIPLE_INSERTION]) == set(graphs[BULK_INSERTION]) == set(triples)
+
+    batched_graph = rdflib.Graph()
+    bulk_add_triples_to_graph(result_triples=triples, graph=batched_graph, batch_size=7)
+    assert set(batched_graph) == set(triples)
+
+    with pytest.raises(ValueError):
+        add_triples_to_graph(result_triples=triples, graph=rdflib.Graph(), insertion="unknown")
+
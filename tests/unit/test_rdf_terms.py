@@ -0,0 +1,92 @@
+from datetime import date
+
+import rdflib
+from rdflib import XSD, DCTERMS, SKOS
+
+from lam4vb3.builder import LAM, lam_classes_builder
+from lam4vb3.lam_utils import make_graph
+from lam4vb3.rdf_terms import TermPool, term_pool, n_triples_term, n_triples_line
+
+
+def test_equal_terms_are_the_same_object():
+    pool = TermPool()
+
+    assert pool.literal("1", datatype=XSD.int) is pool.literal("1", datatype=XSD.int)
+    assert pool.literal("Mandatory", lang="en") is pool.literal("Mandatory", lang="en")
+    assert pool.today() is pool.literal(date.today())
+    assert pool.uri("http://example.com/a") is pool.uri(rdflib.URIRef("http://example.com/a"))
+    assert pool.literal("1", datatype=XSD.int) == rdflib.Literal("1", datatype=XSD.int)
+    assert pool.info().hits == 5
+    assert pool.hit_rate() == 5 / 9
+
+
+def test_pinned_creation_date():
+    pool = TermPool()
+    assert pool.created() is pool.today()
+
+    pool.creation_date = date(2021, 9, 9)
+    assert pool.created() is pool.literal(date(2021, 9, 9))
+    pool.clear()
+    assert pool.created() == rdflib.Literal(date(2021, 9, 9))
+
+
+def test_different_terms_are_kept_apart():
+    pool = TermPool()
+
+    assert pool.literal("Mandatory", lang="en") != pool.literal("Mandatory")
+    assert pool.literal("1", datatype=XSD.int) != pool.literal("1")
+    assert pool.literal(True).datatype == XSD.boolean
+    assert pool.literal(1).datatype == XSD.integer
+    assert pool.uri("http://example.com/a") != pool.literal("http://example.com/a")
+    assert pool.hits == 0
+
+
+def test_pool_statistics_since_a_snapshot():
+    pool = TermPool()
+    pool.literal("a")
+    pool.literal("a")
+    before = pool.info()
+    pool.literal("a")
+    pool.literal("b")
+
+    usage = pool.info().since(before)
+    assert (usage.hits, usage.misses, usage.currsize) == (1, 1, 2)
+    assert usage.hit_rate() == 0.5
+    assert pool.hit_rate() == 0.5
+
+
+def test_full_pool_makes_the_terms_without_keeping_them():
+    pool = TermPool(maxsize=1)
+    first = pool.literal("a")
+    second = pool.literal("b")
+
+    assert pool.literal("a") is first
+    assert pool.literal("b") == second
+    assert pool.info().currsize == 1
+
+
+def test_builders_share_the_terms(test_lam_classes_df, test_prefixes_df):
+    graph = make_graph(test_prefixes_df)
+    hits = term_pool.hits
+    lam_classes_builder.create_concepts(test_lam_classes_df, graph)
+
+    assert term_pool.hits > hits
+    assert len({id(created) for created in graph.objects(None, DCTERMS.created)}) == 1
+    assert len({id(path) for path in graph.objects(None, LAM.path)}) == len(set(graph.objects(None, LAM.path)))
+
+
+def test_n_triples_terms():
+    assert n_triples_term(SKOS.Concept) == "<http://www.w3.org/2004/02/skos/core#Concept>"
+    assert n_triples_term(rdflib.BNode("b1")) == "_:b1"
+    assert n_triples_term(rdflib.Literal("a \\ \"quoted\"\r\nlabel", lang="en")) == '"a \\\\ \\"quoted\\"\\r\\nlabel"@en'
+    assert n_triples_term(rdflib.Literal("1", datatype=XSD.int)) == '"1"^^<http://www.w3.org/2001/XMLSchema#int>'
+    assert n_triples_term(rdflib.Literal("plain")) == '"plain"'
+    assert n_triples_term(rdflib.Literal(date(2021, 8, 15))) == '"2021-08-15"^^<http://www.w3.org/2001/XMLSchema#date>'
+
+
+def test_n_triples_lines_parse_back(lam_classes_graph):
+    lines = [n_triples_line(triple) for triple in lam_classes_graph]
+    parsed_graph = rdflib.Graph()
+    parsed_graph.parse(data="".join(lines), format="nt")
+
+    assert set(parsed_graph) == set(lam_classes_graph)
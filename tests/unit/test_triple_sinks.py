@@ -0,0 +1,29 @@
+import io
+
+import rdflib
+from rdflib import DCTERMS, RDF, SKOS
+
+from lam4vb3.triple_sinks import NTriplesSink, NQuadsSink
+
+
+def test_line_sinks_write_the_repeated_triples_once():
+    created = (rdflib.URIRef("http://example.com/a"), DCTERMS.created, rdflib.Literal("2021-08-15"))
+    other_subjects = [(rdflib.URIRef(f"http://example.com/{index}"), RDF.type, SKOS.Concept) for index in range(3)]
+
+    stream = io.StringIO()
+    with NTriplesSink(stream, seen_subjects=2) as sink:
+        sink.add_triples([created, created, other_subjects[0]])
+        sink.add_triples([created, other_subjects[1]])
+        # the subject is forgotten after two others
+        sink.add_triples([other_subjects[2], created])
+
+    assert sink.count == 7
+    assert stream.getvalue().splitlines().count(created[0].n3() + " " + created[1].n3() + ' "2021-08-15" .') == 2
+    assert len(stream.getvalue().splitlines()) == 5
+
+    graph_name = rdflib.URIRef("http://example.com/graph")
+    stream = io.StringIO()
+    with NQuadsSink(stream, graph_name=graph_name) as sink:
+        sink.add_triples([created, created])
+
+    assert stream.getvalue() == f'{created[0].n3()} {created[1].n3()} "2021-08-15" {graph_name.n3()} .\n'
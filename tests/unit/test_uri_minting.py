@@ -0,0 +1,52 @@
+import re
+
+import rdflib
+
+from lam4vb3.builder import LAM, lam_classes_builder
+from lam4vb3.lam_utils import make_graph
+from lam4vb3.uri_minting import UriMinter, stable_local_name, minting_key
+
+
+def test_stable_local_name():
+    local_name = stable_local_name(minting_key("LAM classes", "ANN_COD", "http://example.com/a"))
+
+    assert local_name == stable_local_name(minting_key("LAM classes", "ANN_COD", "http://example.com/a"))
+    assert local_name != stable_local_name(minting_key("LAM classes", "ANN_TOD", "http://example.com/a"))
+    assert re.fullmatch(r"res_[a-z2-7]{24}", local_name)
+
+
+def test_mint_in_the_order_of_the_row_keys(empty_lam_graph):
+    minter = UriMinter()
+    uris = minter.mint(empty_lam_graph, sheet_name="LAM classes", column="ANN_COD", row_keys=["b", "a", 3])
+
+    assert uris[1] == minter.mint(empty_lam_graph, sheet_name="LAM classes", column="ANN_COD", row_keys=["a"])[0]
+    assert len(set(uris)) == 3
+    assert all(isinstance(uri, rdflib.URIRef) for uri in uris)
+    # without a registry file nothing is kept
+    assert minter.registry == {}
+
+
+def test_registry_is_saved_and_loaded(tmp_path, empty_lam_graph):
+    registry_file = tmp_path / "registry" / "uris.json"
+    minter = UriMinter(registry_file=registry_file)
+    uris = minter.mint(empty_lam_graph, sheet_name="LAM classes", column="ANN_COD", row_keys=["a", "b"])
+    minter.save()
+    assert minter.minted == 2
+
+    reloaded_minter = UriMinter(registry_file=registry_file)
+    assert reloaded_minter.mint(empty_lam_graph, sheet_name="LAM classes", column="ANN_COD",
+                                row_keys=["a", "b"]) == uris
+    assert reloaded_minter.hits == 2
+    assert reloaded_minter.minted == 0
+
+
+def test_constraint_uris_do_not_depend_on_other_rows(test_lam_classes_df, test_prefixes_df):
+    graph = make_graph(test_prefixes_df)
+    lam_classes_builder.create_concepts(test_lam_classes_df, graph)
+    # removing a row moves all the rows below it
+    edited_graph = make_graph(test_prefixes_df)
+    lam_classes_builder.create_concepts(test_lam_classes_df.drop(index=10).reset_index(drop=True),
+                                        edited_graph)
+
+    assert set(edited_graph.objects(None, LAM.hasPropertyConfiguration))
+    assert set(edited_graph) < set(graph)
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from lam4vb3 import WORKSHEET_NAMES, LAM_CLASSES_WS_NAME, PREFIX_WS_NAME, LAM_PROPERTIES_WS_NAME, \
+    LAM_CLASS_CLASSIFICATION_WS_NAME
+from lam4vb3.lam_utils import read_excel_worksheet
+from lam4vb3.workbook import WorkbookSnapshot, read_excel_worksheet_in_chunks, iter_excel_worksheet_rows
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+def test_workbook_snapshot():
+    workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08)
+
+    assert all(sheet_name in workbook for sheet_name in WORKSHEET_NAMES)
+    assert workbook.prefixes is workbook[PREFIX_WS_NAME]
+
+    single_df = read_excel_worksheet(file_path=TESTBED_EXCEL_2021_08, sheet_name=LAM_CLASSES_WS_NAME)
+    assert workbook.lam_classes.equals(single_df)
+    assert not workbook.lam_classes.isna().any().any()
+
+
+def test_workbook_snapshot_subset():
+    workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08)
+    subset = workbook.subset([LAM_CLASSES_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME])
+
+    assert subset.sheet_names == [name for name in workbook.sheet_names
+                                  if name in (PREFIX_WS_NAME, LAM_CLASSES_WS_NAME, LAM_CLASS_CLASSIFICATION_WS_NAME)]
+    assert subset.lam_classes is workbook.lam_classes
+    assert subset.prefixes is workbook.prefixes
+    assert LAM_PROPERTIES_WS_NAME not in subset
+
+
+def test_read_excel_worksheet_in_chunks(test_lam_classes_df, test_lam_properties_df):
+    chunks = list(read_excel_worksheet_in_chunks(file_path=TESTBED_EXCEL_2021_08, sheet_name=LAM_CLASSES_WS_NAME,
+                                                 chunk_size=7))
+    assert [len(chunk) for chunk in chunks] == [7, 7, 6]
+    assert pd.concat(chunks).equals(test_lam_classes_df)
+
+    # blank rows and trailing empty columns are skipped like in pd.read_excel
+    rows = list(iter_excel_worksheet_rows(file_path=TESTBED_EXCEL_2021_08, sheet_name=LAM_PROPERTIES_WS_NAME))
+    assert len(rows) == len(test_lam_properties_df)
+    assert list(rows[0]) == list(test_lam_properties_df.columns)
+
+
+def test_workbook_snapshot_usecols(test_lam_classes_df):
+    selected_columns = ["URI", "LABEL", "DD", "NOT_IN_THE_WORKSHEET"]
+    workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08, sheet_names=[LAM_CLASSES_WS_NAME],
+                                usecols={LAM_CLASSES_WS_NAME: selected_columns})
+
+    assert list(workbook.lam_classes.columns) == ["URI", "LABEL", "DD"]
+    assert workbook.lam_classes.equals(test_lam_classes_df[["URI", "LABEL", "DD"]])
+
+    chunks = read_excel_worksheet_in_chunks(file_path=TESTBED_EXCEL_2021_08, sheet_name=LAM_CLASSES_WS_NAME,
+                                            usecols=selected_columns)
+    assert pd.concat(chunks).equals(workbook.lam_classes)
@@ -0,0 +1,31 @@
+from lam4vb3 import PREFIX_WS_NAME, LAM_CLASSES_WS_NAME
+from lam4vb3.workbook_cache import WorkbookCache, MANIFEST_FILE_NAME
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+def test_workbook_cache(tmp_path, test_lam_classes_df, test_prefixes_df):
+    cache = WorkbookCache(cache_folder=tmp_path)
+    entry_folder = cache.entry_folder(TESTBED_EXCEL_2021_08)
+
+    workbook = cache.load_workbook(TESTBED_EXCEL_2021_08, sheet_names=[PREFIX_WS_NAME])
+    assert workbook.prefixes.equals(test_prefixes_df)
+    assert (entry_folder / MANIFEST_FILE_NAME).exists()
+    assert len(list(entry_folder.glob("*.parquet"))) == 1
+
+    # the cached worksheet is reused and only the missing one is parsed
+    workbook = cache.load_workbook(TESTBED_EXCEL_2021_08, sheet_names=[PREFIX_WS_NAME, LAM_CLASSES_WS_NAME])
+    assert workbook.prefixes.equals(test_prefixes_df)
+    assert workbook.lam_classes.equals(test_lam_classes_df)
+    assert len(list(entry_folder.glob("*.parquet"))) == 2
+
+
+def test_workbook_cache_eviction(tmp_path):
+    cache = WorkbookCache(cache_folder=tmp_path, max_size=0)
+    stale_entry = tmp_path / "v1" / "stale"
+    stale_entry.mkdir(parents=True)
+    (stale_entry / MANIFEST_FILE_NAME).write_text("{}")
+
+    cache.load_workbook(TESTBED_EXCEL_2021_08, sheet_names=[PREFIX_WS_NAME])
+
+    assert not stale_entry.exists()
+    assert cache.entry_folder(TESTBED_EXCEL_2021_08).exists()
@@ -0,0 +1,48 @@
+import copy
+
+import pytest
+from click.testing import CliRunner
+
+from lam4vb3 import LAM_CLASSES_WS_NAME, LAM_PROPERTIES_WS_NAME, PREFIX_WS_NAME
+from lam4vb3.excel2rdf import WORKSHEET_COLUMNS
+from lam4vb3.workbook import WorkbookSnapshot
+from lam4vb3.workbook_lint import lint_workbook, lint_report, lint, LintError
+from tests.unit.conftest import TESTBED_EXCEL_2021_08
+
+
+@pytest.fixture(scope="module")
+def testbed_workbook():
+    return WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08, usecols=WORKSHEET_COLUMNS)
+
+
+def test_lint_testbed_workbook(testbed_workbook):
+    errors = lint_workbook(testbed_workbook)
+
+    # the testbed has no RAPPORTEUR column, which the transformation reports as a warning for each cell
+    assert errors == [LintError(sheet=LAM_CLASSES_WS_NAME, row=None, column="RAPPORTEUR",
+                                error="Missing column RAPPORTEUR")]
+
+
+def test_lint_reports_every_cell_error(testbed_workbook):
+    worksheets = copy.deepcopy(testbed_workbook.worksheets)
+    worksheets[LAM_CLASSES_WS_NAME].loc[2, "DN"] = "unknown:md_DN"
+    worksheets[LAM_CLASSES_WS_NAME].loc[5, "CLASSIFICATION"] = "lamd:c_1 | a comment | another comment"
+    worksheets[LAM_PROPERTIES_WS_NAME].loc[0, "CLASSIFICATION"] = "unknown:c_1"
+    workbook = WorkbookSnapshot(file_path=TESTBED_EXCEL_2021_08, worksheets=worksheets)
+
+    errors = lint_workbook(workbook)
+    cell_errors = {(error.sheet, error.row, error.column) for error in errors if error.row is not None}
+
+    assert cell_errors == {(LAM_CLASSES_WS_NAME, 2, "DN"), (LAM_CLASSES_WS_NAME, 5, "CLASSIFICATION"),
+                           (LAM_PROPERTIES_WS_NAME, 0, "CLASSIFICATION")}
+    assert list(lint_report(errors).columns) == ["sheet", "row", "column", "error"]
+
+
+def test_lint_command(tmp_path):
+    report_file = tmp_path / "report.csv"
+    result = CliRunner().invoke(lint, [str(TESTBED_EXCEL_2021_08), "--report", str(report_file), "--no-cache"])
+
+    assert result.exit_code == 1
+    assert "1 error(s) found" in result.output
+    assert "RAPPORTEUR" in report_file.read_text()
+    assert PREFIX_WS_NAME not in report_file.read_text()